@@ -34,6 +34,8 @@ class HistoricalPrices(IYahooData):
       Object<HistoricalPrices>
     """
     _min_date = date(1970,1,1)
+    # locale -> (cookie, crumb); scraped once per process instead of on every request
+    _cookie_crumb_cache = {}
 
     def __init__(
             self, instrument, start_date, end_date, date_format_string="%Y-%m-%d",
@@ -65,6 +67,10 @@ class HistoricalPrices(IYahooData):
         self.prices = r.text
 
     def _find_cookie_crumb_pair(self, locale):
+        cached = self._cookie_crumb_cache.get(locale)
+        if cached:
+            return cached
+
         url = Locale.locale_url(locale) + '/AAPL/history'
         res = requests.get(url)
         try:
@@ -83,6 +89,7 @@ class HistoricalPrices(IYahooData):
         # Handles the slash encoding as the character is allowed
         crumb = crumb.replace('\\u002F', '/')
 
+        self._cookie_crumb_cache[locale] = (cookie, crumb)
         return cookie, crumb
 
     def to_csv(self, path=None, sep=',', data_format=DataFormat.RAW, csv_dialect='excel'):
@@ -2,40 +2,44 @@
 API endpoints for fetching LocalStack EventBridge rules
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
-import boto3
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import List, Dict, Any, Optional
 import logging
 
+from app.utils.aws import fetch_page, get_client, iter_rules, run_aws
+from app.utils.inventory_cache import inventory_cache
+
 logger = logging.getLogger(__name__)
 
 r = APIRouter(prefix="/eventbridge-rules", tags=["eventbridge-rules"])
 
 def get_localstack_events_client(endpoint_url: str = 'http://localstack:4566'):
     """Get LocalStack EventBridge client"""
-    return boto3.client(
-        'events', 
-        endpoint_url=endpoint_url, 
-        region_name='us-east-1',
-        aws_access_key_id='ls-reqe8270-Qidi-ViFe-sIku-1863Vode4933',
-        aws_secret_access_key='ls-reqe8270-Qidi-ViFe-sIku-1863Vode4933'
-    )
+    return get_client('events', endpoint_url)
 
 @r.get("/", response_model=List[Dict[str, Any]])
 async def get_eventbridge_rules(
-    endpoint_url: str = 'http://localstack:4566'
+    response: Response,
+    endpoint_url: str = 'http://localstack:4566',
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """
-    Fetch all EventBridge rules from LocalStack
+    Fetch EventBridge rules from LocalStack
     
-    Returns a list of EventBridge rules with their configuration details
+    Returns a list of EventBridge rules with their configuration details. Without `limit`
+    every page is returned; with `limit` one page is returned and the cursor for
+    the next one is sent in the X-Next-Cursor header.
     """
     try:
         events_client = get_localstack_events_client(endpoint_url)
         
-        # List all rules
-        response = events_client.list_rules()
-        rules = response.get('Rules', [])
+        if limit:
+            rules, next_cursor = await run_aws(fetch_page, events_client, "list_rules", "Rules", limit, cursor)
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
+        else:
+            rules = await run_aws(lambda: list(iter_rules(events_client)))
         
         logger.info(f"Retrieved {len(rules)} EventBridge rules")
         return rules
@@ -44,30 +48,39 @@ async def get_eventbridge_rules(
         logger.error(f"Error fetching EventBridge rules: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch EventBridge rules: {str(e)}")
 
+def summarize_rules(events_client) -> Dict[str, Any]:
+    """Count rules by state across all pages (blocking)"""
+    state_counts = {}
+    total_rules = 0
+    for rule in iter_rules(events_client):
+        state = rule.get('State', 'UNKNOWN')
+        state_counts[state] = state_counts.get(state, 0) + 1
+        total_rules += 1
+    
+    return {
+        "total_rules": total_rules,
+        "state_counts": state_counts
+    }
+
+async def _load_summary(endpoint_url: str) -> Dict[str, Any]:
+    return await run_aws(summarize_rules, get_localstack_events_client(endpoint_url))
+
+# Kept warm by the background inventory refresher from startup
+inventory_cache.register(("eventbridge-rules", 'http://localstack:4566'), lambda: _load_summary('http://localstack:4566'))
+
 @r.get("/summary")
 async def get_eventbridge_rules_summary(
-    endpoint_url: str = 'http://localstack:4566'
+    endpoint_url: str = 'http://localstack:4566',
+    refresh: bool = False
 ) -> Dict[str, Any]:
     """
     Get a summary of EventBridge rules
+    
+    Answered from the in-memory inventory snapshot that the background refresher
+    keeps current; `refresh=true` re-lists from AWS first.
     """
     try:
-        events_client = get_localstack_events_client(endpoint_url)
-        
-        # List all rules
-        response = events_client.list_rules()
-        rules = response.get('Rules', [])
-        
-        # Count rules by state
-        state_counts = {}
-        for rule in rules:
-            state = rule.get('State', 'UNKNOWN')
-            state_counts[state] = state_counts.get(state, 0) + 1
-        
-        return {
-            "total_rules": len(rules),
-            "state_counts": state_counts
-        }
+        return await inventory_cache.get(("eventbridge-rules", endpoint_url), lambda: _load_summary(endpoint_url), refresh)
         
     except Exception as e:
         logger.error(f"Error fetching EventBridge rules summary: {e}")
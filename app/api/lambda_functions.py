@@ -2,40 +2,44 @@
 API endpoints for fetching LocalStack Lambda functions
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
-import boto3
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import List, Dict, Any, Optional
 import logging
 
+from app.utils.aws import fetch_page, get_client, iter_functions, run_aws
+from app.utils.inventory_cache import inventory_cache
+
 logger = logging.getLogger(__name__)
 
 r = APIRouter(prefix="/lambda-functions", tags=["lambda-functions"])
 
 def get_localstack_lambda_client(endpoint_url: str = 'http://localstack:4566'):
     """Get LocalStack Lambda client"""
-    return boto3.client(
-        'lambda', 
-        endpoint_url=endpoint_url, 
-        region_name='us-east-1',
-        aws_access_key_id='ls-reqe8270-Qidi-ViFe-sIku-1863Vode4933',
-        aws_secret_access_key='ls-reqe8270-Qidi-ViFe-sIku-1863Vode4933'
-    )
+    return get_client('lambda', endpoint_url)
 
 @r.get("/", response_model=List[Dict[str, Any]])
 async def get_lambda_functions(
-    endpoint_url: str = 'http://localstack:4566'
+    response: Response,
+    endpoint_url: str = 'http://localstack:4566',
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """
-    Fetch all Lambda functions from LocalStack
+    Fetch Lambda functions from LocalStack
     
-    Returns a list of Lambda functions with their configuration details
+    Returns a list of Lambda functions with their configuration details. Without `limit`
+    every page is returned; with `limit` one page is returned and the cursor for
+    the next one is sent in the X-Next-Cursor header.
     """
     try:
         lambda_client = get_localstack_lambda_client(endpoint_url)
         
-        # List all functions
-        response = lambda_client.list_functions()
-        functions = response.get('Functions', [])
+        if limit:
+            functions, next_cursor = await run_aws(fetch_page, lambda_client, "list_functions", "Functions", limit, cursor)
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
+        else:
+            functions = await run_aws(lambda: list(iter_functions(lambda_client)))
         
         logger.info(f"Retrieved {len(functions)} Lambda functions")
         return functions
@@ -44,30 +48,39 @@ async def get_lambda_functions(
         logger.error(f"Error fetching Lambda functions: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch Lambda functions: {str(e)}")
 
+def summarize_functions(lambda_client) -> Dict[str, Any]:
+    """Count functions by runtime across all pages (blocking)"""
+    runtime_counts = {}
+    total_functions = 0
+    for function in iter_functions(lambda_client):
+        runtime = function.get('Runtime', 'UNKNOWN')
+        runtime_counts[runtime] = runtime_counts.get(runtime, 0) + 1
+        total_functions += 1
+    
+    return {
+        "total_functions": total_functions,
+        "runtime_counts": runtime_counts
+    }
+
+async def _load_summary(endpoint_url: str) -> Dict[str, Any]:
+    return await run_aws(summarize_functions, get_localstack_lambda_client(endpoint_url))
+
+# Kept warm by the background inventory refresher from startup
+inventory_cache.register(("lambda-functions", 'http://localstack:4566'), lambda: _load_summary('http://localstack:4566'))
+
 @r.get("/summary")
 async def get_lambda_functions_summary(
-    endpoint_url: str = 'http://localstack:4566'
+    endpoint_url: str = 'http://localstack:4566',
+    refresh: bool = False
 ) -> Dict[str, Any]:
     """
     Get a summary of Lambda functions
+    
+    Answered from the in-memory inventory snapshot that the background refresher
+    keeps current; `refresh=true` re-lists from AWS first.
     """
     try:
-        lambda_client = get_localstack_lambda_client(endpoint_url)
-        
-        # List all functions
-        response = lambda_client.list_functions()
-        functions = response.get('Functions', [])
-        
-        # Count functions by runtime
-        runtime_counts = {}
-        for function in functions:
-            runtime = function.get('Runtime', 'UNKNOWN')
-            runtime_counts[runtime] = runtime_counts.get(runtime, 0) + 1
-        
-        return {
-            "total_functions": len(functions),
-            "runtime_counts": runtime_counts
-        }
+        return await inventory_cache.get(("lambda-functions", endpoint_url), lambda: _load_summary(endpoint_url), refresh)
         
     except Exception as e:
         logger.error(f"Error fetching Lambda functions summary: {e}")
@@ -0,0 +1,118 @@
+"""
+API endpoints for per-asset price history (asset_prices table)
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import sqlalchemy as sa
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.deps import db
+from app.db.models import Asset, AssetPrice
+from app.schemas.dto import AssetPriceIn, AssetPriceOut, PriceInterval
+
+r = APIRouter(prefix="/assets", tags=["asset-prices"])
+
+_INTERVAL_SECONDS = {"1h": 3600, "1d": 86400, "1w": 7 * 86400}
+# Rows per multi-row INSERT during bulk ingestion
+_INGEST_CHUNK = 1000
+
+# OHLCV per bucket in one pass over the (asset_id, ts) clustered range. Buckets are
+# aligned to the epoch (weekly buckets therefore start on Thursdays).
+_DOWNSAMPLE = sa.text("""
+SELECT
+  TIMESTAMPADD(SECOND, bucket * :secs, '1970-01-01') AS ts,
+  MAX(first_open) AS open,
+  MAX(high)       AS high,
+  MIN(low)        AS low,
+  MAX(last_close) AS close,
+  SUM(volume)     AS volume
+FROM (
+  SELECT
+    TIMESTAMPDIFF(SECOND, '1970-01-01', ts) DIV :secs AS bucket,
+    high, low, volume,
+    FIRST_VALUE(open) OVER w AS first_open,
+    LAST_VALUE(close) OVER w AS last_close
+  FROM asset_prices
+  WHERE asset_id = :asset_id AND ts >= :start AND ts < :end
+  WINDOW w AS (
+    PARTITION BY TIMESTAMPDIFF(SECOND, '1970-01-01', ts) DIV :secs
+    ORDER BY ts ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+  )
+) x
+GROUP BY bucket
+ORDER BY bucket
+LIMIT :limit
+""")
+
+
+def _utc_naive(ts: datetime) -> datetime:
+    """An aware datetime converted to naive UTC; naive ones are taken as UTC already"""
+    return ts.astimezone(timezone.utc).replace(tzinfo=None) if ts.tzinfo is not None else ts
+
+
+async def _require_asset(s: AsyncSession, asset_id: int) -> None:
+    if not await s.get(Asset, asset_id):
+        raise HTTPException(status_code=404, detail="Asset not found")
+
+
+@r.post("/{asset_id}/prices", status_code=201)
+async def ingest_prices(asset_id: int, rows: List[AssetPriceIn], s: AsyncSession = Depends(db)) -> Dict[str, Any]:
+    """
+    Bulk upsert price bars for an asset.
+
+    Rows are written with multi-row INSERT ... ON DUPLICATE KEY UPDATE in chunks,
+    so re-sending an overlapping range simply refreshes the existing bars.
+    """
+    await _require_asset(s, asset_id)
+    values = [{"asset_id": asset_id, **row.model_dump()} for row in rows]
+    # Store naive UTC, matching the other DATETIME columns
+    for v in values:
+        v["ts"] = _utc_naive(v["ts"])
+
+    for i in range(0, len(values), _INGEST_CHUNK):
+        stmt = mysql_insert(AssetPrice).values(values[i:i + _INGEST_CHUNK])
+        stmt = stmt.on_duplicate_key_update({
+            c: stmt.inserted[c] for c in ("open", "high", "low", "close", "volume")
+        })
+        await s.execute(stmt)
+    await s.commit()
+    return {"asset_id": asset_id, "received": len(values)}
+
+
+@r.get("/{asset_id}/prices", response_model=List[AssetPriceOut])
+async def get_prices(
+    asset_id: int,
+    from_: Optional[datetime] = Query(None, alias="from"),
+    to: Optional[datetime] = None,
+    interval: PriceInterval = "raw",
+    limit: int = Query(5000, ge=1, le=100000),
+    s: AsyncSession = Depends(db),
+):
+    """
+    Price bars for an asset in [from, to), optionally downsampled server-side
+    to 1h / 1d / 1w OHLCV buckets. Defaults to the last 30 days.
+    """
+    to = _utc_naive(to) if to else datetime.utcnow()
+    from_ = _utc_naive(from_) if from_ else to - timedelta(days=30)
+    if from_ > to:
+        raise HTTPException(400, "'from' must not be after 'to'")
+    await _require_asset(s, asset_id)
+
+    if interval == "raw":
+        stmt = (
+            sa.select(AssetPrice)
+            .where(AssetPrice.asset_id == asset_id, AssetPrice.ts >= from_, AssetPrice.ts < to)
+            .order_by(AssetPrice.ts)
+            .limit(limit)
+        )
+        return (await s.execute(stmt)).scalars().all()
+
+    res = await s.execute(_DOWNSAMPLE, {
+        "asset_id": asset_id, "start": from_, "end": to,
+        "secs": _INTERVAL_SECONDS[interval], "limit": limit,
+    })
+    return [dict(row._mapping) for row in res.fetchall()]
@@ -1,10 +1,55 @@
 import sqlalchemy as sa
-from fastapi import APIRouter, Depends
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.deps import db
 
 r = APIRouter(prefix="/reports", tags=["reports"])
 
+# Bucket width and the MySQL DATE_FORMAT pattern that truncates scheduled_for_utc to it
+_BUCKETS = {
+    "hour": (timedelta(hours=1), "%Y-%m-%d %H:00:00"),
+    "day": (timedelta(days=1), "%Y-%m-%d 00:00:00"),
+}
+# Default window when `from` is omitted
+_DEFAULT_SPAN = {"hour": timedelta(hours=48), "day": timedelta(days=30)}
+# Upper bound on buckets per request (~1 year of hours)
+_MAX_BUCKETS = 9000
+# A bucket is "closed" once it ended this long ago; late worker writes land inside the grace
+_CLOSED_BUCKET_GRACE = timedelta(hours=1)
+
+# Closed buckets never change, so they are cached, least recently used evicted first.
+# (bucket, asset_id, llm_id, bucket_start) -> {asset_id: row}
+_TIMESERIES_CACHE_MAX = 20_000
+_timeseries_cache: "OrderedDict[tuple, dict[int, dict]]" = OrderedDict()
+
+
+def _cached_bucket(key: tuple) -> Optional[dict[int, dict]]:
+    rows = _timeseries_cache.get(key)
+    if rows is not None:
+        _timeseries_cache.move_to_end(key)
+    return rows
+
+
+def _cache_bucket(key: tuple, rows: dict[int, dict]) -> None:
+    _timeseries_cache[key] = rows
+    _timeseries_cache.move_to_end(key)
+    while len(_timeseries_cache) > _TIMESERIES_CACHE_MAX:
+        _timeseries_cache.popitem(last=False)
+
+
+def _utc_naive(ts: datetime) -> datetime:
+    """An aware datetime converted to naive UTC, like scheduled_for_utc; naive ones are taken as UTC already"""
+    return ts.astimezone(timezone.utc).replace(tzinfo=None) if ts.tzinfo is not None else ts
+
+
+def _truncate(ts: datetime, bucket: str) -> datetime:
+    if bucket == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
 @r.get("/test")
 async def test_endpoint():
     """Simple test endpoint"""
@@ -90,3 +135,97 @@ async def survey_comparison(survey_id: int, s: AsyncSession = Depends(db)):
     """)
     res = await s.execute(stmt, {"sid": survey_id})
     return [dict(r._mapping) for r in res.fetchall()]
+
+@r.get("/timeseries")
+async def recommendation_timeseries(
+    bucket: Literal["hour", "day"] = "day",
+    asset_id: Optional[int] = None,
+    llm_id: Optional[int] = None,
+    from_: Optional[datetime] = Query(None, alias="from"),
+    to: Optional[datetime] = None,
+    s: AsyncSession = Depends(db),
+):
+    """
+    BUY/SELL/HOLD counts and mean confidence per asset per time bucket.
+
+    Aggregation runs in a single GROUP BY over queries; the scheduled_for_utc range is
+    read from the covering idx_cq_time_report index.
+    The LLM of a query is the one owning the prompt it ran with (live prompt for
+    Initial Baseline / Follow-up, forecast prompt otherwise). Buckets with no rows are
+    zero-filled, and closed buckets are cached (bounded LRU).
+    """
+    width, fmt = _BUCKETS[bucket]
+    # Bucket starts (and so the cache keys) are naive UTC
+    to = _utc_naive(to) if to else datetime.utcnow()
+    from_ = _utc_naive(from_) if from_ else to - _DEFAULT_SPAN[bucket]
+    if from_ > to:
+        raise HTTPException(400, "'from' must not be after 'to'")
+    if (to - from_) / width > _MAX_BUCKETS:
+        raise HTTPException(400, f"range too large: at most {_MAX_BUCKETS} {bucket} buckets")
+
+    starts = []
+    cur = _truncate(from_, bucket)
+    while cur <= to:
+        starts.append(cur)
+        cur += width
+
+    closed_before = datetime.utcnow() - _CLOSED_BUCKET_GRACE
+    cache = {}
+    for b in starts:
+        rows = _cached_bucket((bucket, asset_id, llm_id, b))
+        if rows is not None:
+            cache[b] = rows
+    missing = [b for b in starts if b not in cache]
+
+    fresh: dict[datetime, dict[int, dict]] = {}
+    if missing:
+        stmt = sa.text(f"""
+        SELECT
+          DATE_FORMAT(q.scheduled_for_utc, '{fmt}') AS bucket_start,
+          s.asset_id,
+          SUM(q.recommendation = 'BUY')  AS buy_count,
+          SUM(q.recommendation = 'SELL') AS sell_count,
+          SUM(q.recommendation = 'HOLD') AS hold_count,
+          AVG(q.confidence)              AS avg_confidence
+        FROM queries q
+        JOIN surveys s ON s.survey_id = q.survey_id
+        JOIN query_type qt ON qt.query_type_id = q.query_type_id
+        JOIN prompts p ON p.prompt_id = CASE
+              WHEN qt.query_type_name IN ('Initial Baseline', 'Follow-up') THEN s.live_prompt_id
+              ELSE s.forecast_prompt_id END
+        WHERE q.scheduled_for_utc >= :start AND q.scheduled_for_utc < :end
+          AND q.recommendation IS NOT NULL
+          AND (:asset_id IS NULL OR s.asset_id = :asset_id)
+          AND (:llm_id IS NULL OR p.llm_id = :llm_id)
+        GROUP BY bucket_start, s.asset_id
+        """)
+        res = await s.execute(stmt, {
+            "start": min(missing), "end": max(missing) + width,
+            "asset_id": asset_id, "llm_id": llm_id,
+        })
+        for row in res.fetchall():
+            start = datetime.strptime(row.bucket_start, "%Y-%m-%d %H:%M:%S")
+            fresh.setdefault(start, {})[row.asset_id] = {
+                "buy_count": int(row.buy_count or 0),
+                "sell_count": int(row.sell_count or 0),
+                "hold_count": int(row.hold_count or 0),
+                "avg_confidence": float(row.avg_confidence) if row.avg_confidence is not None else None,
+            }
+        for b in missing:
+            if b + width <= closed_before:
+                _cache_bucket((bucket, asset_id, llm_id, b), fresh.get(b, {}))
+
+    by_bucket = {b: cache[b] if b in cache else fresh.get(b, {}) for b in starts}
+    assets = {asset_id} if asset_id is not None else {a for rows in by_bucket.values() for a in rows}
+
+    out = []
+    for b in starts:
+        for a in sorted(assets):
+            row = by_bucket[b].get(a) or {"buy_count": 0, "sell_count": 0, "hold_count": 0, "avg_confidence": None}
+            out.append({
+                "bucket_start": b.isoformat(),
+                "asset_id": a,
+                **row,
+                "total": row["buy_count"] + row["sell_count"] + row["hold_count"],
+            })
+    return out
@@ -2,44 +2,227 @@
 API endpoints for fetching LocalStack EventBridge scheduled queries
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from typing import List, Dict, Any, Optional
-import boto3
+import asyncio
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.deps import db
+from app.db.models import PlannedSchedule
+from app.utils.aws import fetch_page, get_client, iter_schedule_groups, iter_schedules, run_aws
+from app.utils.inventory_cache import inventory_cache
+from app.utils.schedule_registry import reconcile_planned_schedules
+
 logger = logging.getLogger(__name__)
 
 r = APIRouter(prefix="/scheduled-queries", tags=["scheduled-queries"])
 
+# Parsed schedule rows keyed by (group, name, LastModificationDate); an unchanged
+# schedule is not re-fetched while its entry is fresh. Shared by the detail
+# fetch threads, so every access holds the lock; least recently used first
+_PAYLOAD_CACHE_TTL = 60.0
+_PAYLOAD_CACHE_MAX = 50_000
+_payload_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_payload_cache_lock = threading.Lock()
+
 def get_localstack_scheduler_client(endpoint_url: str = 'http://localstack:4566'):
-    """Get LocalStack EventBridge Scheduler client"""
-    return boto3.client(
-        'scheduler', 
-        endpoint_url=endpoint_url, 
-        region_name='us-east-1',
-        aws_access_key_id='ls-reqe8270-Qidi-ViFe-sIku-1863Vode4933',
-        aws_secret_access_key='ls-reqe8270-Qidi-ViFe-sIku-1863Vode4933'
-    )
+    """Get LocalStack EventBridge Scheduler client (one shared, thread-safe client per endpoint)"""
+    return get_client('scheduler', endpoint_url)
+
+def _format_schedule(schedule: Dict[str, Any], detail_response: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a schedule and its parsed input payload for the frontend table"""
+    target_input = detail_response.get('Target', {}).get('Input')
+    payload = {}
+    if target_input:
+        try:
+            payload = json.loads(target_input)
+        except json.JSONDecodeError:
+            logger.warning(f"Invalid JSON payload for schedule {schedule['Name']}")
+            payload = {}
+
+    return {
+        "schedule_id": schedule['Name'],
+        "survey_init": detail_response.get('CreationDate', '').isoformat() if detail_response.get('CreationDate') else '',
+        "query_schedule": detail_response.get('ScheduleExpression', ''),
+        "schedule_name": payload.get('schedule_name', ''),
+        "query_type": payload.get('query_type_name', ''),
+        "delay_hours": payload.get('delay_hours', 0),
+        "asset": payload.get('asset_name', ''),
+        "llm": payload.get('llm_name', ''),
+        "target_llm": payload.get('target_llm_name', ''),
+        "prompt_type": payload.get('prompt_type', ''),
+        "state": schedule.get('State', 'UNKNOWN'),
+        "description": detail_response.get('Description', ''),
+        "full_payload": payload  # Include full payload for debugging if needed
+    }
+
+def _error_entry(schedule: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    """Minimal entry for a schedule whose details could not be loaded"""
+    return {
+        "schedule_id": schedule['Name'],
+        "survey_init": "",
+        "query_schedule": "",
+        "schedule_name": "Error loading",
+        "query_type": "Error",
+        "delay_hours": 0,
+        "asset": "Error",
+        "llm": "Error",
+        "target_llm": "Error",
+        "prompt_type": "Error",
+        "state": schedule.get('State', 'ERROR'),
+        "description": f"Error: {str(error)}",
+        "full_payload": {}
+    }
+
+def _fetch_schedule_row(scheduler, group_name: str, schedule: Dict[str, Any]) -> Dict[str, Any]:
+    """Get one schedule's details (blocking), served from the payload cache when unchanged"""
+    key = (group_name, schedule['Name'], schedule.get('LastModificationDate'))
+    now = time.monotonic()
+    with _payload_cache_lock:
+        cached = _payload_cache.get(key)
+        if cached and now - cached[0] < _PAYLOAD_CACHE_TTL:
+            _payload_cache.move_to_end(key)
+            return cached[1]
+
+    try:
+        detail_response = scheduler.get_schedule(Name=schedule['Name'], GroupName=group_name)
+    except Exception as e:
+        logger.error(f"Error getting details for schedule {schedule['Name']}: {e}")
+        return _error_entry(schedule, e)
+
+    row = _format_schedule(schedule, detail_response)
+    with _payload_cache_lock:
+        _payload_cache[key] = (now, row)
+        _payload_cache.move_to_end(key)
+        while len(_payload_cache) > _PAYLOAD_CACHE_MAX:
+            _payload_cache.popitem(last=False)
+    return row
+
+def _format_planned(row: PlannedSchedule) -> Dict[str, Any]:
+    """Format a planned_schedules row like a live schedule for the frontend table"""
+    return {
+        "schedule_id": row.schedule_name,
+        "survey_init": row.created_at.isoformat() if row.created_at else '',
+        "query_schedule": row.schedule_expression,
+        "schedule_name": row.schedule_name_label or '',
+        "query_type": row.query_type_name or '',
+        "delay_hours": row.delay_hours or 0,
+        "asset": row.asset_name or '',
+        "llm": row.llm_name or '',
+        "target_llm": row.target_llm_name or '',
+        "prompt_type": row.prompt_type or '',
+        "state": row.state,
+        "description": row.description or '',
+        "survey_id": row.survey_id,
+        "asset_id": row.asset_id,
+        "scheduled_for_utc": row.scheduled_for_utc.isoformat() if row.scheduled_for_utc else None,
+        "payload_hash": row.payload_hash,
+        "last_synced_at": row.last_synced_at.isoformat() if row.last_synced_at else None,
+    }
 
 @r.get("/", response_model=List[Dict[str, Any]])
 async def get_scheduled_queries(
+    response: Response,
     group_name: str = "crypto-forecast-schedules",
-    endpoint_url: str = 'http://localstack:4566'
+    survey_id: Optional[int] = None,
+    asset_id: Optional[int] = None,
+    from_: Optional[datetime] = Query(None, alias="from"),
+    to: Optional[datetime] = None,
+    state: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[int] = None,
+    s: AsyncSession = Depends(db),
 ) -> List[Dict[str, Any]]:
     """
-    Fetch all scheduled queries from LocalStack EventBridge Scheduler
+    Scheduled queries from the planned_schedules registry
     
-    Returns a list of scheduled queries with their payload data formatted for the frontend table
+    Served from the database (no AWS calls), filtered on the indexed survey, asset and
+    scheduled time columns; `from`/`to` bound scheduled_for_utc as [from, to). With
+    `limit` one page is returned and the cursor for the next one is sent in the
+    X-Next-Cursor header. Run POST /scheduled-queries/reconcile to refresh it from
+    EventBridge, or use /scheduled-queries/live to read EventBridge directly.
+    """
+    stmt = sa.select(PlannedSchedule).where(PlannedSchedule.group_name == group_name)
+    if survey_id is not None:
+        stmt = stmt.where(PlannedSchedule.survey_id == survey_id)
+    if asset_id is not None:
+        stmt = stmt.where(PlannedSchedule.asset_id == asset_id)
+    if from_ is not None:
+        stmt = stmt.where(PlannedSchedule.scheduled_for_utc >= from_.replace(tzinfo=None))
+    if to is not None:
+        stmt = stmt.where(PlannedSchedule.scheduled_for_utc < to.replace(tzinfo=None))
+    if state is not None:
+        stmt = stmt.where(PlannedSchedule.state == state)
+    if cursor is not None:
+        stmt = stmt.where(PlannedSchedule.planned_schedule_id > cursor)
+    stmt = stmt.order_by(PlannedSchedule.planned_schedule_id)
+    if limit:
+        stmt = stmt.limit(limit)
+
+    try:
+        rows = (await s.execute(stmt)).scalars().all()
+    except Exception as e:
+        logger.error(f"Error reading planned schedules: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch scheduled queries: {str(e)}")
+
+    if limit and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1].planned_schedule_id)
+    return [_format_planned(row) for row in rows]
+
+@r.post("/reconcile")
+async def reconcile_scheduled_queries(
+    group_name: str = "crypto-forecast-schedules",
+    endpoint_url: str = 'http://localstack:4566',
+    s: AsyncSession = Depends(db),
+) -> Dict[str, Any]:
+    """
+    Sync the planned_schedules registry with EventBridge in bulk
+    """
+    try:
+        scheduler = get_localstack_scheduler_client(endpoint_url)
+        counts = await reconcile_planned_schedules(s, scheduler, group_name)
+    except Exception as e:
+        logger.error(f"Error reconciling scheduled queries: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to reconcile scheduled queries: {str(e)}")
+    return {"group_name": group_name, **counts}
+
+@r.get("/live", response_model=List[Dict[str, Any]])
+async def get_live_scheduled_queries(
+    response: Response,
+    group_name: str = "crypto-forecast-schedules",
+    endpoint_url: str = 'http://localstack:4566',
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch scheduled queries directly from LocalStack EventBridge Scheduler
+    
+    Returns a list of scheduled queries with their payload data formatted for the frontend table.
+    Schedule details are fetched concurrently on the bounded AWS I/O pool, off the event loop.
+    Without `limit` every page is returned; with `limit` one page is returned and the
+    cursor for the next one is sent in the X-Next-Cursor header.
     """
     try:
         scheduler = get_localstack_scheduler_client(endpoint_url)
         
-        # List all schedules in the group
+        # List schedules in the group (one page, or all of them)
         try:
-            response = scheduler.list_schedules(GroupName=group_name)
-            schedules = response.get('Schedules', [])
+            if limit:
+                schedules, next_cursor = await run_aws(
+                    fetch_page, scheduler, "list_schedules", "Schedules", limit, cursor, GroupName=group_name
+                )
+                if next_cursor:
+                    response.headers["X-Next-Cursor"] = next_cursor
+            else:
+                schedules = await run_aws(lambda: list(iter_schedules(scheduler, group_name)))
         except scheduler.exceptions.ResourceNotFoundException:
             logger.warning(f"Schedule group '{group_name}' not found")
             return []
@@ -48,106 +231,67 @@ async def get_scheduled_queries(
             logger.info(f"No schedules found in group '{group_name}'")
             return []
         
-        # Get detailed information for each schedule
-        detailed_schedules = []
-        
-        for schedule in schedules:
-            try:
-                # Get detailed schedule information
-                detail_response = scheduler.get_schedule(
-                    Name=schedule['Name'],
-                    GroupName=group_name
-                )
-                
-                # Parse the input payload
-                target_input = detail_response.get('Target', {}).get('Input')
-                payload = {}
-                if target_input:
-                    try:
-                        payload = json.loads(target_input)
-                    except json.JSONDecodeError:
-                        logger.warning(f"Invalid JSON payload for schedule {schedule['Name']}")
-                        payload = {}
-                
-                # Format the schedule data for the frontend table
-                schedule_data = {
-                    "schedule_id": schedule['Name'],
-                    "survey_init": detail_response.get('CreationDate', '').isoformat() if detail_response.get('CreationDate') else '',
-                    "query_schedule": detail_response.get('ScheduleExpression', ''),
-                    "schedule_name": payload.get('schedule_name', ''),
-                    "query_type": payload.get('query_type_name', ''),
-                    "delay_hours": payload.get('delay_hours', 0),
-                    "asset": payload.get('asset_name', ''),
-                    "llm": payload.get('llm_name', ''),
-                    "target_llm": payload.get('target_llm_name', ''),
-                    "prompt_type": payload.get('prompt_type', ''),
-                    "state": schedule.get('State', 'UNKNOWN'),
-                    "description": detail_response.get('Description', ''),
-                    "full_payload": payload  # Include full payload for debugging if needed
-                }
-                
-                detailed_schedules.append(schedule_data)
-                
-            except Exception as e:
-                logger.error(f"Error getting details for schedule {schedule['Name']}: {e}")
-                # Add a minimal entry for failed schedules
-                detailed_schedules.append({
-                    "schedule_id": schedule['Name'],
-                    "survey_init": "",
-                    "query_schedule": "",
-                    "schedule_name": "Error loading",
-                    "query_type": "Error",
-                    "delay_hours": 0,
-                    "asset": "Error",
-                    "llm": "Error",
-                    "target_llm": "Error",
-                    "prompt_type": "Error",
-                    "state": schedule.get('State', 'ERROR'),
-                    "description": f"Error: {str(e)}",
-                    "full_payload": {}
-                })
+        # Get detailed information for each schedule concurrently
+        detailed_schedules = await asyncio.gather(*(
+            run_aws(_fetch_schedule_row, scheduler, group_name, schedule)
+            for schedule in schedules
+        ))
         
         logger.info(f"Retrieved {len(detailed_schedules)} scheduled queries")
-        return detailed_schedules
+        return list(detailed_schedules)
         
     except Exception as e:
         logger.error(f"Error fetching scheduled queries: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch scheduled queries: {str(e)}")
 
+def summarize_schedules(scheduler, group_name: str) -> Dict[str, Any]:
+    """Count schedule groups and the group's schedules by state across all pages (blocking)"""
+    total_groups = sum(1 for _ in iter_schedule_groups(scheduler))
+    
+    state_counts = {}
+    total_schedules = 0
+    try:
+        for schedule in iter_schedules(scheduler, group_name):
+            state = schedule.get('State', 'UNKNOWN')
+            state_counts[state] = state_counts.get(state, 0) + 1
+            total_schedules += 1
+    except scheduler.exceptions.ResourceNotFoundException:
+        pass
+    
+    return {
+        "total_groups": total_groups,
+        "total_schedules": total_schedules,
+        "state_counts": state_counts,
+        "group_name": group_name
+    }
+
+async def _load_summary(group_name: str, endpoint_url: str) -> Dict[str, Any]:
+    return await run_aws(summarize_schedules, get_localstack_scheduler_client(endpoint_url), group_name)
+
+# Kept warm by the background inventory refresher from startup
+inventory_cache.register(
+    ("scheduled-queries", "crypto-forecast-schedules", 'http://localhost:4566'),
+    lambda: _load_summary("crypto-forecast-schedules", 'http://localhost:4566'),
+)
+
 @r.get("/summary")
 async def get_scheduled_queries_summary(
     group_name: str = "crypto-forecast-schedules",
-    endpoint_url: str = 'http://localhost:4566'
+    endpoint_url: str = 'http://localhost:4566',
+    refresh: bool = False
 ) -> Dict[str, Any]:
     """
     Get a summary of scheduled queries
+    
+    Answered from the in-memory inventory snapshot that the background refresher
+    keeps current; `refresh=true` re-lists from AWS first.
     """
     try:
-        scheduler = get_localstack_scheduler_client(endpoint_url)
-        
-        # List schedule groups
-        groups_response = scheduler.list_schedule_groups()
-        groups = groups_response.get('ScheduleGroups', [])
-        
-        # List schedules in the specified group
-        try:
-            schedules_response = scheduler.list_schedules(GroupName=group_name)
-            schedules = schedules_response.get('Schedules', [])
-        except scheduler.exceptions.ResourceNotFoundException:
-            schedules = []
-        
-        # Count schedules by state
-        state_counts = {}
-        for schedule in schedules:
-            state = schedule.get('State', 'UNKNOWN')
-            state_counts[state] = state_counts.get(state, 0) + 1
-        
-        return {
-            "total_groups": len(groups),
-            "total_schedules": len(schedules),
-            "state_counts": state_counts,
-            "group_name": group_name
-        }
+        return await inventory_cache.get(
+            ("scheduled-queries", group_name, endpoint_url),
+            lambda: _load_summary(group_name, endpoint_url),
+            refresh,
+        )
         
     except Exception as e:
         logger.error(f"Error fetching scheduled queries summary: {e}")
@@ -156,7 +300,8 @@ async def get_scheduled_queries_summary(
 @r.delete("/")
 async def delete_all_scheduled_queries(
     group_name: str = "crypto-forecast-schedules",
-    endpoint_url: str = 'http://localhost:4566'
+    endpoint_url: str = 'http://localhost:4566',
+    s: AsyncSession = Depends(db),
 ) -> Dict[str, Any]:
     """
     Delete all scheduled queries in the specified group
@@ -165,13 +310,25 @@ async def delete_all_scheduled_queries(
         # Import the deletion function
         from functions.planning.create_one_time_schedule import delete_all_schedules
         
-        result = delete_all_schedules(group_name, endpoint_url)
+        result = await run_aws(delete_all_schedules, group_name, endpoint_url)
         
         if result["status"] == "error":
             raise HTTPException(status_code=500, detail=result["message"])
         
+        # The summary snapshot is out of date now; reload it in the background
+        inventory_cache.schedule_refresh(("scheduled-queries", group_name, endpoint_url))
+        
+        # Sync the registry with what is left in EventBridge
+        if result["status"] == "success" and not result["errors"]:
+            await s.execute(sa.delete(PlannedSchedule).where(PlannedSchedule.group_name == group_name))
+            await s.commit()
+        else:
+            await reconcile_planned_schedules(s, get_localstack_scheduler_client(endpoint_url), group_name)
+        
         return result
         
+    except HTTPException:
+        raise
     except ImportError as e:
         logger.error(f"Failed to import deletion function: {e}")
         raise HTTPException(status_code=500, detail="Deletion function not available")
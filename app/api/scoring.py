@@ -0,0 +1,139 @@
+"""
+API endpoints for scoring LLM recommendations against realized price moves
+"""
+
+import asyncio
+from datetime import timedelta
+from typing import Any, Dict, List, Literal, Optional
+
+import pandas as pd
+import sqlalchemy as sa
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.deps import db
+from app.db.models import ForecastScore
+from app.utils.forecast_scoring import PRICE_TOLERANCE, load_report_csv_prices, load_store_prices, score_queries
+
+r = APIRouter(prefix="/scoring", tags=["scoring"])
+
+# Score rows per multi-row INSERT
+_WRITE_CHUNK = 1000
+
+# Queries with a recommendation, the asset they are about, the prompt/LLM they
+# ran with, and their horizon: Baseline Forecasts predict `paired_followup_delay_hours`
+# ahead, everything else is scored over :default_horizon.
+_SCOREABLE_QUERIES = sa.text("""
+SELECT
+  q.query_id,
+  q.scheduled_for_utc,
+  q.recommendation,
+  q.confidence,
+  a.asset_symbol,
+  p.llm_id,
+  p.prompt_id,
+  p.prompt_version,
+  COALESCE(qs.paired_followup_delay_hours, :default_horizon) AS horizon_hours
+FROM queries q
+JOIN surveys s ON s.survey_id = q.survey_id
+JOIN assets a ON a.asset_id = s.asset_id
+JOIN query_type qt ON qt.query_type_id = q.query_type_id
+JOIN query_schedules qs ON qs.query_schedule_id = q.query_schedule_id
+JOIN prompts p ON p.prompt_id = CASE
+      WHEN qt.query_type_name IN ('Initial Baseline', 'Follow-up') THEN s.live_prompt_id
+      ELSE s.forecast_prompt_id END
+LEFT JOIN forecast_scores fs ON fs.query_id = q.query_id
+WHERE q.recommendation IS NOT NULL
+  AND (:rescore OR fs.query_id IS NULL)
+""")
+
+
+@r.post("/run")
+async def run_scoring(
+    source: Literal["csv", "store", "db"] = "csv",
+    default_horizon_hours: int = 24,
+    hold_band: float = 0.01,
+    bar_hours: float = 24,
+    rescore: bool = False,
+    s: AsyncSession = Depends(db),
+) -> Dict[str, Any]:
+    """
+    Score every recommendation that has not been scored yet (or all with rescore=true).
+
+    source=csv prices from the snapshots committed under Reports/ and works offline;
+    source=store reads through the local PriceStore (fetching missing ranges);
+    source=db reads the asset_prices table. bar_hours is the length of the price
+    bars (24 for the daily csv/store sources); a bar's close counts from its end.
+    """
+    res = await s.execute(_SCOREABLE_QUERIES, {"default_horizon": default_horizon_hours, "rescore": rescore})
+    queries = pd.DataFrame(res.fetchall(), columns=list(res.keys()))
+    if queries.empty:
+        return {"candidates": 0, "scored": 0, "unscoreable": 0}
+
+    start = pd.to_datetime(queries["scheduled_for_utc"]).min() - PRICE_TOLERANCE
+    end = pd.to_datetime(queries["scheduled_for_utc"]).max() + timedelta(hours=int(queries["horizon_hours"].max()))
+    if source == "csv":
+        prices = await asyncio.to_thread(load_report_csv_prices)
+    elif source == "store":
+        prices = await asyncio.to_thread(load_store_prices, queries["asset_symbol"].unique(), start.date(), end.date())
+    else:
+        res = await s.execute(
+            sa.text("""
+            SELECT a.asset_symbol AS symbol, ap.ts, ap.close
+            FROM asset_prices ap
+            JOIN assets a ON a.asset_id = ap.asset_id
+            WHERE a.asset_symbol IN :symbols AND ap.ts >= :start AND ap.ts <= :end
+            ORDER BY ap.ts
+            """).bindparams(sa.bindparam("symbols", expanding=True)),
+            {"symbols": list(queries["asset_symbol"].unique()), "start": start.to_pydatetime(), "end": end.to_pydatetime()},
+        )
+        prices = pd.DataFrame(res.fetchall(), columns=["symbol", "ts", "close"])
+
+    scores = score_queries(queries, prices, hold_band=hold_band, bar_length=pd.Timedelta(hours=bar_hours))
+    if not scores.empty:
+        rows = [
+            {k: (None if pd.isna(v) else v) for k, v in row.items()}
+            for row in scores.astype(object).to_dict("records")
+        ]
+        for i in range(0, len(rows), _WRITE_CHUNK):
+            stmt = mysql_insert(ForecastScore).values(rows[i:i + _WRITE_CHUNK])
+            stmt = stmt.on_duplicate_key_update({
+                **{c: stmt.inserted[c] for c in rows[0] if c != "query_id"},
+                "scored_at": sa.func.now(),
+            })
+            await s.execute(stmt)
+        await s.commit()
+
+    return {"candidates": len(queries), "scored": len(scores), "unscoreable": len(queries) - len(scores)}
+
+
+@r.get("/summary", response_model=List[Dict[str, Any]])
+async def scoring_summary(
+    llm_id: Optional[int] = None,
+    prompt_version: Optional[int] = None,
+    s: AsyncSession = Depends(db),
+) -> List[Dict[str, Any]]:
+    """Hit rate, confidence-weighted hit rate and mean realized return per LLM / prompt_version."""
+    stmt = sa.text("""
+    SELECT
+      fs.llm_id,
+      l.llm_name,
+      fs.prompt_version,
+      COUNT(*)                                        AS scored,
+      SUM(fs.hit)                                     AS hits,
+      AVG(fs.hit)                                     AS hit_rate,
+      SUM(fs.hit * fs.confidence) / NULLIF(SUM(fs.confidence), 0) AS confidence_weighted_hit_rate,
+      AVG(fs.realized_return)                         AS mean_realized_return
+    FROM forecast_scores fs
+    LEFT JOIN llms l ON l.llm_id = fs.llm_id
+    WHERE (:llm_id IS NULL OR fs.llm_id = :llm_id)
+      AND (:prompt_version IS NULL OR fs.prompt_version = :prompt_version)
+    GROUP BY fs.llm_id, l.llm_name, fs.prompt_version
+    ORDER BY fs.llm_id, fs.prompt_version
+    """)
+    try:
+        res = await s.execute(stmt, {"llm_id": llm_id, "prompt_version": prompt_version})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to summarize scores: {str(e)}")
+    return [dict(row._mapping) for row in res.fetchall()]
@@ -1,8 +1,8 @@
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import String, Text, Integer, Boolean, ForeignKey, Time, DateTime, Float
+from sqlalchemy import String, Text, Integer, Boolean, ForeignKey, Time, Date, DateTime, Float, Index
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.sql import func
-from sqlalchemy.dialects.mysql import JSON
+from sqlalchemy.dialects.mysql import JSON, LONGBLOB
 import datetime
 
 class Base(DeclarativeBase):
@@ -22,6 +22,17 @@ class Asset(Base):
     asset_symbol: Mapped[str] = mapped_column(String(64))
     description: Mapped[str | None] = mapped_column(Text)
 
+class AssetPrice(Base):
+    __tablename__ = "asset_prices"
+    # Composite PK is InnoDB's clustered index: one asset's bars are stored contiguously by ts
+    asset_id: Mapped[int] = mapped_column(ForeignKey("assets.asset_id", ondelete="CASCADE"), primary_key=True)
+    ts: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=False), primary_key=True)
+    open: Mapped[float | None] = mapped_column(Float, default=None)
+    high: Mapped[float | None] = mapped_column(Float, default=None)
+    low: Mapped[float | None] = mapped_column(Float, default=None)
+    close: Mapped[float] = mapped_column(Float)
+    volume: Mapped[float | None] = mapped_column(Float, default=None)
+
 class LLM(Base):
     __tablename__ = "llms"
     llm_id: Mapped[int] = mapped_column(primary_key=True)
@@ -78,6 +89,10 @@ class Survey(Base):
 
 class CryptoQuery(Base):
     __tablename__ = "queries"
+    __table_args__ = (
+        # Covering index for /reports/timeseries, which range-scans scheduled_for_utc (matches init.sql)
+        Index("idx_cq_time_report", "scheduled_for_utc", "recommendation", "confidence", "survey_id", "query_type_id"),
+    )
     query_id: Mapped[int] = mapped_column(primary_key=True)
     survey_id: Mapped[int] = mapped_column(ForeignKey("surveys.survey_id", ondelete="RESTRICT"), index=True)
     schedule_id: Mapped[int] = mapped_column(ForeignKey("schedules.schedule_id", ondelete="RESTRICT"), index=True)
@@ -112,3 +127,72 @@ class CryptoForecast(Base):
     query_id: Mapped[int] = mapped_column(ForeignKey("queries.query_id", ondelete="CASCADE"), index=True)
     horizon_type: Mapped[str] = mapped_column(String(50))
     forecast_value: Mapped[dict | None] = mapped_column(JSON)
+
+
+class ForecastScore(Base):
+    __tablename__ = "forecast_scores"
+    __table_args__ = (
+        Index("idx_fs_llm_prompt_version", "llm_id", "prompt_version"),
+    )
+    score_id: Mapped[int] = mapped_column(primary_key=True)
+    query_id: Mapped[int] = mapped_column(ForeignKey("queries.query_id", ondelete="CASCADE"), unique=True)
+    llm_id: Mapped[int | None] = mapped_column(ForeignKey("llms.llm_id", ondelete="SET NULL"), default=None)
+    prompt_id: Mapped[int | None] = mapped_column(ForeignKey("prompts.prompt_id", ondelete="SET NULL"), default=None)
+    prompt_version: Mapped[int | None] = mapped_column(default=None)
+    asset_symbol: Mapped[str] = mapped_column(String(64))
+    recommendation: Mapped[str] = mapped_column(SAEnum("BUY", "SELL", "HOLD", name="recommendation_enum"))
+    confidence: Mapped[float | None] = mapped_column(Float, default=None)
+    horizon_hours: Mapped[int]
+    entry_ts: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=False))
+    entry_price: Mapped[float] = mapped_column(Float)
+    exit_ts: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=False))
+    exit_price: Mapped[float] = mapped_column(Float)
+    realized_return: Mapped[float] = mapped_column(Float)
+    hit: Mapped[bool] = mapped_column(Boolean)
+    scored_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=False), server_default=func.now())
+
+class PlannedSchedule(Base):
+    """Registry of EventBridge schedules created by forecast planning (mirrors EventBridge state)"""
+    __tablename__ = "planned_schedules"
+    __table_args__ = (
+        Index("idx_ps_survey_time", "survey_id", "scheduled_for_utc"),
+        Index("idx_ps_asset_time", "asset_id", "scheduled_for_utc"),
+        Index("idx_ps_time", "scheduled_for_utc"),
+        Index("idx_ps_group_plan_date", "group_name", "plan_date"),
+    )
+    planned_schedule_id: Mapped[int] = mapped_column(primary_key=True)
+    schedule_name: Mapped[str] = mapped_column(String(64), unique=True)
+    group_name: Mapped[str] = mapped_column(String(64), default="crypto-forecast-schedules")
+    schedule_arn: Mapped[str | None] = mapped_column(String(512), default=None)
+    schedule_expression: Mapped[str] = mapped_column(String(64))
+    payload_hash: Mapped[str | None] = mapped_column(String(64), default=None)
+    state: Mapped[str] = mapped_column(String(16), default="ENABLED")
+    plan_date: Mapped[datetime.date | None] = mapped_column(Date, default=None)
+    survey_id: Mapped[int | None] = mapped_column(default=None)
+    asset_id: Mapped[int | None] = mapped_column(default=None)
+    query_schedule_id: Mapped[int | None] = mapped_column(default=None)
+    scheduled_for_utc: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=False), default=None)
+    schedule_name_label: Mapped[str | None] = mapped_column(String(255), default=None)
+    query_type_name: Mapped[str | None] = mapped_column(String(255), default=None)
+    delay_hours: Mapped[int | None] = mapped_column(default=None)
+    asset_name: Mapped[str | None] = mapped_column(String(255), default=None)
+    llm_name: Mapped[str | None] = mapped_column(String(255), default=None)
+    target_llm_name: Mapped[str | None] = mapped_column(String(255), default=None)
+    prompt_type: Mapped[str | None] = mapped_column(String(32), default=None)
+    description: Mapped[str | None] = mapped_column(Text, default=None)
+    created_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=False), server_default=func.now())
+    last_synced_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=False), default=None)
+
+
+class PlanTemplate(Base):
+    """Last generated plan per planning scope, reused while the planning inputs are unchanged"""
+    __tablename__ = "plan_templates"
+    plan_template_id: Mapped[int] = mapped_column(primary_key=True)
+    scope: Mapped[str] = mapped_column(String(128), unique=True)
+    fingerprint: Mapped[str] = mapped_column(String(64))
+    base_date: Mapped[datetime.date] = mapped_column(Date)
+    survey_count: Mapped[int] = mapped_column(default=0)
+    request_count: Mapped[int] = mapped_column(default=0)
+    stats: Mapped[dict | None] = mapped_column(JSON, default=None)
+    template: Mapped[bytes] = mapped_column(LONGBLOB)
+    created_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=False), server_default=func.now())
@@ -12,7 +12,10 @@ from app.api.reporting import r as reporting_router
 from app.api.scheduled_queries import r as scheduled_queries_router
 from app.api.eventbridge_rules import r as eventbridge_rules_router
 from app.api.lambda_functions import r as lambda_functions_router
+from app.api.scoring import r as scoring_router
+from app.api.prices import r as prices_router
 from app.api.crud import build_crud_router
+from app.utils.inventory_cache import inventory_cache
 from app.schemas import dto as D
 
 app = FastAPI(title="Crypto Forecasts API")
@@ -25,6 +28,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 @app.on_event("startup")
@@ -34,6 +38,15 @@ async def maybe_create_tables():
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
+@app.on_event("startup")
+async def start_inventory_refresher():
+    # Background snapshots of AWS rules/functions/schedules for the summary endpoints
+    inventory_cache.start()
+
+@app.on_event("shutdown")
+async def stop_inventory_refresher():
+    await inventory_cache.stop()
+
 @app.get("/healthz")
 async def healthz():
     return {"ok": True}
@@ -144,3 +157,5 @@ app.include_router(reporting_router)
 app.include_router(scheduled_queries_router)
 app.include_router(eventbridge_rules_router)
 app.include_router(lambda_functions_router)
+app.include_router(scoring_router)
+app.include_router(prices_router)
@@ -60,6 +60,30 @@ class AssetOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+# ---------------------------------------------------------------------
+# Asset Prices
+# ---------------------------------------------------------------------
+
+PriceInterval = Literal["raw", "1h", "1d", "1w"]
+
+class AssetPriceIn(BaseModel):
+    ts: datetime.datetime
+    open: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    close: float
+    volume: Optional[float] = None
+
+class AssetPriceOut(BaseModel):
+    ts: datetime.datetime
+    open: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    close: float
+    volume: Optional[float] = None
+    model_config = {"from_attributes": True}
+
+
 # ---------------------------------------------------------------------
 # LLMs
 # ---------------------------------------------------------------------
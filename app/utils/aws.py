@@ -0,0 +1,146 @@
+"""
+Shared helpers for LocalStack / AWS clients and listings.
+
+`get_client` hands out one pooled, thread-safe boto3 client per (service,
+endpoint, region) for the whole process instead of building a new client (and
+HTTP pool) on every call.
+
+boto3 is blocking, so async code runs AWS calls through `run_aws`, which uses a
+dedicated bounded thread pool and keeps the event loop free for other requests.
+
+Every list call here follows NextToken (or Marker) to the end, so callers never
+silently see only the first page. `fetch_page` serves one page at a time for
+endpoints that let the UI page through large inventories.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+import boto3
+from botocore.config import Config
+
+DEFAULT_REGION = "us-east-1"
+
+# LocalStack accepts any credentials; these are used whenever an endpoint_url is given
+LOCALSTACK_ACCESS_KEY = os.getenv("LOCALSTACK_ACCESS_KEY_ID", "ls-reqe8270-Qidi-ViFe-sIku-1863Vode4933")
+LOCALSTACK_SECRET_KEY = os.getenv("LOCALSTACK_SECRET_ACCESS_KEY", "ls-reqe8270-Qidi-ViFe-sIku-1863Vode4933")
+
+# Sized for the API's thread pools and concurrent schedule creation; adaptive
+# retries add client-side rate limiting on throttling errors
+CLIENT_CONFIG = Config(
+    max_pool_connections=int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "50")),
+    retries={"mode": "adaptive", "max_attempts": 5},
+    connect_timeout=5,
+    read_timeout=30,
+)
+
+_clients: Dict[Tuple[str, Optional[str], str], Any] = {}
+_clients_lock = threading.Lock()
+
+# Threads for blocking AWS calls made from async code; kept at or below the client
+# connection pool size so threads never queue on a connection
+AWS_IO_WORKERS = int(os.getenv("AWS_IO_WORKERS", "32"))
+_aws_executor = ThreadPoolExecutor(max_workers=AWS_IO_WORKERS, thread_name_prefix="aws-io")
+
+T = TypeVar("T")
+
+
+def get_client(service: str, endpoint_url: Optional[str] = None, region_name: str = DEFAULT_REGION):
+    """
+    Shared boto3 client for (service, endpoint_url, region_name).
+
+    Clients are created once per process and reused; boto3 clients are thread-safe.
+    With an endpoint_url (LocalStack) the LocalStack credentials are used, otherwise
+    the default AWS credential chain.
+    """
+    key = (service, endpoint_url, region_name)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            credentials = {}
+            if endpoint_url:
+                credentials = {
+                    "aws_access_key_id": LOCALSTACK_ACCESS_KEY,
+                    "aws_secret_access_key": LOCALSTACK_SECRET_KEY,
+                }
+            # boto3.client() shares the default session, which is not thread-safe
+            client = boto3.session.Session().client(
+                service, endpoint_url=endpoint_url, region_name=region_name,
+                config=CLIENT_CONFIG, **credentials,
+            )
+            _clients[key] = client
+        return client
+
+
+
+async def run_aws(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking boto3 call (or any function making them) on the AWS I/O pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_aws_executor, functools.partial(func, *args, **kwargs))
+
+# Largest page each service accepts per request
+SCHEDULES_PAGE_SIZE = 100
+RULES_PAGE_SIZE = 100
+FUNCTIONS_PAGE_SIZE = 50
+
+
+def iter_schedules(scheduler, group_name: Optional[str] = None, **kwargs) -> Iterator[Dict[str, Any]]:
+    """Yield every schedule summary (optionally within one group) across all pages."""
+    if group_name:
+        kwargs["GroupName"] = group_name
+    paginator = scheduler.get_paginator("list_schedules")
+    for page in paginator.paginate(PaginationConfig={"PageSize": SCHEDULES_PAGE_SIZE}, **kwargs):
+        yield from page.get("Schedules", [])
+
+
+def iter_schedule_groups(scheduler) -> Iterator[Dict[str, Any]]:
+    """Yield every schedule group across all pages."""
+    paginator = scheduler.get_paginator("list_schedule_groups")
+    for page in paginator.paginate(PaginationConfig={"PageSize": SCHEDULES_PAGE_SIZE}):
+        yield from page.get("ScheduleGroups", [])
+
+
+def iter_rules(events_client, **kwargs) -> Iterator[Dict[str, Any]]:
+    """Yield every EventBridge rule across all pages."""
+    paginator = events_client.get_paginator("list_rules")
+    for page in paginator.paginate(PaginationConfig={"PageSize": RULES_PAGE_SIZE}, **kwargs):
+        yield from page.get("Rules", [])
+
+
+def iter_functions(lambda_client, **kwargs) -> Iterator[Dict[str, Any]]:
+    """Yield every Lambda function across all pages."""
+    paginator = lambda_client.get_paginator("list_functions")
+    for page in paginator.paginate(PaginationConfig={"PageSize": FUNCTIONS_PAGE_SIZE}, **kwargs):
+        yield from page.get("Functions", [])
+
+
+def fetch_page(
+    client,
+    operation: str,
+    result_key: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    **kwargs,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch up to `limit` items of a paginated list operation starting at `cursor`.
+
+    The cursor is botocore's opaque resume token, so the same scheme works for
+    NextToken (scheduler, events) and Marker (lambda) based APIs.
+
+    Returns:
+        (items, next_cursor) where next_cursor is None on the last page
+    """
+    paginator = client.get_paginator(operation)
+    config = {"MaxItems": limit, "PageSize": limit}
+    if cursor:
+        config["StartingToken"] = cursor
+    result = paginator.paginate(PaginationConfig=config, **kwargs).build_full_result()
+    return result.get(result_key, []), result.get("NextToken")
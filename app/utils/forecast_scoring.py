@@ -0,0 +1,171 @@
+"""
+Forecast scoring: join LLM recommendations to realized price moves.
+
+Each scored query has an entry price (last close at or before scheduled_for_utc)
+and an exit price (last close at or before scheduled_for_utc + horizon_hours),
+both found with vectorized as-of joins. Bars are stamped with their start (a
+daily bar with its date's midnight) but hold their close, so a bar's price only
+counts once the bar has ended: at ts + bar_length. A BUY is a hit when the price rose, a
+SELL when it fell, and a HOLD when it moved less than `hold_band`.
+
+Prices can come from the CSV snapshots committed under Reports/ (offline) or
+from the local PriceStore.
+"""
+
+import os
+import glob
+from typing import Iterable, Optional
+
+import pandas as pd
+
+REPORTS_DIR = os.getenv(
+    "REPORTS_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "Reports"),
+)
+
+# Report CSVs name some assets differently from assets.asset_symbol
+_SYMBOL_ALIASES = {
+    "BTC": "BTC-USD",
+    "ETH": "ETH-USD",
+    "Bitcoin": "BTC-USD",
+    "Ethereum": "ETH-USD",
+    "Gold": "GC=F",
+}
+
+# Entry/exit bars further than this from their target time are treated as missing
+PRICE_TOLERANCE = pd.Timedelta(days=4)
+# Every price source here holds daily bars
+DAILY_BAR = pd.Timedelta(days=1)
+
+SCORE_COLUMNS = [
+    "query_id", "asset_symbol", "recommendation", "confidence", "horizon_hours",
+    "entry_ts", "entry_price", "exit_ts", "exit_price", "realized_return", "hit",
+]
+
+
+def _utc_naive(values) -> pd.Series:
+    return pd.to_datetime(values, utc=True).dt.tz_localize(None)
+
+
+def load_report_csv_prices(reports_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read every price snapshot committed under Reports/ into one tidy frame.
+
+    Understands the three layouts in the repo:
+      - <SYMBOL>_prices.csv            (index=date, Close)
+      - YahooReport/<X>_historical_data.csv  (yfinance history dump)
+      - crypto_gold_*.csv              (wide: Date, Bitcoin, Ethereum, Gold as "$1,234.56")
+
+    Returns:
+        DataFrame with columns symbol, ts (naive UTC), close; sorted by ts
+    """
+    reports_dir = reports_dir or REPORTS_DIR
+    frames = []
+
+    for path in glob.glob(os.path.join(reports_dir, "*_prices.csv")):
+        symbol = os.path.basename(path)[: -len("_prices.csv")]
+        df = pd.read_csv(path, index_col=0)
+        frames.append(pd.DataFrame({
+            "symbol": _SYMBOL_ALIASES.get(symbol, symbol),
+            "ts": _utc_naive(pd.Series(df.index)),
+            "close": df["Close"].to_numpy(),
+        }))
+
+    for path in glob.glob(os.path.join(reports_dir, "**", "*_historical_data.csv"), recursive=True):
+        symbol = os.path.basename(path)[: -len("_historical_data.csv")]
+        df = pd.read_csv(path)
+        # Daily bars carry the exchange's local midnight; keep the calendar date
+        dates = pd.to_datetime(df["Date"].str[:10])
+        frames.append(pd.DataFrame({
+            "symbol": _SYMBOL_ALIASES.get(symbol, symbol),
+            "ts": dates,
+            "close": df["Close"].to_numpy(),
+        }))
+
+    for path in glob.glob(os.path.join(reports_dir, "crypto_gold_*.csv")):
+        df = pd.read_csv(path)
+        dates = pd.to_datetime(df.pop("Date"), format="%m/%d/%Y")
+        for column in df.columns:
+            closes = pd.to_numeric(df[column].astype(str).str.replace(r"[$,]", "", regex=True), errors="coerce")
+            frames.append(pd.DataFrame({
+                "symbol": _SYMBOL_ALIASES.get(column, column),
+                "ts": dates,
+                "close": closes.to_numpy(),
+            }))
+
+    if not frames:
+        return pd.DataFrame(columns=["symbol", "ts", "close"])
+    prices = pd.concat(frames, ignore_index=True).dropna(subset=["close"])
+    prices = prices.drop_duplicates(subset=["symbol", "ts"], keep="last")
+    return prices.sort_values("ts", kind="stable").reset_index(drop=True)
+
+
+def load_store_prices(symbols: Iterable[str], start, end, store=None) -> pd.DataFrame:
+    """Same tidy layout as load_report_csv_prices, read through the PriceStore."""
+    from app.utils.price_store import PriceStore
+
+    store = store or PriceStore()
+    frames = []
+    for symbol in dict.fromkeys(symbols):
+        bars = store.get_prices(symbol, start, end)
+        frames.append(pd.DataFrame({"symbol": symbol, "ts": bars.index, "close": bars["Close"].to_numpy()}))
+    if not frames:
+        return pd.DataFrame(columns=["symbol", "ts", "close"])
+    return pd.concat(frames, ignore_index=True).dropna(subset=["close"]).sort_values("ts", kind="stable")
+
+
+def score_queries(
+    queries: pd.DataFrame, prices: pd.DataFrame, hold_band: float = 0.01, bar_length: pd.Timedelta = DAILY_BAR
+) -> pd.DataFrame:
+    """
+    Score recommendations against realized returns.
+
+    Args:
+        queries: columns query_id, asset_symbol, scheduled_for_utc, recommendation,
+            confidence, horizon_hours (extra columns are carried through)
+        prices: columns symbol, ts, close
+        hold_band: absolute return under which a HOLD counts as a hit
+        bar_length: time each price bar spans; its close is known at ts + bar_length
+
+    Returns:
+        One row per scoreable query (both prices found and at least one bar apart)
+        with SCORE_COLUMNS plus any extra query columns; entry_ts and exit_ts
+        are the close times of the bars used
+    """
+    if queries.empty or prices.empty:
+        return pd.DataFrame(columns=SCORE_COLUMNS)
+
+    q = queries.copy()
+    q["entry_target"] = _utc_naive(q["scheduled_for_utc"])
+    q["exit_target"] = q["entry_target"] + pd.to_timedelta(q["horizon_hours"], unit="h")
+
+    px = prices.rename(columns={"symbol": "asset_symbol"})[["asset_symbol", "ts", "close"]].copy()
+    # Stamp each bar with its close time so no query sees a close from its future
+    px["ts"] = pd.to_datetime(px["ts"]) + bar_length
+    px = px.sort_values("ts", kind="stable")
+
+    q = pd.merge_asof(
+        q.sort_values("entry_target", kind="stable"),
+        px.rename(columns={"ts": "entry_ts", "close": "entry_price"}),
+        left_on="entry_target", right_on="entry_ts", by="asset_symbol",
+        direction="backward", tolerance=PRICE_TOLERANCE,
+    )
+    q = pd.merge_asof(
+        q.sort_values("exit_target", kind="stable"),
+        px.rename(columns={"ts": "exit_ts", "close": "exit_price"}),
+        left_on="exit_target", right_on="exit_ts", by="asset_symbol",
+        direction="backward", tolerance=PRICE_TOLERANCE,
+    )
+
+    # Both prices known and the horizon spans at least one new bar
+    q = q[q["entry_price"].notna() & q["exit_price"].notna() & (q["exit_ts"] > q["entry_ts"])].copy()
+    q["realized_return"] = q["exit_price"] / q["entry_price"] - 1.0
+    rec = q["recommendation"].str.upper()
+    q["hit"] = (
+        ((rec == "BUY") & (q["realized_return"] > 0))
+        | ((rec == "SELL") & (q["realized_return"] < 0))
+        | ((rec == "HOLD") & (q["realized_return"].abs() <= hold_band))
+    )
+
+    extra = [c for c in queries.columns if c not in SCORE_COLUMNS and c != "scheduled_for_utc"]
+    return q[SCORE_COLUMNS + extra].sort_values("query_id").reset_index(drop=True)
@@ -0,0 +1,168 @@
+"""
+In-memory snapshots of AWS inventories (rules, functions, schedules) for the summary endpoints.
+
+Each snapshot has an async loader. A background task started with the app
+refreshes every registered snapshot every INVENTORY_REFRESH_SECONDS, and readers
+are answered from memory (stale-while-revalidate). A snapshot older than two
+intervals triggers a background refresh but is still served, a failed refresh
+keeps the previous snapshot, and only the very first read of a snapshot waits
+for AWS.
+
+Only snapshots registered up front (at import / startup) are refreshed in the
+background. A read of any other key (the summary routes take the group and
+endpoint from query parameters) gets an ad-hoc entry: it is loaded on first read,
+revalidated only by later reads, and at most INVENTORY_AD_HOC_MAX of them are
+kept, least recently read dropped first.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+INVENTORY_REFRESH_SECONDS = float(os.getenv("INVENTORY_REFRESH_SECONDS", "30"))
+INVENTORY_AD_HOC_MAX = int(os.getenv("INVENTORY_AD_HOC_MAX", "64"))
+
+Loader = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class _Snapshot:
+    loader: Loader
+    value: Optional[Dict[str, Any]] = None
+    refreshed_at: Optional[datetime] = None
+    refreshed_monotonic: float = 0.0
+    refreshing: Optional[asyncio.Task] = None
+
+
+class InventoryCache:
+    """
+    Registry of refreshable inventory snapshots.
+
+    Args:
+        interval: Seconds between background refreshes
+        ad_hoc_max: Unregistered snapshots kept at most (see the module docstring)
+    """
+
+    def __init__(self, interval: float = INVENTORY_REFRESH_SECONDS, ad_hoc_max: int = INVENTORY_AD_HOC_MAX):
+        self.interval = interval
+        self.ad_hoc_max = ad_hoc_max
+        self._snapshots: Dict[Hashable, _Snapshot] = {}
+        # Snapshots read with a loader but never registered; not background-refreshed
+        self._ad_hoc: "OrderedDict[Hashable, _Snapshot]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, key: Hashable, loader: Loader) -> None:
+        """Register a snapshot so the background task keeps it warm (idempotent)."""
+        if key not in self._snapshots:
+            self._snapshots[key] = _Snapshot(loader=loader)
+
+    def clear(self) -> None:
+        """Forget every snapshot value (registrations are kept, ad-hoc entries dropped)."""
+        self._ad_hoc.clear()
+        for snapshot in self._snapshots.values():
+            snapshot.value = None
+            snapshot.refreshed_at = None
+            snapshot.refreshed_monotonic = 0.0
+
+    async def get(self, key: Hashable, loader: Optional[Loader] = None, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Snapshot value for `key` plus `refreshed_at` / `stale` metadata.
+
+        Args:
+            loader: Loads the snapshot when `key` is not registered (an ad-hoc entry)
+            refresh: Reload from AWS now instead of answering from memory
+        """
+        snapshot = self._snapshots.get(key) or self._ad_hoc_snapshot(key, loader)
+
+        if refresh or snapshot.value is None:
+            await self._refresh(snapshot)
+        elif time.monotonic() - snapshot.refreshed_monotonic > 2 * self.interval:
+            self._refresh_in_background(snapshot)
+
+        age = time.monotonic() - snapshot.refreshed_monotonic
+        return {
+            **snapshot.value,
+            "refreshed_at": snapshot.refreshed_at.isoformat(),
+            "stale": age > 2 * self.interval,
+        }
+
+    def _ad_hoc_snapshot(self, key: Hashable, loader: Optional[Loader]) -> _Snapshot:
+        """Ad-hoc entry for an unregistered key, created on first read (KeyError without a loader)"""
+        snapshot = self._ad_hoc.get(key)
+        if snapshot is None:
+            if loader is None:
+                raise KeyError(key)
+            snapshot = self._ad_hoc[key] = _Snapshot(loader=loader)
+            while len(self._ad_hoc) > self.ad_hoc_max:
+                self._ad_hoc.popitem(last=False)
+        self._ad_hoc.move_to_end(key)
+        return snapshot
+
+    async def _refresh(self, snapshot: _Snapshot) -> None:
+        """Reload one snapshot, sharing an in-flight refresh; raises only if there is no previous value."""
+        if snapshot.refreshing is None or snapshot.refreshing.done():
+            snapshot.refreshing = asyncio.create_task(self._load(snapshot))
+        await asyncio.shield(snapshot.refreshing)
+        if snapshot.value is None:
+            exc = snapshot.refreshing.exception()
+            raise exc if exc else RuntimeError("inventory snapshot unavailable")
+
+    def schedule_refresh(self, key: Hashable) -> None:
+        """Refresh a snapshot in the background, e.g. after a write made it stale."""
+        snapshot = self._snapshots.get(key) or self._ad_hoc.get(key)
+        if snapshot is not None and snapshot.value is not None:
+            self._refresh_in_background(snapshot)
+
+    def _refresh_in_background(self, snapshot: _Snapshot) -> None:
+        if snapshot.refreshing is None or snapshot.refreshing.done():
+            snapshot.refreshing = asyncio.create_task(self._load(snapshot))
+
+    async def _load(self, snapshot: _Snapshot) -> None:
+        try:
+            value = await snapshot.loader()
+        except Exception as e:
+            logger.warning(f"Inventory refresh failed, keeping previous snapshot: {e}")
+            if snapshot.value is None:
+                raise
+            return
+        snapshot.value = value
+        snapshot.refreshed_at = datetime.now(timezone.utc)
+        snapshot.refreshed_monotonic = time.monotonic()
+
+    async def refresh_all(self) -> None:
+        """Refresh every registered snapshot concurrently; failures keep the old value."""
+        await asyncio.gather(
+            *(self._refresh(s) for s in self._snapshots.values()),
+            return_exceptions=True,
+        )
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh_all()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background refresher (call from app startup)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background refresher (call from app shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Process-wide cache used by the summary endpoints
+inventory_cache = InventoryCache()
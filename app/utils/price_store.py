@@ -0,0 +1,217 @@
+"""
+Local daily price store with incremental range fetch.
+
+Each symbol gets its own SQLite file holding one row per trading date plus a
+`coverage` table of date ranges that have already been fetched. A request only
+goes to the network for the parts of the range not yet covered, so repeated
+report runs over historical dates are served entirely from disk.
+
+Used by the API and by the scripts under Reports/ (which add the repo root to
+sys.path).
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+
+DateLike = Union[str, dt.date, dt.datetime]
+# fetcher(symbol, start, end) -> DataFrame indexed by date with Open/High/Low/Close/Volume
+Fetcher = Callable[[str, dt.date, dt.date], pd.DataFrame]
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+DEFAULT_STORE_DIR = os.getenv(
+    "PRICE_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "Reports", "price_store"),
+)
+
+
+def _to_date(d: DateLike) -> dt.date:
+    if isinstance(d, dt.datetime):
+        return d.date()
+    if isinstance(d, dt.date):
+        return d
+    return dt.datetime.strptime(d, "%Y-%m-%d").date()
+
+
+def yfinance_fetcher(symbol: str, start: dt.date, end: dt.date) -> pd.DataFrame:
+    """Fetch daily bars for [start, end] from Yahoo Finance (yfinance's `end` is exclusive)."""
+    import yfinance as yf
+
+    hist = yf.Ticker(symbol).history(start=start, end=end + dt.timedelta(days=1))
+    if hist.empty:
+        return pd.DataFrame(columns=PRICE_COLUMNS)
+    hist.index = pd.DatetimeIndex(hist.index.date)
+    return hist[PRICE_COLUMNS]
+
+
+def missing_ranges(
+    start: dt.date, end: dt.date, covered: List[Tuple[dt.date, dt.date]]
+) -> List[Tuple[dt.date, dt.date]]:
+    """Return the sub-ranges of [start, end] (inclusive) not inside any covered range."""
+    gaps = []
+    cursor = start
+    for c_start, c_end in sorted(covered):
+        if c_end < cursor:
+            continue
+        if c_start > end:
+            break
+        if c_start > cursor:
+            gaps.append((cursor, c_start - dt.timedelta(days=1)))
+        cursor = max(cursor, c_end + dt.timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def _merge_ranges(ranges: List[Tuple[dt.date, dt.date]]) -> List[Tuple[dt.date, dt.date]]:
+    merged: List[Tuple[dt.date, dt.date]] = []
+    for r_start, r_end in sorted(ranges):
+        if merged and r_start <= merged[-1][1] + dt.timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], r_end))
+        else:
+            merged.append((r_start, r_end))
+    return merged
+
+
+class PriceStore:
+    """
+    Per-symbol SQLite cache of daily prices.
+
+    Args:
+        root: Directory holding one `<symbol>.sqlite` file per symbol
+        fetcher: Called for each uncovered range; defaults to yfinance
+    """
+
+    _locks: Dict[str, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(self, root: Optional[str] = None, fetcher: Optional[Fetcher] = None):
+        self.root = root or DEFAULT_STORE_DIR
+        self.fetcher = fetcher or yfinance_fetcher
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.root, re.sub(r"[^A-Za-z0-9._-]", "_", symbol) + ".sqlite")
+
+    def _lock(self, symbol: str) -> threading.Lock:
+        path = self._path(symbol)
+        with self._locks_guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def _connect(self, symbol: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path(symbol))
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS prices ("
+            " date TEXT PRIMARY KEY, open REAL, high REAL, low REAL, close REAL, volume REAL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS coverage (start TEXT NOT NULL, end TEXT NOT NULL)")
+        return conn
+
+    def covered_ranges(self, symbol: str) -> List[Tuple[dt.date, dt.date]]:
+        """Date ranges (inclusive) already fetched for `symbol`."""
+        with closing(self._connect(symbol)) as conn:
+            return self._read_coverage(conn)
+
+    @staticmethod
+    def _read_coverage(conn: sqlite3.Connection) -> List[Tuple[dt.date, dt.date]]:
+        rows = conn.execute("SELECT start, end FROM coverage").fetchall()
+        return [(_to_date(s), _to_date(e)) for s, e in rows]
+
+    def get_prices(self, symbol: str, start: DateLike, end: DateLike) -> pd.DataFrame:
+        """
+        Daily bars for `symbol` between `start` and `end` (inclusive).
+
+        Only uncovered gaps are fetched. Today and later are never marked as
+        covered, since the current day's bar is still moving.
+
+        Returns:
+            DataFrame indexed by date (DatetimeIndex) with Open/High/Low/Close/Volume
+        """
+        start, end = _to_date(start), _to_date(end)
+        if start > end:
+            raise ValueError(f"start {start} is after end {end}")
+        last_final_day = dt.date.today() - dt.timedelta(days=1)
+
+        with self._lock(symbol), closing(self._connect(symbol)) as conn:
+            covered = self._read_coverage(conn)
+            gaps = missing_ranges(start, end, covered)
+            for g_start, g_end in gaps:
+                fetched = self.fetcher(symbol, g_start, g_end)
+                self._write_prices(conn, fetched)
+                if g_start <= last_final_day:
+                    covered.append((g_start, min(g_end, last_final_day)))
+            if gaps:
+                conn.execute("DELETE FROM coverage")
+                conn.executemany(
+                    "INSERT INTO coverage (start, end) VALUES (?, ?)",
+                    [(s.isoformat(), e.isoformat()) for s, e in _merge_ranges(covered)],
+                )
+                conn.commit()
+
+            rows = conn.execute(
+                "SELECT date, open, high, low, close, volume FROM prices"
+                " WHERE date BETWEEN ? AND ? ORDER BY date",
+                (start.isoformat(), end.isoformat()),
+            ).fetchall()
+
+        frame = pd.DataFrame(rows, columns=["Date"] + PRICE_COLUMNS)
+        frame.index = pd.DatetimeIndex(pd.to_datetime(frame.pop("Date")), name="Date")
+        return frame
+
+    @staticmethod
+    def _write_prices(conn: sqlite3.Connection, frame: pd.DataFrame) -> None:
+        if frame is None or frame.empty:
+            return
+        frame = frame.reindex(columns=PRICE_COLUMNS)
+        dates = pd.DatetimeIndex(frame.index).strftime("%Y-%m-%d")
+        conn.executemany(
+            "INSERT OR REPLACE INTO prices (date, open, high, low, close, volume) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (d, *(None if pd.isna(v) else float(v) for v in values))
+                for d, values in zip(dates, frame.itertuples(index=False, name=None))
+            ],
+        )
+
+
+def get_close_prices(
+    symbols: Iterable[str],
+    dates: Iterable[DateLike],
+    store: Optional[PriceStore] = None,
+    max_workers: int = 8,
+) -> pd.DataFrame:
+    """
+    Closing prices for many symbols on many dates.
+
+    Each symbol's covering range is loaded through the store on a bounded thread
+    pool, then aligned to the requested dates with a single vectorized reindex.
+    Dates without a bar (weekends, holidays, unknown symbols) get NaN.
+
+    Returns:
+        Tidy DataFrame with columns symbol, date, close (one row per symbol x date)
+    """
+    store = store or PriceStore()
+    symbols = list(dict.fromkeys(symbols))
+    wanted = pd.DatetimeIndex(sorted({_to_date(d) for d in dates}), name="date")
+    if not symbols or wanted.empty:
+        return pd.DataFrame(columns=["symbol", "date", "close"])
+
+    start, end = wanted[0].date(), wanted[-1].date()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as pool:
+        frames = list(pool.map(lambda sym: store.get_prices(sym, start, end), symbols))
+
+    closes = pd.DataFrame(
+        {sym: frame["Close"].reindex(wanted) for sym, frame in zip(symbols, frames)},
+        index=wanted,
+    )
+    tidy = closes.melt(ignore_index=False, var_name="symbol", value_name="close").reset_index()
+    return tidy[["symbol", "date", "close"]]
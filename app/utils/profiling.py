@@ -0,0 +1,97 @@
+"""
+Per-phase timing and memory for batch jobs.
+
+`PhaseProfile.phase(name)` times a block and, when memory tracing is on, records
+the tracemalloc peak reached inside it (everything allocated since tracing started
+and still live, so data loaded by earlier phases counts too). Phases may nest and repeat: a phase's
+seconds exclude its nested phases, so the totals add up to the wall time spent
+in profiled code, and repeated entries accumulate. `ProfiledSession` wraps an
+AsyncSession so every `execute` counts as one phase (database time), whatever
+code issues it.
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+
+class PhaseProfile:
+    """
+    Accumulated seconds, calls and peak traced memory per phase name.
+
+    Args:
+        trace_memory: Start tracemalloc (if not already running) and report peaks;
+            tracing slows allocation-heavy code noticeably
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self._stack: List[Dict[str, Any]] = []
+        self._started_tracing = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def _peak(self) -> int:
+        return tracemalloc.get_traced_memory()[1] if self.trace_memory else 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if self._stack:
+            parent = self._stack[-1]
+            parent["peak"] = max(parent["peak"], self._peak())
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        stats = self.phases.setdefault(name, {"seconds": 0.0, "calls": 0, "peak_bytes": 0})
+        frame = {"start": time.perf_counter(), "children": 0.0, "peak": 0}
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame["start"]
+            peak = max(frame["peak"], self._peak())
+            stats["seconds"] += elapsed - frame["children"]
+            stats["calls"] += 1
+            stats["peak_bytes"] = max(stats["peak_bytes"], peak)
+            if self._stack:
+                parent = self._stack[-1]
+                parent["children"] += elapsed
+                parent["peak"] = max(parent["peak"], peak)
+            if self.trace_memory:
+                tracemalloc.reset_peak()
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """{phase: {"seconds", "calls", "peak_mib"}} in first-entered order"""
+        return {
+            name: {
+                "seconds": round(stats["seconds"], 4),
+                "calls": stats["calls"],
+                "peak_mib": round(stats["peak_bytes"] / 2**20, 2) if self.trace_memory else None,
+            }
+            for name, stats in self.phases.items()
+        }
+
+    def close(self) -> None:
+        """Stop tracemalloc if this profile started it"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+class ProfiledSession:
+    """AsyncSession proxy that profiles every execute() under `phase`"""
+
+    def __init__(self, session, profile: PhaseProfile, phase: str = "db_load"):
+        self._session = session
+        self._profile = profile
+        self._phase = phase
+
+    async def execute(self, *args, **kwargs):
+        with self._profile.phase(self._phase):
+            return await self._session.execute(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self._session, name)
@@ -0,0 +1,137 @@
+"""
+Compiled prompt templates.
+
+Prompt texts use str.format placeholders ({asset_name}, {target_llm_name},
+{delay_hours}, ...). `PromptTemplate` parses a text once into its placeholder
+names, so a missing field is found with a set check up front instead of by
+catching KeyError on every render. Plain placeholders are compiled to a
+%-template that renders without re-parsing the text; other templates use one
+format_map over the payload (no kwargs copy). `PromptTemplateRegistry` keeps one compiled template
+per (prompt_id, prompt_version).
+"""
+
+import logging
+import threading
+from string import Formatter
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+_formatter = Formatter()
+
+
+class PromptTemplate:
+    """
+    One prompt text, parsed once.
+
+    Attributes:
+        fields: Top-level names the placeholders reference
+        error: Why the text cannot be rendered (bad syntax, positional fields), or None
+    """
+
+    __slots__ = ("text", "fields", "error", "_percent")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.error: Optional[str] = None
+        # Plain {name} placeholders compile to a %-template; %(name)s gives the same
+        # text as format(value, "") and skips re-parsing the format string
+        self._percent: Optional[str] = None
+        fields = set()
+        chunks = []
+        simple = True
+        try:
+            for literal, field_name, format_spec, conversion in _formatter.parse(text):
+                chunks.append(literal.replace("%", "%%"))
+                if field_name is None:
+                    continue
+                name = field_name.split(".", 1)[0].split("[", 1)[0]
+                if not name or name.isdigit():
+                    raise ValueError(f"positional placeholder '{{{field_name}}}'")
+                if format_spec or conversion or name != field_name:
+                    simple = False
+                fields.add(name)
+                chunks.append(f"%({name})s")
+        except ValueError as e:
+            self.error = str(e)
+        self.fields: FrozenSet[str] = frozenset(fields)
+        if simple and not self.error:
+            self._percent = "".join(chunks)
+
+    def missing(self, values: Mapping[str, Any]) -> FrozenSet[str]:
+        """Placeholders with no value in `values`"""
+        if self.fields <= values.keys():
+            return frozenset()
+        return frozenset(name for name in self.fields if name not in values)
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """
+        Substitute placeholders from `values`.
+
+        The text comes back unchanged when it cannot be rendered or a value is
+        missing, matching str.format with a fallback to the original text.
+        """
+        if self.error or not self.fields or not self.fields <= values.keys():
+            return self.text
+        try:
+            if self._percent is not None:
+                return self._percent % values
+            # format_map reads `values` directly, without building a kwargs dict
+            return self.text.format_map(values)
+        except (KeyError, IndexError, AttributeError, TypeError, ValueError):
+            return self.text
+
+    def render_many(self, rows: Iterable[Mapping[str, Any]]) -> List[str]:
+        """Render once per row"""
+        return [self.render(row) for row in rows]
+
+
+class PromptTemplateRegistry:
+    """Compiled templates by (prompt_id, prompt_version); thread-safe"""
+
+    def __init__(self):
+        self._templates: Dict[Hashable, PromptTemplate] = {}
+        self._warned: set = set()
+        self._lock = threading.Lock()
+
+    def get(self, text: str, prompt_id: Any = None, prompt_version: Any = None) -> PromptTemplate:
+        """
+        Compiled template for a prompt. Without a prompt_id the text itself is the key.
+        A different text under a known key (prompt edited in place) is recompiled.
+        """
+        key = (prompt_id, prompt_version) if prompt_id is not None else ("text", text)
+        template = self._templates.get(key)
+        if template is not None and (template.text is text or template.text == text):
+            return template
+        template = PromptTemplate(text)
+        with self._lock:
+            self._templates[key] = template
+        if template.error:
+            logger.warning(f"Prompt {prompt_id} v{prompt_version} cannot be rendered: {template.error}")
+        return template
+
+    def validate(self, template: PromptTemplate, available: Mapping[str, Any], label: str = "") -> FrozenSet[str]:
+        """
+        Placeholders of `template` with no value in `available`; logged once per template.
+        """
+        missing = template.missing(available)
+        if missing and template not in self._warned:
+            with self._lock:
+                self._warned.add(template)
+            logger.warning(
+                f"Prompt {template.text[:40]!r}{f' ({label})' if label else ''} references unknown placeholders {sorted(missing)}; "
+                f"it is sent without substitution"
+            )
+        return missing
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self._warned.clear()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+
+# Process-wide registry used by planning
+prompt_templates = PromptTemplateRegistry()
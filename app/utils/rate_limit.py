@@ -0,0 +1,97 @@
+"""
+Client-side rate limiting and retry helpers for bulk AWS calls.
+
+`TokenBucket` paces calls across threads to an API quota, and `call_with_retries`
+retries throttled calls with exponential backoff and full jitter so concurrent
+workers do not retry in lockstep.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Optional, Tuple, TypeVar
+
+from botocore.exceptions import ClientError
+
+T = TypeVar("T")
+
+# Error codes AWS returns when a request was rejected for rate reasons
+THROTTLING_CODES = frozenset({
+    "ThrottlingException", "Throttling", "TooManyRequestsException",
+    "RequestLimitExceeded", "ServiceQuotaExceededException",
+})
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Args:
+        rate: Tokens added per second (sustained calls per second)
+        capacity: Bucket size (largest burst); defaults to `rate`
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until `tokens` are available and take them.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """True for a botocore ClientError whose code means the call was throttled."""
+    return isinstance(error, ClientError) and error.response.get("Error", {}).get("Code") in THROTTLING_CODES
+
+
+def call_with_retries(
+    func: Callable[[], T],
+    limiter: Optional[TokenBucket] = None,
+    max_attempts: int = 5,
+    base_delay: float = 0.2,
+    max_delay: float = 10.0,
+    retry_on: Callable[[BaseException], bool] = is_throttling_error,
+) -> Tuple[T, int]:
+    """
+    Call `func`, taking a limiter token before every attempt and retrying
+    errors accepted by `retry_on` with full-jitter exponential backoff.
+
+    Returns:
+        (result, attempts)
+
+    Raises:
+        The last error once `max_attempts` is reached or the error is not retryable
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return func(), attempt
+        except Exception as e:
+            if attempt >= max_attempts or not retry_on(e):
+                raise
+            time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1))))
@@ -0,0 +1,298 @@
+"""
+Schedule registry: the planned_schedules table mirrors the EventBridge schedules
+that forecast planning created.
+
+Planning records a row for every schedule it creates successfully, and
+`reconcile_planned_schedules` brings the table back in line with EventBridge in
+bulk (new schedules inserted, state/ARN refreshed, vanished ones marked MISSING),
+so listings can be served from the database instead of one AWS call per schedule.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import PlannedSchedule, Survey
+from app.utils.aws import iter_schedules, run_aws
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GROUP = "crypto-forecast-schedules"
+MISSING_STATE = "MISSING"
+
+# Rows per multi-row INSERT / names per IN list
+_WRITE_CHUNK = 1000
+
+# Columns refreshed when a schedule is recorded again under the same name
+_UPSERT_COLUMNS = (
+    "group_name", "schedule_arn", "schedule_expression", "payload_hash", "state", "plan_date",
+    "survey_id", "asset_id", "query_schedule_id", "scheduled_for_utc", "schedule_name_label",
+    "query_type_name", "delay_hours", "asset_name", "llm_name", "target_llm_name",
+    "prompt_type", "description", "last_synced_at",
+)
+
+
+def payload_hash(payload: Dict[str, Any]) -> str:
+    """sha256 of the canonical JSON form of a schedule payload (key order independent)"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _scheduled_for(payload: Dict[str, Any], expression: str) -> Optional[datetime]:
+    """Nominal run time from the payload, falling back to an at(...) expression"""
+    value = payload.get("scheduled_for_utc")
+    if not value and expression.startswith("at(") and expression.endswith(")"):
+        value = expression[3:-1]
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=None)
+
+
+def registry_row(
+    schedule_name: str,
+    schedule_expression: str,
+    payload: Dict[str, Any],
+    schedule_arn: Optional[str] = None,
+    state: str = "ENABLED",
+    description: Optional[str] = None,
+    group_name: str = DEFAULT_GROUP,
+    hash_value: Optional[str] = None,
+    plan_date: Optional[date] = None,
+) -> Dict[str, Any]:
+    """
+    Build a planned_schedules row from a schedule and its target payload.
+
+    Args:
+        hash_value: Precomputed payload hash (defaults to hashing `payload`)
+        plan_date: Planning base date that owns the schedule
+    """
+    return {
+        "schedule_name": schedule_name,
+        "group_name": group_name,
+        "schedule_arn": schedule_arn,
+        "schedule_expression": schedule_expression,
+        "payload_hash": hash_value or payload_hash(payload),
+        "state": state,
+        "plan_date": plan_date,
+        "survey_id": payload.get("survey_id"),
+        "asset_id": payload.get("asset_id"),
+        "query_schedule_id": payload.get("query_schedule_id"),
+        "scheduled_for_utc": _scheduled_for(payload, schedule_expression),
+        "schedule_name_label": payload.get("schedule_name"),
+        "query_type_name": payload.get("query_type_name"),
+        "delay_hours": payload.get("delay_hours"),
+        "asset_name": payload.get("asset_name"),
+        "llm_name": payload.get("llm_name"),
+        "target_llm_name": payload.get("target_llm_name"),
+        "prompt_type": payload.get("prompt_type"),
+        "description": description,
+        "last_synced_at": datetime.utcnow(),
+    }
+
+
+async def record_planned_schedules(session: AsyncSession, rows: Iterable[Dict[str, Any]]) -> int:
+    """
+    Upsert registry rows by schedule_name with multi-row INSERT ... ON DUPLICATE KEY UPDATE.
+    The caller commits.
+
+    Returns:
+        Number of rows written
+    """
+    rows = list(rows)
+    for i in range(0, len(rows), _WRITE_CHUNK):
+        stmt = mysql_insert(PlannedSchedule).values(rows[i:i + _WRITE_CHUNK])
+        stmt = stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in _UPSERT_COLUMNS})
+        await session.execute(stmt)
+    return len(rows)
+
+
+def shard_clause(column, shard: int, shards: int):
+    """
+    Filter for one planning shard: rows whose survey id `column` is `shard` modulo
+    `shards`, or no filter (None) when planning is not sharded
+    """
+    if not 0 <= shard < shards:
+        raise ValueError(f"shard must be in 0..{shards - 1}, got {shard}")
+    if shards == 1:
+        return None
+    return column % shards == shard
+
+
+def _plan_dates(plan_date: date, until: Optional[date]):
+    """plan_date filter for one day or an inclusive multi-day window"""
+    if until is None or until == plan_date:
+        return PlannedSchedule.plan_date == plan_date
+    return PlannedSchedule.plan_date.between(plan_date, until)
+
+
+async def load_planned_hashes(
+    session: AsyncSession,
+    group_name: str,
+    plan_date: date,
+    survey_ids: Optional[Iterable[int]] = None,
+    until: Optional[date] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Payload hash of every live schedule that planning for `plan_date` created, by name
+
+    Args:
+        survey_ids: Only schedules of these surveys (default: all)
+        until: Last plan date of a multi-day window starting at `plan_date` (default: `plan_date`)
+    """
+    stmt = sa.select(PlannedSchedule.schedule_name, PlannedSchedule.payload_hash).where(
+        PlannedSchedule.group_name == group_name,
+        _plan_dates(plan_date, until),
+        PlannedSchedule.state != MISSING_STATE,
+    )
+    if survey_ids is None:
+        return dict((await session.execute(stmt)).all())
+    survey_ids = sorted(set(survey_ids))
+    hashes = {}
+    for i in range(0, len(survey_ids), _WRITE_CHUNK):
+        res = await session.execute(stmt.where(PlannedSchedule.survey_id.in_(survey_ids[i:i + _WRITE_CHUNK])))
+        hashes.update(res.all())
+    return hashes
+
+
+async def load_orphaned_schedules(
+    session: AsyncSession,
+    group_name: str,
+    plan_date: date,
+    until: Optional[date] = None,
+    shard: int = 0,
+    shards: int = 1,
+) -> List[str]:
+    """
+    Live schedules planned for `plan_date` (through `until`) whose survey is no longer active
+
+    Args:
+        shard, shards: Only schedules of this planning shard's surveys; schedules
+            without a survey belong to shard 0
+    """
+    active = sa.select(Survey.survey_id).where(Survey.is_active == True)  # noqa: E712
+    stmt = sa.select(PlannedSchedule.schedule_name).where(
+        PlannedSchedule.group_name == group_name,
+        _plan_dates(plan_date, until),
+        PlannedSchedule.state != MISSING_STATE,
+        sa.or_(PlannedSchedule.survey_id.is_(None), PlannedSchedule.survey_id.not_in(active)),
+    )
+    in_shard = shard_clause(PlannedSchedule.survey_id, shard, shards)
+    if in_shard is not None:
+        if shard == 0:
+            in_shard = sa.or_(PlannedSchedule.survey_id.is_(None), in_shard)
+        stmt = stmt.where(in_shard)
+    res = await session.execute(stmt)
+    return list(res.scalars().all())
+
+
+async def delete_planned_schedules(session: AsyncSession, names: Iterable[str]) -> int:
+    """Remove registry rows by schedule_name. The caller commits."""
+    names = list(names)
+    for i in range(0, len(names), _WRITE_CHUNK):
+        await session.execute(
+            sa.delete(PlannedSchedule).where(PlannedSchedule.schedule_name.in_(names[i:i + _WRITE_CHUNK]))
+        )
+    return len(names)
+
+
+def _row_from_detail(detail: Dict[str, Any], group_name: str) -> Dict[str, Any]:
+    """Registry row for a schedule found in EventBridge but not in the table"""
+    target_input = detail.get("Target", {}).get("Input") or "{}"
+    try:
+        payload = json.loads(target_input)
+    except json.JSONDecodeError:
+        logger.warning(f"Invalid JSON payload for schedule {detail.get('Name')}")
+        payload = {}
+    return registry_row(
+        schedule_name=detail["Name"],
+        schedule_expression=detail.get("ScheduleExpression", ""),
+        payload=payload,
+        schedule_arn=detail.get("Arn"),
+        state=detail.get("State", "ENABLED"),
+        description=detail.get("Description"),
+        group_name=group_name,
+    )
+
+
+def _list_group(scheduler, group_name: str) -> List[Dict[str, Any]]:
+    try:
+        return list(iter_schedules(scheduler, group_name))
+    except scheduler.exceptions.ResourceNotFoundException:
+        return []
+
+
+def _fetch_detail(scheduler, group_name: str, name: str) -> Optional[Dict[str, Any]]:
+    try:
+        return scheduler.get_schedule(Name=name, GroupName=group_name)
+    except Exception as e:
+        logger.error(f"Error getting details for schedule {name}: {e}")
+        return None
+
+
+async def reconcile_planned_schedules(
+    session: AsyncSession,
+    scheduler,
+    group_name: str = DEFAULT_GROUP,
+) -> Dict[str, int]:
+    """
+    Sync planned_schedules with the schedules EventBridge currently holds for a group.
+
+    One paginated listing covers every schedule; get_schedule is called only for
+    schedules the table does not know yet. Known schedules get their state and ARN
+    refreshed in one batched UPDATE, and rows whose schedule no longer exists are
+    marked MISSING (one-time schedules disappear once they have fired and been cleaned up).
+
+    Returns:
+        Counts: listed, inserted, updated, missing
+    """
+    res = await session.execute(
+        sa.select(PlannedSchedule.schedule_name, PlannedSchedule.state)
+        .where(PlannedSchedule.group_name == group_name)
+    )
+    known = dict(res.all())
+
+    listed = await run_aws(_list_group, scheduler, group_name)
+    listed_names = {s["Name"] for s in listed}
+    now = datetime.utcnow()
+
+    unknown = [s["Name"] for s in listed if s["Name"] not in known]
+    details = await asyncio.gather(*(run_aws(_fetch_detail, scheduler, group_name, name) for name in unknown))
+    inserted = await record_planned_schedules(session, (_row_from_detail(d, group_name) for d in details if d))
+
+    updates = [
+        {"name": s["Name"], "state": s.get("State", "ENABLED"), "arn": s.get("Arn"), "now": now}
+        for s in listed if s["Name"] in known
+    ]
+    if updates:
+        await session.execute(
+            sa.text("""
+            UPDATE planned_schedules
+            SET state = :state, schedule_arn = COALESCE(:arn, schedule_arn), last_synced_at = :now
+            WHERE schedule_name = :name
+            """),
+            updates,
+        )
+
+    missing = [name for name, state in known.items() if name not in listed_names and state != MISSING_STATE]
+    for i in range(0, len(missing), _WRITE_CHUNK):
+        await session.execute(
+            sa.update(PlannedSchedule)
+            .where(PlannedSchedule.schedule_name.in_(missing[i:i + _WRITE_CHUNK]))
+            .values(state=MISSING_STATE, last_synced_at=now)
+        )
+
+    await session.commit()
+    counts = {"listed": len(listed), "inserted": inserted, "updated": len(updates), "missing": len(missing)}
+    logger.info(f"Reconciled planned_schedules for group '{group_name}': {counts}")
+    return counts
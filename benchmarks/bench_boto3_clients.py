@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Per-call overhead of building a boto3 client for every AWS call (the old pattern)
+versus reusing the shared client from app.utils.aws.get_client.
+
+Each call makes one list_schedules request answered by botocore's Stubber, so no
+LocalStack is needed and the numbers isolate client setup plus request handling.
+
+    python benchmarks/bench_boto3_clients.py [calls]
+"""
+
+import os
+import sys
+import time
+
+import boto3
+from botocore.stub import Stubber
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.aws import get_client  # noqa: E402
+
+ENDPOINT = "http://localhost:4566"
+RESPONSE = {"Schedules": []}
+
+
+def fresh_client_call() -> None:
+    client = boto3.client(
+        "scheduler", endpoint_url=ENDPOINT, region_name="us-east-1",
+        aws_access_key_id="test", aws_secret_access_key="test",
+    )
+    with Stubber(client) as stub:
+        stub.add_response("list_schedules", RESPONSE)
+        client.list_schedules()
+
+
+def shared_client_call(stub: Stubber) -> None:
+    stub.add_response("list_schedules", RESPONSE)
+    get_client("scheduler", ENDPOINT).list_schedules()
+
+
+def main(calls: int = 200) -> None:
+    fresh_client_call()  # warm botocore's loader caches, as a running process would have
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        fresh_client_call()
+    fresh = (time.perf_counter() - start) / calls
+
+    with Stubber(get_client("scheduler", ENDPOINT)) as stub:
+        shared_client_call(stub)
+        start = time.perf_counter()
+        for _ in range(calls):
+            shared_client_call(stub)
+        shared = (time.perf_counter() - start) / calls
+
+    print(f"calls: {calls}")
+    print(f"fresh boto3.client per call: {fresh * 1000:8.3f} ms/call")
+    print(f"shared get_client:           {shared * 1000:8.3f} ms/call")
+    print(f"speedup:                     {fresh / shared:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -1,25 +1,120 @@
-import boto3
 import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from app.utils.aws import get_client, iter_schedules
+from app.utils.prompt_templates import prompt_templates
+from app.utils.rate_limit import is_throttling_error
+from app.utils.schedule_registry import payload_hash
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+SCHEDULE_GROUP = "crypto-forecast-schedules"
+WORKER_TARGET_ARN = 'arn:aws:lambda:us-east-1:000000000000:function:forecast-worker'
+WORKER_ROLE_ARN = 'arn:aws:iam::000000000000:role/lambda-role'
+
+def _prompt_template(payload: Dict[str, Any]):
+    return prompt_templates.get(payload['prompt_text'], payload.get('prompt_id'), payload.get('prompt_version'))
+
+def render_payload(payload: Dict[str, Any], schedule_name: str = "") -> Dict[str, Any]:
+    """
+    Return the payload that is actually sent to the worker.
+    
+    Performs template substitution on the prompt_text field, replacing placeholders
+    like {target_llm_name}, {asset_name}, {delay_hours} with actual values from the
+    payload attributes. Templates are compiled once per (prompt_id, prompt_version)
+    in the shared prompt template registry; on a missing key or bad template the
+    original prompt_text is kept (logged once per template).
+    The input payload is not modified.
+    """
+    # Create a copy of the payload to avoid modifying the original
+    processed_payload = payload.copy()
+    
+    # Perform template substitution on prompt_text if it exists
+    if processed_payload.get('prompt_text'):
+        template = _prompt_template(processed_payload)
+        if not prompt_templates.validate(template, processed_payload, schedule_name):
+            processed_payload['prompt_text'] = template.render(processed_payload)
+    
+    return processed_payload
+
+def render_payloads(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    render_payload for many payloads at once: payloads are grouped by prompt
+    template, each template is validated once and then rendered for its group.
+    Results are in input order.
+    """
+    rendered = [payload.copy() for payload in payloads]
+    groups: Dict[int, List[Dict[str, Any]]] = {}
+    templates = {}
+    for payload in rendered:
+        if payload.get('prompt_text'):
+            template = _prompt_template(payload)
+            templates[id(template)] = template
+            groups.setdefault(id(template), []).append(payload)
+    for key, group in groups.items():
+        template = templates[key]
+        # Planning payloads share one key set: validate (and log) once per template;
+        # render() still falls back to the original text for any row missing a value
+        prompt_templates.validate(template, group[0])
+        for payload, text in zip(group, template.render_many(group)):
+            payload['prompt_text'] = text
+    return rendered
+
+# Fields kept in compact payloads; the worker resolves prompt text, LLM and asset
+# names from its versioned prompt cache (functions/worker/prompt_cache.py)
+COMPACT_PAYLOAD_FIELDS = (
+    "query_id", "survey_id", "asset_id", "schedule_id", "query_schedule_id", "query_type_id",
+    "prompt_id", "prompt_version", "delay_hours", "scheduled_for_utc",
+)
+# Kept when present: a placed fire time must change the payload hash, or the diff
+# would leave the schedule at its old time
+COMPACT_OPTIONAL_FIELDS = ("placement_offset_seconds",)
+
+def compact_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Ids-only form of a full schedule payload, marked with payload_mode=compact"""
+    compact = {key: payload.get(key) for key in COMPACT_PAYLOAD_FIELDS}
+    compact.update((key, payload[key]) for key in COMPACT_OPTIONAL_FIELDS if key in payload)
+    compact["payload_mode"] = "compact"
+    return compact
+
+def _schedule_params(
+    schedule_name: str,
+    execution_time: str,
+    processed_payload: Dict[str, Any],
+    description: Optional[str],
+    group_name: str,
+) -> Dict[str, Any]:
+    """create_schedule / update_schedule arguments for a one-time worker schedule"""
+    return dict(
+        Name=schedule_name,
+        ScheduleExpression=f"at({execution_time})",
+        GroupName=group_name,
+        Target={
+            'Arn': WORKER_TARGET_ARN,
+            'RoleArn': WORKER_ROLE_ARN,
+            'Input': json.dumps(processed_payload)
+        },
+        FlexibleTimeWindow={'Mode': 'OFF'},
+        Description=description or f"Crypto forecast schedule for survey {processed_payload.get('survey_id', 'unknown')}"
+    )
+
 def create_one_time_schedule(
     schedule_name: str,
     execution_time: str,
     payload: Dict[str, Any],
     description: Optional[str] = None,
-    endpoint_url: str = 'http://localhost:4566'
+    endpoint_url: str = 'http://localhost:4566',
+    group_name: str = SCHEDULE_GROUP,
+    rendered: bool = False
 ) -> Dict[str, Any]:
     """
     Create a one-time EventBridge schedule in LocalStack for crypto forecast queries.
     
-    This function performs template substitution on the prompt_text field in the payload,
-    replacing placeholders like {target_llm_name}, {asset_name}, {delay_hours} with 
-    actual values from the payload attributes.
+    The prompt_text in the payload is rendered with `render_payload` before sending
+    unless `rendered` is set.
     
     Args:
         schedule_name: Unique name for the schedule
@@ -27,77 +122,119 @@ def create_one_time_schedule(
         payload: Complete payload dictionary with all required attributes
         description: Optional description for the schedule
         endpoint_url: LocalStack endpoint URL
+        group_name: Schedule group
+        rendered: `payload` is already rendered (e.g. by render_payloads); send it as is
         
     Returns:
-        Dict containing the created schedule details
+        Dict containing the created schedule details, including the PayloadHash
+        of the rendered payload
         
     Raises:
-        Exception: If schedule creation fails
+        ConflictException: If a schedule with this name already exists
+        ClientError: If the call was throttled (left intact so it can be retried)
+        Exception: If schedule creation fails for any other reason
     """
+    scheduler = get_client('scheduler', endpoint_url)
     try:
-        # Initialize LocalStack EventBridge Scheduler client
-        scheduler = boto3.client('scheduler', endpoint_url=endpoint_url)
-        
-        # Create a copy of the payload to avoid modifying the original
-        processed_payload = payload.copy()
-        
-        # Perform template substitution on prompt_text if it exists
-        if 'prompt_text' in processed_payload and processed_payload['prompt_text']:
-            original_prompt_text = processed_payload['prompt_text']
-            
-            try:
-                # Perform template substitution using payload attributes
-                # This replaces placeholders like {target_llm_name}, {asset_name}, etc.
-                substituted_prompt_text = original_prompt_text.format(**processed_payload)
-                processed_payload['prompt_text'] = substituted_prompt_text
-                
-                logger.info(f"Template substitution completed for schedule: {schedule_name}")
-                logger.debug(f"Original prompt: {original_prompt_text[:100]}...")
-                logger.debug(f"Substituted prompt: {substituted_prompt_text[:100]}...")
-                
-            except KeyError as e:
-                # Handle missing template variables gracefully
-                logger.warning(f"Template substitution failed for {schedule_name}: Missing key {e}")
-                logger.warning(f"Using original prompt text without substitution")
-                # Keep the original prompt_text if substitution fails
-                
-            except Exception as e:
-                # Handle other template substitution errors
-                logger.warning(f"Template substitution error for {schedule_name}: {str(e)}")
-                logger.warning(f"Using original prompt text without substitution")
-                # Keep the original prompt_text if substitution fails
+        processed_payload = payload if rendered else render_payload(payload, schedule_name)
         
         # Create the schedule with the processed payload
         response = scheduler.create_schedule(
-            Name=schedule_name,
-            ScheduleExpression=f"at({execution_time})",
-            GroupName="crypto-forecast-schedules",
-            Target={
-                'Arn': 'arn:aws:lambda:us-east-1:000000000000:function:forecast-worker',
-                'RoleArn': 'arn:aws:iam::000000000000:role/lambda-role',
-                'Input': json.dumps(processed_payload)
-            },
-            FlexibleTimeWindow={'Mode': 'OFF'},
-            Description=description or f"Crypto forecast schedule for survey {payload.get('survey_id', 'unknown')}"
+            **_schedule_params(schedule_name, execution_time, processed_payload, description, group_name)
         )
         
         logger.info(f"Successfully created EventBridge schedule: {schedule_name}")
         
         # Return schedule details
         return {
-            "ScheduleArn": f"arn:aws:scheduler:us-east-1:000000000000:schedule/crypto-forecast-schedules/{schedule_name}",
+            "ScheduleArn": response.get('ScheduleArn', f"arn:aws:scheduler:us-east-1:000000000000:schedule/{group_name}/{schedule_name}"),
             "Name": schedule_name,
             "State": "ENABLED",
             "CreationDate": datetime.utcnow().isoformat(),
             "ScheduleExpression": f"at({execution_time})",
-            "Target": response.get('Target', {}),
-            "Description": description
+            "Description": description,
+            "PayloadHash": payload_hash(processed_payload)
         }
         
+    except scheduler.exceptions.ConflictException:
+        # Callers handle an existing schedule (e.g. by updating it)
+        raise
     except Exception as e:
+        if is_throttling_error(e):
+            # Left intact so callers can back off and retry
+            raise
         logger.error(f"Failed to create EventBridge schedule {schedule_name}: {str(e)}")
         raise Exception(f"EventBridge schedule creation failed: {str(e)}")
 
+def update_one_time_schedule(
+    schedule_name: str,
+    execution_time: str,
+    payload: Dict[str, Any],
+    description: Optional[str] = None,
+    endpoint_url: str = 'http://localhost:4566',
+    group_name: str = SCHEDULE_GROUP,
+    rendered: bool = False
+) -> Dict[str, Any]:
+    """
+    Replace the time, payload and description of an existing one-time schedule.
+    
+    Same arguments and return value as create_one_time_schedule.
+    
+    Raises:
+        Exception: If the update fails
+    """
+    scheduler = get_client('scheduler', endpoint_url)
+    try:
+        processed_payload = payload if rendered else render_payload(payload, schedule_name)
+        response = scheduler.update_schedule(
+            **_schedule_params(schedule_name, execution_time, processed_payload, description, group_name)
+        )
+        
+        logger.info(f"Successfully updated EventBridge schedule: {schedule_name}")
+        
+        return {
+            "ScheduleArn": response.get('ScheduleArn', f"arn:aws:scheduler:us-east-1:000000000000:schedule/{group_name}/{schedule_name}"),
+            "Name": schedule_name,
+            "State": "ENABLED",
+            "ScheduleExpression": f"at({execution_time})",
+            "Description": description,
+            "PayloadHash": payload_hash(processed_payload)
+        }
+        
+    except Exception as e:
+        if is_throttling_error(e):
+            raise
+        logger.error(f"Failed to update EventBridge schedule {schedule_name}: {str(e)}")
+        raise Exception(f"EventBridge schedule update failed: {str(e)}")
+
+def delete_one_time_schedule(
+    schedule_name: str,
+    endpoint_url: str = 'http://localhost:4566',
+    group_name: str = SCHEDULE_GROUP
+) -> bool:
+    """
+    Delete one schedule. A schedule that no longer exists counts as deleted.
+    
+    Returns:
+        True if the schedule was deleted or was already gone
+        
+    Raises:
+        Exception: If the deletion fails
+    """
+    scheduler = get_client('scheduler', endpoint_url)
+    try:
+        scheduler.delete_schedule(Name=schedule_name, GroupName=group_name)
+        logger.info(f"Successfully deleted EventBridge schedule: {schedule_name}")
+        return True
+    except scheduler.exceptions.ResourceNotFoundException:
+        logger.info(f"Schedule {schedule_name} already deleted")
+        return True
+    except Exception as e:
+        if is_throttling_error(e):
+            raise
+        logger.error(f"Failed to delete EventBridge schedule {schedule_name}: {str(e)}")
+        raise Exception(f"EventBridge schedule deletion failed: {str(e)}")
+
 def create_schedule_group_if_not_exists(
     group_name: str = "crypto-forecast-schedules",
     endpoint_url: str = 'http://localhost:4566'
@@ -113,7 +250,7 @@ def create_schedule_group_if_not_exists(
         True if group exists or was created successfully
     """
     try:
-        scheduler = boto3.client('scheduler', endpoint_url=endpoint_url)
+        scheduler = get_client('scheduler', endpoint_url)
         
         # Try to create the group (will fail if it already exists, which is fine)
         try:
@@ -143,12 +280,12 @@ def delete_all_schedules(
         Dict containing deletion results with counts and any errors
     """
     try:
-        scheduler = boto3.client('scheduler', endpoint_url=endpoint_url)
+        scheduler = get_client('scheduler', endpoint_url)
         
-        # List all schedules in the group
+        # List all schedules in the group (every page, collected before deleting
+        # so the pagination token is not invalidated underneath us)
         try:
-            response = scheduler.list_schedules(GroupName=group_name)
-            schedules = response.get('Schedules', [])
+            schedules = list(iter_schedules(scheduler, group_name))
         except scheduler.exceptions.ResourceNotFoundException:
             logger.warning(f"Schedule group '{group_name}' not found")
             return {
@@ -236,7 +373,7 @@ def delete_schedule_group(
         Dict containing deletion results
     """
     try:
-        scheduler = boto3.client('scheduler', endpoint_url=endpoint_url)
+        scheduler = get_client('scheduler', endpoint_url)
         
         # If force is True, delete all schedules first
         if force:
@@ -8,13 +8,22 @@ The function is designed to work locally during development and will be migrated
 with EventBridge Rule for daily execution.
 """
 
+import argparse
 import asyncio
+import itertools
+import json
 import logging
-from datetime import datetime, time, timedelta, timezone
-from typing import List, Dict, Optional, Any
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Dict, Optional, Any, Set, Iterable, Iterator, TextIO, Tuple
 from dataclasses import dataclass, field
+from functools import lru_cache
 from collections import defaultdict
 
+from botocore.exceptions import ClientError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -24,13 +33,68 @@ from app.db.models import (
     QueryType, Prompt, LLM
 )
 from app.db.session import SessionLocal
+from app.utils.aws import run_aws
+from app.utils.profiling import PhaseProfile, ProfiledSession
+from app.utils.rate_limit import TokenBucket, call_with_retries
+from app.utils.schedule_registry import (
+    delete_planned_schedules, load_orphaned_schedules, load_planned_hashes, payload_hash,
+    record_planned_schedules, registry_row, shard_clause
+)
+
+from .create_one_time_schedule import (
+    SCHEDULE_GROUP, compact_payload, create_one_time_schedule, create_schedule_group_if_not_exists,
+    delete_one_time_schedule, render_payload, render_payloads, update_one_time_schedule
+)
+from .load_smoothing import LoadSmoother, parse_provider_rpm
+from .plan_cache import (
+    TemplateWriter, iter_template_records, load_plan_template, planning_fingerprint, save_plan_template,
+    template_scope
+)
+from .planned_queries import lookup_planned_queries, persist_planned_queries
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Concurrent create/update/delete calls during apply_plan
+PLANNING_CONCURRENCY = int(os.getenv("PLANNING_CONCURRENCY", "16"))
+# Client-side pacing for those calls, kept under the EventBridge Scheduler
+# Create/Update/DeleteSchedule quota (50 requests per second per account by default)
+SCHEDULER_TPS = float(os.getenv("SCHEDULER_TPS", "50"))
+SCHEDULER_MAX_ATTEMPTS = int(os.getenv("SCHEDULER_MAX_ATTEMPTS", "5"))
 
-@dataclass
+# Ids per IN (...) list when loading planning data
+_IN_CHUNK = 1000
+
+# Surveys generated, persisted and diffed together in the planning pipeline
+PLANNING_BATCH_SURVEYS = int(os.getenv("PLANNING_BATCH_SURVEYS", "200"))
+# Consecutive base dates planned per run, starting at the base date
+PLANNING_DAYS_AHEAD = int(os.getenv("PLANNING_DAYS_AHEAD", "1"))
+# Created/deleted/failed schedules and surveys listed by name in a run summary
+SUMMARY_SAMPLE_SIZE = 50
+# "full" inlines prompt text and names in every schedule payload; "compact" sends
+# ids plus prompt_id/prompt_version and the worker resolves the rest
+SCHEDULE_PAYLOAD_MODE = os.getenv("SCHEDULE_PAYLOAD_MODE", "full")
+# Load smoothing: schedules fire up to PLACEMENT_WINDOW_SECONDS after their nominal
+# time (0 = at the nominal time), spaced by provider capacity, e.g. "OpenAI=60,Grok=30"
+# requests per minute per llm_name; other providers get PROVIDER_DEFAULT_RPM
+PLACEMENT_WINDOW_SECONDS = int(os.getenv("PLACEMENT_WINDOW_SECONDS", "0"))
+PROVIDER_RPM = os.getenv("PROVIDER_RPM", "")
+PROVIDER_DEFAULT_RPM = float(os.getenv("PROVIDER_DEFAULT_RPM", "60"))
+# "minute" puts all queries firing in the same minute into one batch schedule that the
+# worker fans out; "off" keeps one schedule per query
+SCHEDULE_BATCHING = os.getenv("SCHEDULE_BATCHING", "off")
+# Limits per batch schedule: queries, and bytes of Target Input JSON
+SCHEDULE_BATCH_MAX_QUERIES = int(os.getenv("SCHEDULE_BATCH_MAX_QUERIES", "50"))
+SCHEDULE_BATCH_MAX_BYTES = int(os.getenv("SCHEDULE_BATCH_MAX_BYTES", "8192"))
+# "on" reuses the stored plan template while the planning inputs are unchanged
+# (see plan_cache); "off" always loads and generates from the database
+PLAN_TEMPLATE_CACHE = os.getenv("PLAN_TEMPLATE_CACHE", "on")
+
+
+# Planning data holds an object per active survey and a request per query and day:
+# slotted (no per-instance __dict__), frozen where nothing reassigns a field after loading
+@dataclass(frozen=True, slots=True)
 class AssetData:
     """Data class for asset information"""
     asset_id: int
@@ -40,7 +104,7 @@ class AssetData:
     description: Optional[str] = None
     asset_type_name: Optional[str] = None
     asset_type_description: Optional[str] = None
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LLMData:
     """Data class for LLM configuration"""
     llm_id: int
@@ -48,7 +112,7 @@ class LLMData:
     llm_model: str
     api_url: str
     api_key_secret: str
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PromptData:
     """Data class for prompt configuration"""
     prompt_id: int
@@ -61,13 +125,13 @@ class PromptData:
     attribute_2: Optional[str] = None
     attribute_3: Optional[str] = None
     prompt_version: int = 1
-@dataclass
+@dataclass(frozen=True, slots=True)
 class QueryTypeData:
     """Data class for query type information"""
     query_type_id: int
     query_type_name: str
     description: Optional[str] = None
-@dataclass
+@dataclass(frozen=True, slots=True)
 class QueryScheduleData:
     """Data class for query schedule configuration"""
     query_schedule_id: int
@@ -75,7 +139,7 @@ class QueryScheduleData:
     query_type_id: int
     delay_hours: int
     paired_followup_delay_hours: Optional[int] = None
-@dataclass
+@dataclass(slots=True)
 class ScheduleData:
     """Data class for schedule configuration"""
     schedule_id: int
@@ -85,7 +149,7 @@ class ScheduleData:
     timezone: str
     description: Optional[str] = None
     query_schedules: List[QueryScheduleData] = field(default_factory=list)
-@dataclass
+@dataclass(slots=True)
 class SurveyData:
     """Data class for survey configuration with all related data"""
     survey_id: int
@@ -110,7 +174,7 @@ class PlanningDataCollections:
     query_types: Dict[int, QueryTypeData] = field(default_factory=dict)
     prompts: Dict[int, PromptData] = field(default_factory=dict)
     llms: Dict[int, LLMData] = field(default_factory=dict)
-@dataclass
+@dataclass(slots=True)
 class EventBridgeScheduleRequest:
     """Data structure for EventBridge One Time Schedule requests"""
     schedule_name: str
@@ -119,6 +183,325 @@ class EventBridgeScheduleRequest:
     input_payload: Dict[str, Any]
     description: Optional[str] = None
     timezone: str = "UTC"
+    # Send compact_payload(input_payload) instead of the full payload
+    compact: bool = False
+    # Base date this occurrence belongs to (its planned_schedules.plan_date)
+    plan_date: Optional[date] = None
+    # Query requests a batch schedule runs (empty for a single-query schedule)
+    members: List["EventBridgeScheduleRequest"] = field(default_factory=list, repr=False, compare=False)
+    # Wire payload with the prompt rendered, filled in by render_requests
+    rendered_payload: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+    # payload_hash of rendered_payload, computed on first use
+    rendered_hash: Optional[str] = field(default=None, repr=False, compare=False)
+@dataclass
+class SchedulePlanDiff:
+    """Delta between the desired schedules and those already planned for the same base date"""
+    create: List[EventBridgeScheduleRequest] = field(default_factory=list)
+    update: List[EventBridgeScheduleRequest] = field(default_factory=list)
+    delete: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.create or self.update or self.delete)
+@dataclass
+class CachedPlan:
+    """
+    One day's schedule requests from an earlier run (a plan_templates row), planned
+    again for other base dates by shifting their times instead of regenerating them
+    """
+    fingerprint: str
+    base_date: date
+    template: bytes
+    survey_count: int = 0
+    request_count: int = 0
+    # planning_stats of the planning data the template was built from
+    stats: Dict[str, Any] = field(default_factory=dict)
+    
+    def iter_surveys(self) -> Iterator[Dict[str, Any]]:
+        """Template lines, one per survey (see template_survey_line)"""
+        return iter_template_records(self.template)
+    
+    def shifted_requests(self, surveys: List[Dict[str, Any]], base_date: datetime,
+                         days_ahead: int = 1) -> Iterator[EventBridgeScheduleRequest]:
+        """The surveys' requests for each base date in the window, in iter_schedule_requests order"""
+        day_bases = plan_base_dates(base_date, days_ahead)
+        for survey in surveys:
+            keys, shared = survey["keys"], dict(zip(survey["keys"], survey["shared"]))
+            for record in survey["requests"]:
+                for day_base in day_bases:
+                    yield shift_template_request(
+                        keys, shared, record, (day_base.date() - self.base_date).days, day_base.date()
+                    )
+
+def template_survey_line(survey_id: int, requests: List[EventBridgeScheduleRequest]) -> Dict[str, Any]:
+    """
+    A survey's freshly generated (not yet persisted) requests as one plan template line.
+    
+    A survey's payloads differ in a few fields only, so the line holds the payload
+    keys and the first payload's values once ("keys", "shared"), and each request is
+    a positional list [schedule_name, schedule_expression, target_arn, description,
+    timezone, compact, [[index, value], ...]] of the values that differ from
+    "shared". That keeps lines short and quick to parse. A payload with other keys
+    is stored whole, as a dict.
+    """
+    keys = list(requests[0].input_payload) if requests else []
+    shared = list(requests[0].input_payload.values()) if requests else []
+    
+    def values(payload: Dict[str, Any]):
+        if list(payload) != keys:
+            return payload
+        return [[i, v] for i, v in enumerate(payload.values()) if v != shared[i]]
+    
+    return {
+        "survey_id": survey_id,
+        "keys": keys,
+        "shared": shared,
+        "requests": [
+            [r.schedule_name, r.schedule_expression, r.target_arn, r.description, r.timezone, r.compact,
+             values(r.input_payload)]
+            for r in requests
+        ],
+    }
+
+@lru_cache(maxsize=4096)
+def _shift_iso(value: str, days: int) -> str:
+    """A naive ISO datetime `days` days later (fire times repeat across surveys, so memoised)"""
+    return (datetime.fromisoformat(value) + timedelta(days=days)).isoformat()
+
+@lru_cache(maxsize=4096)
+def _at_expression(iso: str) -> str:
+    """at(...) schedule expression of a naive ISO fire time, one copy per fire time"""
+    return f"at({iso})"
+
+@lru_cache(maxsize=4096)
+def _fire_time_strings(scheduled: datetime) -> Tuple[str, str, int]:
+    """
+    (at() expression, scheduled_for_utc, epoch seconds) of a UTC fire time. Every
+    survey on a schedule fires at the same few times, so requests share these
+    strings instead of formatting their own.
+    """
+    iso = scheduled.strftime('%Y-%m-%dT%H:%M:%S')
+    return _at_expression(iso), scheduled.isoformat(), int(scheduled.replace(tzinfo=timezone.utc).timestamp())
+
+@lru_cache(maxsize=16384)
+def _request_description(asset_symbol: str, query_type_name: str) -> str:
+    """Schedule description, shared by the requests of one asset and query type"""
+    return f"Crypto forecast query for {asset_symbol} - {query_type_name}"
+
+def shift_template_request(keys: List[str], shared: Dict[str, Any], record: list, days: int,
+                           plan_date: date) -> EventBridgeScheduleRequest:
+    """
+    The request a plan template entry stands for, `days` days later: the name's epoch,
+    the fire time and scheduled_for_utc move by whole days (times are UTC), so it
+    equals the request generated for the later base date.
+    
+    `keys` and `shared` are the entry's template line "keys" and its "shared" values
+    as a payload dict.
+    """
+    name, expression, target_arn, description, tz, compact, values = record
+    prefix, epoch = name.rsplit("-", 1)
+    if isinstance(values, dict):
+        payload = dict(values)
+    else:
+        payload = shared.copy()
+        for i, value in values:
+            payload[keys[i]] = value
+    payload["scheduled_for_utc"] = _shift_iso(payload["scheduled_for_utc"], days)
+    return EventBridgeScheduleRequest(
+        schedule_name=f"{prefix}-{int(epoch) + days * 86400}",
+        schedule_expression=_at_expression(_shift_iso(expression[3:-1], days)),
+        target_arn=target_arn,
+        input_payload=payload,
+        description=description,
+        timezone=tz,
+        compact=compact,
+        plan_date=plan_date
+    )
+
+def request_wire_payload(request: EventBridgeScheduleRequest) -> Dict[str, Any]:
+    """Payload handed to EventBridge for a request (before prompt rendering)"""
+    return compact_payload(request.input_payload) if request.compact else request.input_payload
+
+def render_requests(requests: List[EventBridgeScheduleRequest]) -> None:
+    """Batch-render the wire payloads of requests whose input payloads are final (query_id set)"""
+    rendered = render_payloads([request_wire_payload(r) for r in requests])
+    for request, payload in zip(requests, rendered):
+        request.rendered_payload = payload
+        request.rendered_hash = None
+
+def request_rendered_payload(request: EventBridgeScheduleRequest) -> Dict[str, Any]:
+    """Payload exactly as it is sent to EventBridge (rendered on first use if not batch-rendered)"""
+    if request.rendered_payload is None:
+        request.rendered_payload = render_payload(request_wire_payload(request), request.schedule_name)
+    return request.rendered_payload
+
+def request_payload_hash(request: EventBridgeScheduleRequest) -> str:
+    """Hash of the payload exactly as it is sent to EventBridge (after prompt rendering)"""
+    if request.rendered_hash is None or request.rendered_payload is None:
+        request.rendered_hash = payload_hash(request_rendered_payload(request))
+    return request.rendered_hash
+
+def request_payload_sizes(request: EventBridgeScheduleRequest) -> Tuple[int, int]:
+    """(bytes sent, bytes the full payload would take) for the Target Input of a request"""
+    sent = len(json.dumps(request_rendered_payload(request)))
+    if not request.compact:
+        return sent, sent
+    return sent, len(json.dumps(render_payload(request.input_payload, request.schedule_name)))
+
+def request_registry_payload(request: EventBridgeScheduleRequest) -> Dict[str, Any]:
+    """Payload the registry row is denormalized from: a batch is filed under its first query"""
+    return request.members[0].input_payload if request.members else request.input_payload
+
+def batch_schedule_requests(
+    requests: List[EventBridgeScheduleRequest],
+    max_queries: int = SCHEDULE_BATCH_MAX_QUERIES,
+    max_bytes: int = SCHEDULE_BATCH_MAX_BYTES
+) -> List[EventBridgeScheduleRequest]:
+    """
+    Collapse requests firing in the same minute (and planned for the same day) into
+    batch schedules of at most `max_queries` queries and `max_bytes` of payload.
+    
+    Each batch fires at its earliest member's time and its payload lists the
+    members' wire payloads ({"payload_mode": "batch", "queries": [...]}), so query
+    ids must already be set. Members are ordered by fire time, survey and query
+    schedule, and a batch is named after its first member, so unchanged inputs
+    give the same batches and names on every run.
+    """
+    def fire_time(request: EventBridgeScheduleRequest) -> str:
+        return request.schedule_expression[3:-1]
+    
+    groups: Dict[Tuple[Any, str], List[EventBridgeScheduleRequest]] = defaultdict(list)
+    for request in requests:
+        groups[(request.plan_date, fire_time(request)[:16])].append(request)
+    
+    batches = []
+    for (_, minute), members in sorted(groups.items(), key=lambda item: item[0][1]):
+        members.sort(key=lambda r: (fire_time(r), r.input_payload["survey_id"], r.input_payload["query_schedule_id"]))
+        chunk: List[EventBridgeScheduleRequest] = []
+        size = 0
+        for request in members + [None]:
+            payload_size = len(json.dumps(request_rendered_payload(request))) + 2 if request else 0
+            if chunk and (request is None or len(chunk) >= max_queries or size + payload_size > max_bytes):
+                batches.append(_batch_request(chunk, minute))
+                chunk, size = [], 0
+            if request is not None:
+                chunk.append(request)
+                size += payload_size
+    return batches
+
+def _batch_request(members: List[EventBridgeScheduleRequest], minute: str) -> EventBridgeScheduleRequest:
+    first = members[0].input_payload
+    epoch = int(datetime.fromisoformat(minute).replace(tzinfo=timezone.utc).timestamp())
+    payload = {"payload_mode": "batch", "queries": [request_rendered_payload(m) for m in members]}
+    return EventBridgeScheduleRequest(
+        schedule_name=f"crypto-forecast-batch-{first['survey_id']}-{first['query_schedule_id']}-{epoch}",
+        schedule_expression=members[0].schedule_expression,
+        target_arn=members[0].target_arn,
+        input_payload=payload,
+        description=f"Crypto forecast batch of {len(members)} queries at {minute}",
+        timezone=members[0].timezone,
+        plan_date=members[0].plan_date,
+        rendered_payload=payload,
+        members=members
+    )
+
+def diff_schedule_plan(
+    desired: List[EventBridgeScheduleRequest],
+    existing: Dict[str, Optional[str]]
+) -> SchedulePlanDiff:
+    """
+    Compare desired schedule requests with existing schedules (name -> payload hash).
+    
+    Schedule names are deterministic (survey, query schedule, run time), so a request
+    whose name exists with the same payload hash needs no call at all; a changed hash
+    means update, and existing names no longer desired are deleted.
+    """
+    diff = SchedulePlanDiff()
+    desired_names = set()
+    for request in desired:
+        desired_names.add(request.schedule_name)
+        current = existing.get(request.schedule_name)
+        if request.schedule_name not in existing:
+            diff.create.append(request)
+        elif current != request_payload_hash(request):
+            diff.update.append(request)
+        else:
+            diff.unchanged.append(request.schedule_name)
+    diff.delete = sorted(name for name in existing if name not in desired_names)
+    return diff
+
+@dataclass
+class PlanSummary:
+    """
+    Running totals of a planning run.
+    
+    Outcomes are tallied as they arrive; only the first SUMMARY_SAMPLE_SIZE
+    created, deleted and failed schedules are kept, so memory stays flat however
+    many schedules flow through.
+    """
+    desired: int = 0
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    retries: int = 0
+    recorded: int = 0
+    queries_planned: int = 0
+    queries_paired: int = 0
+    payload_bytes: int = 0
+    payload_bytes_saved: int = 0
+    created_sample: List[Dict[str, Any]] = field(default_factory=list)
+    deleted_sample: List[str] = field(default_factory=list)
+    failed_sample: List[Dict[str, Any]] = field(default_factory=list)
+    
+    @staticmethod
+    def _keep(sample: list, item: Any) -> None:
+        if len(sample) < SUMMARY_SAMPLE_SIZE:
+            sample.append(item)
+    
+    def add(self, entry: Dict[str, Any]) -> None:
+        """Tally one EventBridgeScheduler._apply_action outcome"""
+        if entry["status"] == "failed":
+            self.failed += 1
+            self._keep(self.failed_sample, {k: entry[k] for k in ("schedule_name", "action", "error")})
+            return
+        self.retries += entry["attempts"] - 1
+        if entry["action"] == "delete":
+            self.deleted += 1
+            self._keep(self.deleted_sample, entry["schedule_name"])
+        else:
+            if entry["action"] == "create":
+                self.created += 1
+            else:
+                self.updated += 1
+            self._keep(self.created_sample, entry["result"])
+
+def _query_prompt(query_type: QueryTypeData, live_prompt: Optional[PromptData],
+                  forecast_prompt: Optional[PromptData]) -> Optional[PromptData]:
+    """Prompt a query runs with: the live prompt for Initial Baseline and Follow-up, else the forecast prompt"""
+    return live_prompt if query_type.query_type_name in ['Initial Baseline', 'Follow-up'] else forecast_prompt
+
+def _query_slots(planning_data: PlanningDataCollections, survey: SurveyData) -> List[Tuple[int, Optional[str]]]:
+    """A survey's queries as (nominal second of the day, llm_name), for placement"""
+    schedule = planning_data.schedules.get(survey.schedule_id)
+    if not schedule:
+        return []
+    live_prompt = planning_data.prompts.get(survey.live_prompt_id)
+    forecast_prompt = planning_data.prompts.get(survey.forecast_prompt_id)
+    start = schedule.initial_query_time
+    start_second = start.hour * 3600 + start.minute * 60 + start.second
+    slots = []
+    for query_schedule in schedule.query_schedules:
+        query_type = planning_data.query_types.get(query_schedule.query_type_id)
+        if not query_type:
+            continue
+        prompt = _query_prompt(query_type, live_prompt, forecast_prompt)
+        llm = planning_data.llms.get(prompt.llm_id) if prompt else None
+        slots.append((start_second + query_schedule.delay_hours * 3600, llm.llm_name if llm else None))
+    return slots
+
 class EventBridgeScheduler:
     """
     LocalStack EventBridge scheduling functionality for crypto forecast queries.
@@ -127,110 +510,263 @@ class EventBridgeScheduler:
     for each required crypto forecast query based on the survey configurations.
     """
     
-    def __init__(self, region: str = "us-east-1", endpoint_url: str = "http://localhost:4566"):
+    def __init__(self, region: str = "us-east-1", endpoint_url: str = "http://localhost:4566",
+                 group_name: str = SCHEDULE_GROUP, max_workers: int = PLANNING_CONCURRENCY,
+                 requests_per_second: Optional[float] = SCHEDULER_TPS,
+                 max_attempts: int = SCHEDULER_MAX_ATTEMPTS,
+                 payload_mode: str = SCHEDULE_PAYLOAD_MODE,
+                 placement: Optional[LoadSmoother] = None,
+                 batching: str = SCHEDULE_BATCHING):
+        if payload_mode not in ("full", "compact"):
+            raise ValueError(f"Unknown payload mode '{payload_mode}'")
+        if batching not in ("off", "minute"):
+            raise ValueError(f"Unknown batching mode '{batching}'")
         self.region = region
         self.endpoint_url = endpoint_url
-        # Import the create_one_time_schedule function
-        try:
-            from .create_one_time_schedule import create_one_time_schedule, create_schedule_group_if_not_exists
-            self.create_one_time_schedule_func = create_one_time_schedule
-            self.create_schedule_group_func = create_schedule_group_if_not_exists
-            self._schedule_group_created = False
-        except ImportError as e:
-            logger.error(f"Failed to import create_one_time_schedule: {e}")
-            # Fallback to stub implementation
-            self.create_one_time_schedule_func = None
-            self.create_schedule_group_func = None
-            self._schedule_group_created = True
+        self.group_name = group_name
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.payload_mode = payload_mode
+        self.batching = batching
+        # Placement stage applied to every generated request (see load_smoothing)
+        self.placement = placement or LoadSmoother(
+            PLACEMENT_WINDOW_SECONDS, parse_provider_rpm(PROVIDER_RPM), PROVIDER_DEFAULT_RPM
+        )
+        # Shared by every worker thread; None disables pacing
+        self.limiter = TokenBucket(requests_per_second) if requests_per_second else None
+        # Planning data whose surveys the placement offsets were assigned for
+        self._placed: Optional[Tuple[PlanningDataCollections, int]] = None
+        self._schedule_group_created = False
+        self._lock = threading.Lock()
+        # planned_schedules rows for schedules created/updated successfully, and names
+        # deleted; written to the registry by forecast_planning
+        self.planned_rows: List[Dict[str, Any]] = []
+        self.deleted_names: List[str] = []
         
     def _ensure_schedule_group_exists(self):
         """Ensure the schedule group exists before creating schedules"""
-        if not self._schedule_group_created and self.create_schedule_group_func:
+        if not self._schedule_group_created:
             try:
-                self.create_schedule_group_func(endpoint_url=self.endpoint_url)
+                create_schedule_group_if_not_exists(group_name=self.group_name, endpoint_url=self.endpoint_url)
                 self._schedule_group_created = True
                 logger.info("Schedule group verified/created successfully")
             except Exception as e:
                 logger.warning(f"Failed to create schedule group: {e}")
                 # Continue anyway, might still work
                 self._schedule_group_created = True
+    
+    def _record(self, request: EventBridgeScheduleRequest, result: Dict[str, Any], plan_date: Optional[date]):
+        row = registry_row(
+            schedule_name=request.schedule_name,
+            schedule_expression=request.schedule_expression,
+            payload=request_registry_payload(request),
+            schedule_arn=result.get("ScheduleArn"),
+            state=result.get("State", "ENABLED"),
+            description=request.description,
+            group_name=self.group_name,
+            hash_value=result.get("PayloadHash"),
+            plan_date=request.plan_date or plan_date,
+        )
+        with self._lock:
+            self.planned_rows.append(row)
         
-    def create_one_time_schedule(self, request: EventBridgeScheduleRequest) -> Dict[str, Any]:
+    def create_one_time_schedule(self, request: EventBridgeScheduleRequest, plan_date: Optional[date] = None) -> Dict[str, Any]:
         """
         Creates a one-time EventBridge schedule for a crypto forecast query in LocalStack.
         
+        A schedule that already exists under the same (deterministic) name, e.g. left
+        behind by a run that failed before recording it, is updated in place instead.
+        
         Args:
             request: EventBridgeScheduleRequest with schedule configuration
+            plan_date: Planning base date recorded in the registry
             
         Returns:
             Dict containing the created schedule details
+            
+        Raises:
+            Exception: If the schedule could not be created or updated
         """
         # Ensure schedule group exists
         self._ensure_schedule_group_exists()
         
-        if self.create_one_time_schedule_func:
-            try:
-                # Extract execution time from schedule expression
-                # Format: "at(2025-10-03T09:00:00)" -> "2025-10-03T09:00:00"
-                execution_time = request.schedule_expression.replace("at(", "").replace(")", "")
-                
-                # Create the schedule using LocalStack
-                result = self.create_one_time_schedule_func(
-                    schedule_name=request.schedule_name,
-                    execution_time=execution_time,
-                    payload=request.input_payload,
-                    description=request.description,
-                    endpoint_url=self.endpoint_url
-                )
-                
-                logger.info(f"Successfully created LocalStack EventBridge schedule: {request.schedule_name}")
-                return result
-                
-            except Exception as e:
-                logger.error(f"Failed to create LocalStack schedule {request.schedule_name}: {e}")
-                # Fall back to stub behavior
-                return self._create_stub_schedule(request)
+        # Extract execution time from schedule expression
+        # Format: "at(2025-10-03T09:00:00)" -> "2025-10-03T09:00:00"
+        execution_time = request.schedule_expression.replace("at(", "").replace(")", "")
+        try:
+            result = create_one_time_schedule(
+                schedule_name=request.schedule_name,
+                execution_time=execution_time,
+                payload=request_rendered_payload(request),
+                description=request.description,
+                endpoint_url=self.endpoint_url,
+                group_name=self.group_name,
+                rendered=True
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConflictException":
+                raise
+            logger.info(f"Schedule {request.schedule_name} already exists, updating it")
+            return self.update_one_time_schedule(request, plan_date)
+        
+        logger.info(f"Successfully created LocalStack EventBridge schedule: {request.schedule_name}")
+        self._record(request, result, plan_date)
+        return result
+    
+    def update_one_time_schedule(self, request: EventBridgeScheduleRequest, plan_date: Optional[date] = None) -> Dict[str, Any]:
+        """Replace the time, payload and description of an existing schedule"""
+        self._ensure_schedule_group_exists()
+        execution_time = request.schedule_expression.replace("at(", "").replace(")", "")
+        result = update_one_time_schedule(
+            schedule_name=request.schedule_name,
+            execution_time=execution_time,
+            payload=request_rendered_payload(request),
+            description=request.description,
+            endpoint_url=self.endpoint_url,
+            group_name=self.group_name,
+            rendered=True
+        )
+        self._record(request, result, plan_date)
+        return result
+    
+    def delete_schedule(self, schedule_name: str) -> None:
+        """Delete a schedule that is no longer part of the plan"""
+        delete_one_time_schedule(schedule_name, endpoint_url=self.endpoint_url, group_name=self.group_name)
+        with self._lock:
+            self.deleted_names.append(schedule_name)
+    
+    def drain_recorded(self):
+        """Take the registry rows and deleted names collected so far, leaving both lists empty"""
+        with self._lock:
+            rows, names = self.planned_rows, self.deleted_names
+            self.planned_rows, self.deleted_names = [], []
+        return rows, names
+    
+    def _apply_action(self, action: str, item: Any, plan_date: Optional[date]) -> Dict[str, Any]:
+        """Run one plan action with pacing and throttling retries; never raises"""
+        name = item if action == "delete" else item.schedule_name
+        if action == "create":
+            call = lambda: self.create_one_time_schedule(item, plan_date)
+        elif action == "update":
+            call = lambda: self.update_one_time_schedule(item, plan_date)
         else:
-            # Fallback to stub implementation
-            return self._create_stub_schedule(request)
-    
-    def _create_stub_schedule(self, request: EventBridgeScheduleRequest) -> Dict[str, Any]:
-        """Fallback stub implementation when LocalStack is not available"""
-        logger.info(f"STUB: Would create EventBridge schedule: {request.schedule_name}")
-        logger.info(f"STUB: Schedule expression: {request.schedule_expression}")
-        logger.info(f"STUB: Target ARN: {request.target_arn}")
-        logger.info(f"STUB: Payload: {request.input_payload}")
+            call = lambda: self.delete_schedule(item)
+        try:
+            result, attempts = call_with_retries(call, self.limiter, max_attempts=self.max_attempts)
+        except Exception as e:
+            logger.error(f"Failed to {action} schedule {name}: {e}")
+            return {"schedule_name": name, "action": action, "status": "failed", "error": str(e)}
+        return {"schedule_name": name, "action": action, "status": "ok", "attempts": attempts, "result": result}
+    
+    def apply_plan(self, diff: SchedulePlanDiff, plan_date: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Make the create/update/delete calls for a plan diff; unchanged schedules get no call.
         
-        # Stub return - mimics LocalStack response format
+        Calls run on up to `max_workers` threads, paced by a shared token bucket at
+        the Scheduler API rate; throttled calls are retried with jittered backoff.
+        
+        Returns:
+            Dict with created/updated results, deleted names, failures
+            ({"schedule_name", "action", "error"}) and `retries` (extra attempts made
+            after throttling); a failure does not stop the rest
+        """
+        outcome = {"created": [], "updated": [], "deleted": [], "failed": [], "retries": 0}
+        actions = (
+            [("create", r) for r in diff.create]
+            + [("update", r) for r in diff.update]
+            + [("delete", name) for name in diff.delete]
+        )
+        if not actions:
+            return outcome
+        if diff.create or diff.update:
+            # Once, before the fan-out, instead of racing from every worker
+            self._ensure_schedule_group_exists()
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(actions)))) as pool:
+            results = list(pool.map(lambda a: self._apply_action(a[0], a[1], plan_date), actions))
+        
+        # Collected in submission order, independent of completion order
+        for entry in results:
+            if entry["status"] == "failed":
+                outcome["failed"].append(
+                    {"schedule_name": entry["schedule_name"], "action": entry["action"], "error": entry["error"]}
+                )
+                continue
+            outcome["retries"] += entry["attempts"] - 1
+            if entry["action"] == "create":
+                outcome["created"].append(entry["result"])
+            elif entry["action"] == "update":
+                outcome["updated"].append(entry["result"])
+            else:
+                outcome["deleted"].append(entry["schedule_name"])
+        return outcome
+    
+    def template_settings(self) -> Dict[str, Any]:
+        """Settings that shape generated requests, part of the plan template fingerprint"""
         return {
-            "ScheduleArn": f"arn:aws:scheduler:{self.region}:000000000000:schedule/crypto-forecast-schedules/{request.schedule_name}",
-            "Name": request.schedule_name,
-            "State": "ENABLED",
-            "CreationDate": datetime.now(timezone.utc).isoformat(),
-            "ScheduleExpression": request.schedule_expression,
-            "Description": request.description
+            "group_name": self.group_name,
+            "payload_mode": self.payload_mode,
+            "placement_window_seconds": self.placement.window_seconds,
+            "provider_rpm": sorted(self.placement.provider_rpm.items()),
+            "default_rpm": self.placement.default_rpm,
         }
     
-    def generate_schedule_requests(self, planning_data: PlanningDataCollections, base_date: datetime = None) -> List[EventBridgeScheduleRequest]:
+    def batch_requests(self, requests: List[EventBridgeScheduleRequest]) -> List[EventBridgeScheduleRequest]:
+        """
+        Batch schedules per fire minute when batching is "minute" (batch_schedule_requests),
+        otherwise the requests unchanged. Run after query ids are set and members rendered.
+        """
+        if self.batching == "minute":
+            return batch_schedule_requests(requests)
+        return requests
+    
+    def generate_schedule_requests(self, planning_data: PlanningDataCollections, base_date: datetime = None,
+                                   days_ahead: int = 1) -> List[EventBridgeScheduleRequest]:
         """
         Generates EventBridge schedule requests for all active surveys.
         
-        This method processes the planning data and creates schedule requests
-        for each query type in each active survey's schedule.
-        
         Args:
             planning_data: Collections of survey and related data
             base_date: Base date for scheduling (defaults to tomorrow)
+            days_ahead: Number of consecutive base dates to plan, starting at base_date
             
         Returns:
             List of EventBridgeScheduleRequest objects
         """
-        if base_date is None:
-            base_date = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        return list(self.iter_schedule_requests(planning_data, base_date, days_ahead=days_ahead))
+    
+    def iter_schedule_requests(
+        self,
+        planning_data: PlanningDataCollections,
+        base_date: datetime = None,
+        surveys: Optional[Iterable[SurveyData]] = None,
+        days_ahead: int = 1
+    ) -> Iterator[EventBridgeScheduleRequest]:
+        """
+        Yield EventBridge schedule requests survey by survey.
         
-        schedule_requests = []
+        This method processes the planning data and creates schedule requests
+        for each query type in each active survey's schedule, once per base date
+        in the `days_ahead` window, and passes each through the placement stage
+        (self.placement), which may move its fire time within the smoothing
+        window. Lookups into planning_data are done once per survey and query
+        schedule and reused for every day.
+        
+        Args:
+            planning_data: Collections of survey and related data
+            base_date: Base date for scheduling (defaults to tomorrow)
+            surveys: Surveys to plan (defaults to all surveys in planning_data)
+            days_ahead: Number of consecutive base dates to plan, starting at base_date
+            
+        Yields:
+            EventBridgeScheduleRequest objects, each with its plan_date
+        """
+        if base_date is None:
+            base_date = default_base_date()
+        day_bases = plan_base_dates(base_date, days_ahead)
+        self._assign_placement(planning_data)
         
-        for survey in planning_data.surveys:
+        for survey in (planning_data.surveys if surveys is None else surveys):
             if not survey.is_active:
                 continue
                 
@@ -250,75 +786,106 @@ class EventBridgeScheduler:
                     continue
                 
                 # Determine which prompt to use based on query type
-                prompt_to_use = live_prompt if query_type.query_type_name in ['Initial Baseline', 'Follow-up'] else forecast_prompt
-                
-                # Calculate scheduled time
-                scheduled_datetime = self._calculate_scheduled_time(
-                    base_date, schedule.initial_query_time, 
-                    query_schedule.delay_hours, schedule.timezone
-                )
+                prompt_to_use = _query_prompt(query_type, live_prompt, forecast_prompt)
                 
                 # Get LLM data for the prompt and target LLM
                 prompt_llm = planning_data.llms.get(prompt_to_use.llm_id) if prompt_to_use else None
                 target_llm = planning_data.llms.get(prompt_to_use.target_llm_id) if prompt_to_use else None
                 
-                # Create comprehensive payload with all required attributes
-                request = EventBridgeScheduleRequest(
-                    schedule_name=f"crypto-forecast-{survey.survey_id}-{query_schedule.query_schedule_id}-{int(scheduled_datetime.timestamp())}",
-                    schedule_expression=f"at({scheduled_datetime.strftime('%Y-%m-%dT%H:%M:%S')})",
-                    target_arn="arn:aws:lambda:us-east-1:123456789012:function:forecast_worker",
-                    input_payload={
-                        # Survey and Asset attributes
-                        "survey_id": survey.survey_id,
-                        "asset_id": asset.asset_id if asset else None,
-                        "asset_name": asset.asset_name if asset else None,
-                        
-                        # Schedule attributes
-                        "schedule_id": schedule.schedule_id,
-                        "schedule_name": schedule.schedule_name,
-                        "schedule_version": schedule.schedule_version,
-                        
-                        # Query Schedule attributes
-                        "query_schedule_id": query_schedule.query_schedule_id,
-                        "delay_hours": query_schedule.delay_hours,
-                        "paired_followup_delay_hours": query_schedule.paired_followup_delay_hours,
-                        
-                        # Query Type attributes
-                        "query_type_id": query_schedule.query_type_id,
-                        "query_type_name": query_type.query_type_name,
-                        
-                        # Prompt attributes
-                        "prompt_id": prompt_to_use.prompt_id if prompt_to_use else None,
-                        "prompt_text": prompt_to_use.prompt_text if prompt_to_use else None,
-                        "prompt_type": prompt_to_use.prompt_type if prompt_to_use else None,
-                        "prompt_version": prompt_to_use.prompt_version if prompt_to_use else None,
-                        "attribute_1": prompt_to_use.attribute_1 if prompt_to_use else None,
-                        "attribute_2": prompt_to_use.attribute_2 if prompt_to_use else None,
-                        "attribute_3": prompt_to_use.attribute_3 if prompt_to_use else None,
-                        "target_llm_id": prompt_to_use.target_llm_id if prompt_to_use else None,
-                        "target_llm_name": target_llm.llm_name if target_llm else None,
-                        
-                        # LLM attributes
-                        "llm_id": prompt_to_use.llm_id if prompt_to_use else None,
-                        "llm_name": prompt_llm.llm_name if prompt_llm else None,
-                        
-                        # Legacy fields for backward compatibility
-                        "asset_symbol": asset.asset_symbol if asset else None,
-                        "live_prompt_id": survey.live_prompt_id,
-                        "forecast_prompt_id": survey.forecast_prompt_id,
-                        "scheduled_for_utc": scheduled_datetime.isoformat()
-                    },
-                    description=f"Crypto forecast query for {asset.asset_symbol if asset else 'Unknown'} - {query_type.query_type_name}",
-                    timezone=schedule.timezone
-                )
-                
-                schedule_requests.append(request)
+                for day_base in day_bases:
+                    # Calculate scheduled time
+                    scheduled_datetime = self._calculate_scheduled_time(
+                        day_base, schedule.initial_query_time, 
+                        query_schedule.delay_hours, schedule.timezone
+                    )
+                    request = self._build_request(
+                        survey, schedule, query_schedule, query_type, asset,
+                        prompt_to_use, prompt_llm, target_llm, scheduled_datetime, day_base.date()
+                    )
+                    # Spread fire times by provider capacity; the payload keeps the nominal time
+                    self.placement.place(request)
+                    yield request
                 
                 # Note: paired_followup_delay_hours is not used for creating additional schedules
                 # The Follow-up queries are already defined as separate entries in query_schedules table
-                # Each query_schedule entry represents exactly one EventBridge schedule
+                # Each query_schedule entry represents exactly one EventBridge schedule per base date
+    
+    def _assign_placement(self, planning_data: PlanningDataCollections) -> None:
+        """
+        Assign placement offsets for every active survey in planning_data, once per
+        planning data, so offsets (and provider capacity) cover all surveys even
+        when requests are generated a batch at a time
+        """
+        if not self.placement.enabled or self._placed == (planning_data, len(planning_data.surveys)):
+            return
+        self.placement.assign(
+            (survey.survey_id, _query_slots(planning_data, survey))
+            for survey in planning_data.surveys if survey.is_active
+        )
+        self._placed = (planning_data, len(planning_data.surveys))
+    
+    def _build_request(self, survey: SurveyData, schedule: ScheduleData, query_schedule: QueryScheduleData,
+                       query_type: QueryTypeData, asset: Optional[AssetData], prompt_to_use: Optional[PromptData],
+                       prompt_llm: Optional[LLMData], target_llm: Optional[LLMData],
+                       scheduled_datetime: datetime, plan_date: date) -> EventBridgeScheduleRequest:
+        """One schedule request for a survey's query schedule at `scheduled_datetime`"""
+        # Create comprehensive payload with all required attributes
+        expression, scheduled_for_utc, epoch = _fire_time_strings(scheduled_datetime)
+        request = EventBridgeScheduleRequest(
+            schedule_name=f"crypto-forecast-{survey.survey_id}-{query_schedule.query_schedule_id}-{epoch}",
+            schedule_expression=expression,
+            target_arn="arn:aws:lambda:us-east-1:123456789012:function:forecast_worker",
+            input_payload={
+                # queries row this schedule runs (set by persist_planned_queries)
+                "query_id": None,
+                
+                # Survey and Asset attributes
+                "survey_id": survey.survey_id,
+                "asset_id": asset.asset_id if asset else None,
+                "asset_name": asset.asset_name if asset else None,
+                
+                # Schedule attributes
+                "schedule_id": schedule.schedule_id,
+                "schedule_name": schedule.schedule_name,
+                "schedule_version": schedule.schedule_version,
+                
+                # Query Schedule attributes
+                "query_schedule_id": query_schedule.query_schedule_id,
+                "delay_hours": query_schedule.delay_hours,
+                "paired_followup_delay_hours": query_schedule.paired_followup_delay_hours,
+                
+                # Query Type attributes
+                "query_type_id": query_schedule.query_type_id,
+                "query_type_name": query_type.query_type_name,
+                
+                # Prompt attributes
+                "prompt_id": prompt_to_use.prompt_id if prompt_to_use else None,
+                "prompt_text": prompt_to_use.prompt_text if prompt_to_use else None,
+                "prompt_type": prompt_to_use.prompt_type if prompt_to_use else None,
+                "prompt_version": prompt_to_use.prompt_version if prompt_to_use else None,
+                "attribute_1": prompt_to_use.attribute_1 if prompt_to_use else None,
+                "attribute_2": prompt_to_use.attribute_2 if prompt_to_use else None,
+                "attribute_3": prompt_to_use.attribute_3 if prompt_to_use else None,
+                "target_llm_id": prompt_to_use.target_llm_id if prompt_to_use else None,
+                "target_llm_name": target_llm.llm_name if target_llm else None,
+                
+                # LLM attributes
+                "llm_id": prompt_to_use.llm_id if prompt_to_use else None,
+                "llm_name": prompt_llm.llm_name if prompt_llm else None,
+                
+                # Legacy fields for backward compatibility
+                "asset_symbol": asset.asset_symbol if asset else None,
+                "live_prompt_id": survey.live_prompt_id,
+                "forecast_prompt_id": survey.forecast_prompt_id,
+                "scheduled_for_utc": scheduled_for_utc
+            },
+            description=_request_description(asset.asset_symbol if asset else "Unknown", query_type.query_type_name),
+            timezone=schedule.timezone,
+            compact=self.payload_mode == "compact",
+            plan_date=plan_date
+        )
         
-        return schedule_requests
+        return request
     
     def _calculate_scheduled_time(self, base_date: datetime, initial_time: time, 
                                 delay_hours: int, timezone: str) -> datetime:
@@ -333,12 +900,28 @@ class EventBridgeScheduler:
         # For now, assuming UTC
         return scheduled_dt
 
-async def load_survey_data(session: AsyncSession) -> PlanningDataCollections:
+def default_base_date() -> datetime:
+    """Midnight UTC tomorrow, the date planning runs for by default"""
+    return datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+def plan_base_dates(base_date: datetime, days_ahead: int) -> List[datetime]:
+    """The `days_ahead` consecutive base dates a run plans, starting at base_date"""
+    if days_ahead < 1:
+        raise ValueError(f"days_ahead must be at least 1, got {days_ahead}")
+    return [base_date + timedelta(days=d) for d in range(days_ahead)]
+
+async def load_survey_data(session: AsyncSession, shard: int = 0, shards: int = 1) -> PlanningDataCollections:
     """
-    Load all active surveys and their related data from the database.
+    Load all active surveys and only the related rows they reference.
+    
+    Active surveys are read first; assets, schedules, query schedules, query types,
+    prompts and LLMs are then fetched with IN (...) lookups on the ids those surveys
+    (and their schedules and prompts) reference, so the cost follows the number of
+    active surveys rather than the size of the catalog tables.
     
     Args:
         session: Database session
+        shard, shards: Only the active surveys with survey_id % shards == shard
         
     Returns:
         PlanningDataCollections with all loaded data
@@ -347,16 +930,23 @@ async def load_survey_data(session: AsyncSession) -> PlanningDataCollections:
     
     # Load active surveys - no relationships defined in models, so load separately
     survey_query = select(Survey).where(Survey.is_active == True)
+    in_shard = shard_clause(Survey.survey_id, shard, shards)
+    if in_shard is not None:
+        survey_query = survey_query.where(in_shard)
     result = await session.execute(survey_query)
     surveys = result.scalars().all()
     
-    # Load all related data
-    await _load_assets(session, collections)
-    await _load_schedules(session, collections)
-    await _load_query_schedules(session, collections)
-    await _load_query_types(session, collections)
-    await _load_prompts(session, collections)
-    await _load_llms(session, collections)
+    # Load the related data the surveys reference
+    await _load_assets(session, collections, {s.asset_id for s in surveys})
+    await _load_schedules(session, collections, {s.schedule_id for s in surveys})
+    await _load_query_schedules(session, collections, set(collections.schedules))
+    await _load_query_types(session, collections, {
+        qs.query_type_id for qss in collections.query_schedules.values() for qs in qss
+    })
+    await _load_prompts(session, collections, {s.live_prompt_id for s in surveys} | {s.forecast_prompt_id for s in surveys})
+    await _load_llms(session, collections, {
+        llm_id for p in collections.prompts.values() for llm_id in (p.llm_id, p.target_llm_id)
+    })
     
     # Process surveys and build survey data objects
     for survey in surveys:
@@ -376,17 +966,27 @@ async def load_survey_data(session: AsyncSession) -> PlanningDataCollections:
     
     return collections
 
-async def _load_assets(session: AsyncSession, collections: PlanningDataCollections):
-    """Load all assets with their asset types"""
-    # Load assets
-    asset_query = select(Asset)
-    asset_result = await session.execute(asset_query)
-    assets = asset_result.scalars().all()
-    
-    # Load asset types
-    asset_type_query = select(AssetType)
-    asset_type_result = await session.execute(asset_type_query)
-    asset_types = asset_type_result.scalars().all()
+def _intern(value: Optional[str]) -> Optional[str]:
+    """
+    One shared copy of a categorical string (names, symbols, types, timezones):
+    drivers return a new string per row, and these values are copied into
+    every schedule payload, so the plan holds references instead of copies
+    """
+    return sys.intern(value) if value is not None else None
+
+async def _select_in(session: AsyncSession, model, column, ids: Set[int]) -> list:
+    """Rows of `model` whose `column` is in `ids`, in IN lists of at most _IN_CHUNK ids"""
+    ids = sorted(i for i in ids if i is not None)
+    rows = []
+    for k in range(0, len(ids), _IN_CHUNK):
+        result = await session.execute(select(model).where(column.in_(ids[k:k + _IN_CHUNK])))
+        rows.extend(result.scalars().all())
+    return rows
+
+async def _load_assets(session: AsyncSession, collections: PlanningDataCollections, asset_ids: Set[int]):
+    """Load the given assets with their asset types"""
+    assets = await _select_in(session, Asset, Asset.asset_id, asset_ids)
+    asset_types = await _select_in(session, AssetType, AssetType.asset_type_id, {a.asset_type_id for a in assets})
     
     # Create asset type lookup
     asset_type_lookup = {at.asset_type_id: at for at in asset_types}
@@ -396,36 +996,32 @@ async def _load_assets(session: AsyncSession, collections: PlanningDataCollectio
         asset_data = AssetData(
             asset_id=asset.asset_id,
             asset_type_id=asset.asset_type_id,
-            asset_name=asset.asset_name,
-            asset_symbol=asset.asset_symbol,
+            asset_name=_intern(asset.asset_name),
+            asset_symbol=_intern(asset.asset_symbol),
             description=asset.description,
-            asset_type_name=asset_type.asset_type_name if asset_type else None,
+            asset_type_name=_intern(asset_type.asset_type_name) if asset_type else None,
             asset_type_description=asset_type.description if asset_type else None
         )
         collections.assets[asset.asset_id] = asset_data
 
-async def _load_schedules(session: AsyncSession, collections: PlanningDataCollections):
-    """Load all schedules"""
-    query = select(Schedule)
-    result = await session.execute(query)
-    schedules = result.scalars().all()
+async def _load_schedules(session: AsyncSession, collections: PlanningDataCollections, schedule_ids: Set[int]):
+    """Load the given schedules"""
+    schedules = await _select_in(session, Schedule, Schedule.schedule_id, schedule_ids)
     
     for schedule in schedules:
         schedule_data = ScheduleData(
             schedule_id=schedule.schedule_id,
-            schedule_name=schedule.schedule_name,
+            schedule_name=_intern(schedule.schedule_name),
             schedule_version=schedule.schedule_version,
             initial_query_time=schedule.initial_query_time,
-            timezone=schedule.timezone,
+            timezone=_intern(schedule.timezone),
             description=schedule.description
         )
         collections.schedules[schedule.schedule_id] = schedule_data
 
-async def _load_query_schedules(session: AsyncSession, collections: PlanningDataCollections):
-    """Load all query schedules"""
-    query = select(QuerySchedule)
-    result = await session.execute(query)
-    query_schedules = result.scalars().all()
+async def _load_query_schedules(session: AsyncSession, collections: PlanningDataCollections, schedule_ids: Set[int]):
+    """Load the query schedules of the given schedules"""
+    query_schedules = await _select_in(session, QuerySchedule, QuerySchedule.schedule_id, schedule_ids)
     
     for qs in query_schedules:
         query_schedule_data = QueryScheduleData(
@@ -441,25 +1037,21 @@ async def _load_query_schedules(session: AsyncSession, collections: PlanningData
         if qs.schedule_id in collections.schedules:
             collections.schedules[qs.schedule_id].query_schedules.append(query_schedule_data)
 
-async def _load_query_types(session: AsyncSession, collections: PlanningDataCollections):
-    """Load all query types"""
-    query = select(QueryType)
-    result = await session.execute(query)
-    query_types = result.scalars().all()
+async def _load_query_types(session: AsyncSession, collections: PlanningDataCollections, query_type_ids: Set[int]):
+    """Load the given query types"""
+    query_types = await _select_in(session, QueryType, QueryType.query_type_id, query_type_ids)
     
     for qt in query_types:
         query_type_data = QueryTypeData(
             query_type_id=qt.query_type_id,
-            query_type_name=qt.query_type_name,
+            query_type_name=_intern(qt.query_type_name),
             description=qt.description
         )
         collections.query_types[qt.query_type_id] = query_type_data
 
-async def _load_prompts(session: AsyncSession, collections: PlanningDataCollections):
-    """Load all prompts"""
-    query = select(Prompt)
-    result = await session.execute(query)
-    prompts = result.scalars().all()
+async def _load_prompts(session: AsyncSession, collections: PlanningDataCollections, prompt_ids: Set[int]):
+    """Load the given prompts"""
+    prompts = await _select_in(session, Prompt, Prompt.prompt_id, prompt_ids)
     
     for prompt in prompts:
         prompt_data = PromptData(
@@ -468,7 +1060,7 @@ async def _load_prompts(session: AsyncSession, collections: PlanningDataCollecti
             prompt_name=prompt.prompt_name,
             prompt_text=prompt.prompt_text,
             target_llm_id=prompt.target_llm_id,
-            prompt_type=prompt.prompt_type,
+            prompt_type=_intern(prompt.prompt_type),
             attribute_1=prompt.attribute_1,
             attribute_2=prompt.attribute_2,
             attribute_3=prompt.attribute_3,
@@ -476,23 +1068,388 @@ async def _load_prompts(session: AsyncSession, collections: PlanningDataCollecti
         )
         collections.prompts[prompt.prompt_id] = prompt_data
 
-async def _load_llms(session: AsyncSession, collections: PlanningDataCollections):
-    """Load all LLMs"""
-    query = select(LLM)
-    result = await session.execute(query)
-    llms = result.scalars().all()
+async def _load_llms(session: AsyncSession, collections: PlanningDataCollections, llm_ids: Set[int]):
+    """Load the given LLMs"""
+    llms = await _select_in(session, LLM, LLM.llm_id, llm_ids)
     
     for llm in llms:
         llm_data = LLMData(
             llm_id=llm.llm_id,
-            llm_name=llm.llm_name,
-            llm_model=llm.llm_model,
+            llm_name=_intern(llm.llm_name),
+            llm_model=_intern(llm.llm_model),
             api_url=llm.api_url,
             api_key_secret=llm.api_key_secret
         )
         collections.llms[llm.llm_id] = llm_data
 
-async def forecast_planning(base_date: datetime = None) -> Dict[str, Any]:
+def planning_stats(planning_data: PlanningDataCollections) -> Dict[str, Any]:
+    """Counts and the survey summary sample that run results report about the planning data"""
+    return {
+        "active_surveys": len(planning_data.surveys),
+        "total_assets": len(planning_data.assets),
+        "total_schedules": len(planning_data.schedules),
+        "total_query_types": len(planning_data.query_types),
+        "total_prompts": len(planning_data.prompts),
+        "total_llms": len(planning_data.llms),
+        "survey_summary": [
+            {
+                "survey_id": survey.survey_id,
+                "asset_symbol": survey.asset.asset_symbol if survey.asset else None,
+                "schedule_name": survey.schedule.schedule_name if survey.schedule else None,
+                "query_count": len(survey.schedule.query_schedules) if survey.schedule else 0
+            }
+            for survey in planning_data.surveys[:SUMMARY_SAMPLE_SIZE]
+        ],
+    }
+
+class PlanTemplateBuilder:
+    """
+    Plan template of `base_date`'s requests, built from the requests a run generates
+    anyway, batch by batch, so storing it costs no second generation pass
+    """
+    
+    def __init__(self, base_date: datetime):
+        self.base_date = base_date
+        self.requests = 0
+        self._writer = TemplateWriter()
+    
+    def add(self, surveys: Iterable[SurveyData], requests: Iterable[EventBridgeScheduleRequest]) -> None:
+        """
+        One line per survey from its freshly generated requests (before persisting sets
+        query_id); requests for later days of a multi-day window are skipped
+        """
+        plan_date = self.base_date.date()
+        by_survey = defaultdict(list)
+        for request in requests:
+            if request.plan_date == plan_date:
+                by_survey[request.input_payload["survey_id"]].append(request)
+        for survey in surveys:
+            survey_requests = by_survey.get(survey.survey_id, [])
+            self._writer.add(template_survey_line(survey.survey_id, survey_requests))
+            self.requests += len(survey_requests)
+    
+    def finish(self, fingerprint: str, stats: Dict[str, Any]) -> CachedPlan:
+        return CachedPlan(
+            fingerprint=fingerprint,
+            base_date=self.base_date.date(),
+            template=self._writer.finish(),
+            survey_count=self._writer.lines,
+            request_count=self.requests,
+            stats=stats
+        )
+
+def build_cached_plan(scheduler: EventBridgeScheduler, planning_data: PlanningDataCollections,
+                      base_date: datetime, fingerprint: str) -> CachedPlan:
+    """Plan template of `base_date`'s requests (one line per survey) for storing with `fingerprint`"""
+    builder = PlanTemplateBuilder(base_date)
+    builder.add(planning_data.surveys, scheduler.iter_schedule_requests(planning_data, base_date))
+    return builder.finish(fingerprint, planning_stats(planning_data))
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    items = iter(items)
+    while batch := list(itertools.islice(items, size)):
+        yield batch
+
+def _plan_source_surveys(source: "PlanningDataCollections | CachedPlan") -> Iterable[Any]:
+    """Surveys of loaded planning data, or the per-survey lines of a cached plan"""
+    return source.iter_surveys() if isinstance(source, CachedPlan) else source.surveys
+
+def _generate_batch(scheduler: EventBridgeScheduler, source: "PlanningDataCollections | CachedPlan",
+                    surveys: List[Any], base_date: datetime, days_ahead: int
+                    ) -> Tuple[List[int], List[EventBridgeScheduleRequest]]:
+    """Survey ids and schedule requests of one batch from _plan_source_surveys"""
+    if isinstance(source, CachedPlan):
+        return [s["survey_id"] for s in surveys], list(source.shifted_requests(surveys, base_date, days_ahead))
+    return [s.survey_id for s in surveys], list(scheduler.iter_schedule_requests(source, base_date, surveys, days_ahead))
+
+async def _flush_registry(session: AsyncSession, scheduler: EventBridgeScheduler) -> int:
+    """Write the registry rows collected so far; reconciliation repairs the registry if this fails"""
+    rows, names = scheduler.drain_recorded()
+    if not rows and not names:
+        return 0
+    try:
+        recorded = await record_planned_schedules(session, rows)
+        await delete_planned_schedules(session, names)
+        await session.commit()
+        return recorded
+    except Exception as e:
+        await session.rollback()
+        logger.warning(f"Failed to record planned schedules: {e}")
+        return 0
+
+async def run_planning_pipeline(
+    session: AsyncSession,
+    scheduler: EventBridgeScheduler,
+    planning_data: "PlanningDataCollections | CachedPlan",
+    base_date: datetime,
+    batch_size: int = PLANNING_BATCH_SURVEYS,
+    days_ahead: int = 1,
+    shard: int = 0,
+    shards: int = 1,
+    template: Optional[PlanTemplateBuilder] = None
+) -> PlanSummary:
+    """
+    Stream schedule requests through diff and creation without materialising the whole plan.
+    
+    Surveys are taken in batches of `batch_size` (divided by `days_ahead`, since every
+    survey yields one set of requests per planned day). For each batch, requests are
+    generated survey by survey, PLANNED queries rows are persisted (one
+    transaction per batch), requests are rendered and, in batching mode, collapsed
+    into per-minute batch schedules, and the batch is diffed against the registry
+    for those surveys. The resulting create/update/delete actions go into a bounded
+    queue drained by `scheduler.max_workers` workers, which run the paced boto3
+    calls on the shared AWS thread pool. Once every batch is queued, schedules of
+    surveys that are no longer active are queued for deletion. Outcomes are
+    tallied into a PlanSummary as they complete, and registry rows are flushed
+    after every batch. Memory therefore depends on the batch and queue sizes,
+    not on how many surveys are planned.
+    
+    With `days_ahead` > 1 the whole window of base dates is planned from the same
+    planning data and diffed against every occurrence already planned in it, so
+    days covered by an earlier run cost no AWS calls.
+    
+    When planning is sharded, `planning_data` holds only the shard's surveys and
+    `shard`/`shards` limit the orphan cleanup to that shard's surveys too.
+    
+    `planning_data` may also be a CachedPlan, whose requests are shifted to the
+    planned dates instead of being generated. Otherwise, generated requests are
+    also added to `template`, if given, to cache the plan.
+    """
+    plan_date = base_date.date()
+    until = plan_base_dates(base_date, days_ahead)[-1].date()
+    batch_size = max(1, batch_size // days_ahead)
+    summary = PlanSummary()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2 * scheduler.max_workers)
+    
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            action, target = item
+            summary.add(await run_aws(scheduler._apply_action, action, target, plan_date))
+    
+    workers = [asyncio.create_task(worker()) for _ in range(scheduler.max_workers)]
+    group_checked = False
+    try:
+        for surveys in _batches(_plan_source_surveys(planning_data), batch_size):
+            survey_ids, requests = _generate_batch(scheduler, planning_data, surveys, base_date, days_ahead)
+            if template is not None and not isinstance(planning_data, CachedPlan):
+                template.add(surveys, requests)
+            
+            # PLANNED queries rows first, so each payload carries its query_id
+            try:
+                planned = await persist_planned_queries(session, [r.input_payload for r in requests])
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+            summary.queries_planned += planned["rows"]
+            summary.queries_paired += planned["paired"]
+            render_requests(requests)
+            for request in requests:
+                sent, full = request_payload_sizes(request)
+                summary.payload_bytes += sent
+                summary.payload_bytes_saved += full - sent
+            requests = scheduler.batch_requests(requests)
+            summary.desired += len(requests)
+            
+            existing = await load_planned_hashes(
+                session, scheduler.group_name, plan_date, survey_ids, until=until
+            )
+            diff = diff_schedule_plan(requests, existing)
+            summary.unchanged += len(diff.unchanged)
+            
+            if (diff.create or diff.update) and not group_checked:
+                await run_aws(scheduler._ensure_schedule_group_exists)
+                group_checked = True
+            for request in diff.create:
+                await queue.put(("create", request))
+            for request in diff.update:
+                await queue.put(("update", request))
+            for name in diff.delete:
+                await queue.put(("delete", name))
+            
+            summary.recorded += await _flush_registry(session, scheduler)
+        
+        orphans = await load_orphaned_schedules(
+            session, scheduler.group_name, plan_date, until=until, shard=shard, shards=shards
+        )
+        for name in orphans:
+            await queue.put(("delete", name))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+        # Whatever was created before a failure still gets recorded
+        summary.recorded += await _flush_registry(session, scheduler)
+    
+    logger.info(
+        f"Planned {summary.desired} schedules for {plan_date}..{until}: {summary.created} created, {summary.updated} updated, "
+        f"{summary.deleted} deleted, {summary.unchanged} unchanged, {summary.failed} failed"
+    )
+    return summary
+
+async def run_dry_run(
+    session: AsyncSession,
+    scheduler: EventBridgeScheduler,
+    planning_data: "PlanningDataCollections | CachedPlan",
+    base_date: datetime,
+    plan_file: TextIO,
+    profile: PhaseProfile,
+    batch_size: int = PLANNING_BATCH_SURVEYS,
+    days_ahead: int = 1,
+    shard: int = 0,
+    shards: int = 1
+) -> PlanSummary:
+    """
+    Plan without side effects: generate and diff batch by batch like
+    run_planning_pipeline, but write nothing to the database or EventBridge.
+    
+    query_id is looked up for queries rows that already exist (none are inserted), so
+    payload hashes match what a real run would send. Every desired schedule is written
+    to `plan_file` as one JSON line with the action a real run would take (create,
+    update or unchanged), its time and payload hash (batch schedules list their
+    query_ids and show their first query's ids); schedules a real run would delete
+    follow as "delete" lines. `summary.created/updated/deleted` count the actions that
+    would be taken. Time and memory go to `profile` under request_generation,
+    serialization (rendering, hashing, plan lines) and diff; database reads made
+    through a ProfiledSession are reported as db_load. `days_ahead` plans a window of
+    base dates, `shard`/`shards` limit orphans and `planning_data` may be a CachedPlan
+    as in run_planning_pipeline.
+    """
+    plan_date = base_date.date()
+    until = plan_base_dates(base_date, days_ahead)[-1].date()
+    batch_size = max(1, batch_size // days_ahead)
+    summary = PlanSummary()
+    
+    def write(line: Dict[str, Any]) -> None:
+        plan_file.write(json.dumps(line, default=str) + "\n")
+    
+    for surveys in _batches(_plan_source_surveys(planning_data), batch_size):
+        with profile.phase("request_generation"):
+            survey_ids, requests = _generate_batch(scheduler, planning_data, surveys, base_date, days_ahead)
+        
+        with profile.phase("diff"):
+            summary.queries_planned += await lookup_planned_queries(session, [r.input_payload for r in requests])
+        
+        with profile.phase("serialization"):
+            render_requests(requests)
+            for request in requests:
+                request_payload_hash(request)
+                sent, full = request_payload_sizes(request)
+                summary.payload_bytes += sent
+                summary.payload_bytes_saved += full - sent
+            requests = scheduler.batch_requests(requests)
+        summary.desired += len(requests)
+        
+        with profile.phase("diff"):
+            existing = await load_planned_hashes(
+                session, scheduler.group_name, plan_date, survey_ids, until=until
+            )
+            diff = diff_schedule_plan(requests, existing)
+        summary.created += len(diff.create)
+        summary.updated += len(diff.update)
+        summary.deleted += len(diff.delete)
+        summary.unchanged += len(diff.unchanged)
+        
+        with profile.phase("serialization"):
+            actions = {r.schedule_name: "create" for r in diff.create}
+            actions.update((r.schedule_name, "update") for r in diff.update)
+            for request in requests:
+                payload = request_registry_payload(request)
+                line = {
+                    "action": actions.get(request.schedule_name, "unchanged"),
+                    "schedule_name": request.schedule_name,
+                    "schedule_expression": request.schedule_expression,
+                    "scheduled_for_utc": payload["scheduled_for_utc"],
+                    "survey_id": payload["survey_id"],
+                    "query_schedule_id": payload["query_schedule_id"],
+                    "query_id": payload["query_id"],
+                    "payload_hash": request_payload_hash(request),
+                }
+                if request.members:
+                    line["query_ids"] = [m.input_payload["query_id"] for m in request.members]
+                write(line)
+            for name in diff.delete:
+                write({"action": "delete", "schedule_name": name})
+    
+    with profile.phase("diff"):
+        orphans = await load_orphaned_schedules(
+            session, scheduler.group_name, plan_date, until=until, shard=shard, shards=shards
+        )
+    summary.deleted += len(orphans)
+    with profile.phase("serialization"):
+        for name in orphans:
+            write({"action": "delete", "schedule_name": name})
+    
+    logger.info(
+        f"Dry run for {plan_date}..{until}: {summary.desired} schedules desired, {summary.created} to create, "
+        f"{summary.updated} to update, {summary.deleted} to delete, {summary.unchanged} unchanged"
+    )
+    return summary
+
+def _shard_scheduler(shard: int, shards: int) -> EventBridgeScheduler:
+    """
+    EventBridgeScheduler for one shard of a run.
+
+    Shards run in parallel against the same account quota, so each gets an equal
+    share of SCHEDULER_TPS, and it places schedules within its part of the window.
+    """
+    scheduler = EventBridgeScheduler(requests_per_second=SCHEDULER_TPS / shards)
+    scheduler.placement.use_shard(shard, shards)
+    return scheduler
+
+
+async def _load_cached_plan(session: AsyncSession, scheduler: EventBridgeScheduler, shard: int,
+                            shards: int) -> Tuple[Optional[str], Optional[CachedPlan]]:
+    """
+    Fingerprint of the planning inputs, and the stored plan if it was built from the
+    same fingerprint. (None, None) if the fingerprint or plan cannot be read: the run
+    then loads and generates as without the cache.
+    """
+    try:
+        fingerprint = await planning_fingerprint(session, scheduler.template_settings(), shard, shards)
+        row = await load_plan_template(session, template_scope(scheduler.group_name, shard, shards))
+    except Exception as e:
+        await session.rollback()
+        logger.warning(f"Plan template cache unavailable: {e}")
+        return None, None
+    if row is None or row.fingerprint != fingerprint:
+        return fingerprint, None
+    return fingerprint, CachedPlan(
+        fingerprint=row.fingerprint,
+        base_date=row.base_date,
+        template=row.template,
+        survey_count=row.survey_count,
+        request_count=row.request_count,
+        stats=row.stats or {}
+    )
+
+async def _save_cached_plan(session: AsyncSession, scheduler: EventBridgeScheduler, plan: CachedPlan,
+                            shard: int, shards: int) -> None:
+    """Store a plan template; a failure only costs the next run a full load"""
+    try:
+        await save_plan_template(
+            session, template_scope(scheduler.group_name, shard, shards), plan.fingerprint, plan.base_date,
+            plan.template, plan.survey_count, plan.request_count, plan.stats
+        )
+        await session.commit()
+        logger.info(f"Cached plan template: {plan.request_count} requests, {len(plan.template)} bytes")
+    except Exception as e:
+        await session.rollback()
+        logger.warning(f"Failed to cache the plan template: {e}")
+
+async def forecast_planning(
+    base_date: datetime = None,
+    dry_run: bool = False,
+    plan_file: Optional[str] = None,
+    days_ahead: int = PLANNING_DAYS_AHEAD,
+    shard: int = 0,
+    shards: int = 1
+) -> Dict[str, Any]:
     """
     Main forecast planning function that reads active surveys and prepares EventBridge schedules.
     
@@ -500,11 +1457,48 @@ async def forecast_planning(base_date: datetime = None) -> Dict[str, Any]:
     1. Reads all active surveys from the cryptoforecastdatabase
     2. Loads all related data (assets, schedules, query_schedules, query_types, prompts, llms)
     3. Builds collections of data classes for processing
-    4. Generates EventBridge One Time Schedule requests for each required query
-    5. Returns summary information about the planning process
+    4. Streams the desired EventBridge One Time Schedule requests for each required query
+       through run_planning_pipeline: PLANNED queries rows are upserted (query_id goes
+       into each payload), requests are diffed against the schedules already planned
+       for the same base date (planned_schedules registry) and only the delta is
+       created, updated or deleted
+    5. Returns summary information about the planning process; per-schedule lists
+       (created_schedules, deleted_schedules, failed_schedules, survey_summary) are
+       capped at SUMMARY_SAMPLE_SIZE entries while the statistics count everything
+    
+    Re-running for the same base date is idempotent: with no configuration changes
+    no AWS write calls are made.
+    
+    With `days_ahead` > 1 one run plans that many consecutive base dates from a single
+    load of the planning data; occurrences an earlier run already planned in the window
+    come out unchanged, so planning can run weekly instead of daily.
+    
+    With `dry_run`, steps 4 and 5 are replaced by run_dry_run: nothing is written to
+    the database or EventBridge, the plan (one JSON line per schedule with its action,
+    time and payload hash) goes to `plan_file`, and the results carry a per-phase
+    timing and memory report ("phases": db_load, dataclass_build, request_generation,
+    serialization, diff).
+    
+    Unless PLAN_TEMPLATE_CACHE is "off", steps 1-3 are skipped while the planning
+    inputs are unchanged: the run fingerprints the planned surveys and the rows they
+    reference (plan_cache) and, if the plan template stored by an earlier run has the
+    same fingerprint, shifts its requests to the new base dates. Otherwise the
+    template is built from the requests the pipeline generates and stored after the
+    run (not by dry runs).
+    
+    With `shards` > 1 the run plans only the surveys with survey_id % shards == shard
+    (and deletes only their orphaned schedules), so `shards` runs, e.g. launched by
+    shard_coordinator.run_sharded_planning, together plan every survey. Shards never
+    touch each other's schedules or queries rows, and a shard run again after a
+    partial failure finds its schedules by name and updates them in place.
     
     Args:
         base_date: Base date for scheduling (defaults to tomorrow)
+        dry_run: Plan and report without side effects
+        plan_file: Plan artifact path for dry runs (defaults to plan-<base date>.jsonl)
+        days_ahead: Number of consecutive base dates to plan (PLANNING_DAYS_AHEAD, default 1)
+        shard: Index of the survey shard to plan, 0 <= shard < shards
+        shards: Number of survey shards (1 = plan every survey)
         
     Returns:
         Dict containing planning results and statistics
@@ -521,57 +1515,134 @@ async def forecast_planning(base_date: datetime = None) -> Dict[str, Any]:
     logger.info("Starting forecast planning process")
     
     try:
+        if base_date is None:
+            base_date = default_base_date()
+        
+        # Dry runs profile every phase; database reads are timed through the session
+        profile = PhaseProfile() if dry_run else None
+        
         # Create database session
         async with SessionLocal() as session:
-            # Load all survey data and related entities
-            logger.info("Loading survey data from database")
-            planning_data = await load_survey_data(session)
+            if dry_run:
+                session = ProfiledSession(session, profile)
+            if shards > 1:
+                logger.info(f"Planning shard {shard} of {shards}")
             
-            logger.info(f"Loaded {len(planning_data.surveys)} active surveys")
-            logger.info(f"Loaded {len(planning_data.assets)} assets")
-            logger.info(f"Loaded {len(planning_data.schedules)} schedules")
-            logger.info(f"Loaded {len(planning_data.query_types)} query types")
-            logger.info(f"Loaded {len(planning_data.prompts)} prompts")
-            logger.info(f"Loaded {len(planning_data.llms)} LLMs")
+            # Initialize EventBridge scheduler for this shard
+            scheduler = _shard_scheduler(shard, shards)
             
-            # Initialize EventBridge scheduler
-            scheduler = EventBridgeScheduler()
-            
-            # Generate schedule requests
-            logger.info("Generating EventBridge schedule requests")
-            schedule_requests = scheduler.generate_schedule_requests(planning_data, base_date)
+            # Unchanged planning inputs: shift the stored plan instead of loading them
+            fingerprint, cached = None, None
+            if PLAN_TEMPLATE_CACHE == "on":
+                fingerprint, cached = await _load_cached_plan(session, scheduler, shard, shards)
+            if cached:
+                planning_data, stats = cached, cached.stats
+                logger.info(
+                    f"Planning inputs unchanged since {cached.base_date}: reusing the cached plan of "
+                    f"{cached.request_count} requests for {cached.survey_count} surveys"
+                )
+            else:
+                # Load all survey data and related entities
+                logger.info("Loading survey data from database")
+                if dry_run:
+                    with profile.phase("dataclass_build"):
+                        planning_data = await load_survey_data(session, shard, shards)
+                else:
+                    planning_data = await load_survey_data(session, shard, shards)
+                stats = planning_stats(planning_data)
+                
+                logger.info(f"Loaded {len(planning_data.surveys)} active surveys")
+                logger.info(f"Loaded {len(planning_data.assets)} assets")
+                logger.info(f"Loaded {len(planning_data.schedules)} schedules")
+                logger.info(f"Loaded {len(planning_data.query_types)} query types")
+                logger.info(f"Loaded {len(planning_data.prompts)} prompts")
+                logger.info(f"Loaded {len(planning_data.llms)} LLMs")
+            template_status = "off" if PLAN_TEMPLATE_CACHE != "on" else "hit" if cached else "miss"
             
-            logger.info(f"Generated {len(schedule_requests)} schedule requests")
+            if dry_run:
+                shard_suffix = f"-shard{shard}of{shards}" if shards > 1 else ""
+                plan_file = plan_file or f"plan-{base_date.date().isoformat()}{shard_suffix}.jsonl"
+                logger.info(f"Dry run: writing plan to {plan_file}")
+                try:
+                    with open(plan_file, "w") as artifact:
+                        summary = await run_dry_run(
+                            session, scheduler, planning_data, base_date, artifact, profile,
+                            days_ahead=days_ahead, shard=shard, shards=shards
+                        )
+                finally:
+                    profile.close()
+                return {
+                    "status": "success",
+                    "dry_run": True,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "plan_file": plan_file,
+                    "statistics": {
+                        "active_surveys": stats["active_surveys"],
+                        "days_ahead": days_ahead,
+                        "shard": shard,
+                        "shards": shards,
+                        "schedules_desired": summary.desired,
+                        "queries_existing": summary.queries_planned,
+                        "schedules_to_create": summary.created,
+                        "schedules_to_update": summary.updated,
+                        "schedules_to_delete": summary.deleted,
+                        "schedules_unchanged": summary.unchanged,
+                        "placement_window_seconds": scheduler.placement.window_seconds,
+                        "batching": scheduler.batching,
+                        "payload_mode": scheduler.payload_mode,
+                        "plan_template": template_status,
+                        "payload_bytes": summary.payload_bytes,
+                        "payload_bytes_saved": summary.payload_bytes_saved
+                    },
+                    "phases": profile.report()
+                }
             
-            # In AWS implementation, this would create the actual schedules
-            created_schedules = []
-            for request in schedule_requests:
-                schedule_result = scheduler.create_one_time_schedule(request)
-                created_schedules.append(schedule_result)
+            # Generate, persist, diff and create batch by batch
+            logger.info("Planning EventBridge schedules")
+            # On a cache miss the pipeline's requests also build the template for the next run
+            template = PlanTemplateBuilder(base_date) if fingerprint and not cached else None
+            summary = await run_planning_pipeline(
+                session, scheduler, planning_data, base_date, days_ahead=days_ahead, shard=shard, shards=shards,
+                template=template
+            )
+            if template is not None:
+                await _save_cached_plan(session, scheduler, template.finish(fingerprint, stats), shard, shards)
             
             # Prepare summary results
             results = {
-                "status": "success",
+                "status": "partial_success" if summary.failed else "success",
                 "timestamp": datetime.now(timezone.utc).isoformat(),
                 "statistics": {
-                    "active_surveys": len(planning_data.surveys),
-                    "total_assets": len(planning_data.assets),
-                    "total_schedules": len(planning_data.schedules),
-                    "total_query_types": len(planning_data.query_types),
-                    "total_prompts": len(planning_data.prompts),
-                    "total_llms": len(planning_data.llms),
-                    "schedules_created": len(created_schedules)
+                    "active_surveys": stats["active_surveys"],
+                    "total_assets": stats["total_assets"],
+                    "total_schedules": stats["total_schedules"],
+                    "total_query_types": stats["total_query_types"],
+                    "total_prompts": stats["total_prompts"],
+                    "total_llms": stats["total_llms"],
+                    "days_ahead": days_ahead,
+                    "shard": shard,
+                    "shards": shards,
+                    "schedules_desired": summary.desired,
+                    "queries_planned": summary.queries_planned,
+                    "queries_paired": summary.queries_paired,
+                    "schedules_created": summary.created,
+                    "schedules_updated": summary.updated,
+                    "schedules_deleted": summary.deleted,
+                    "schedules_unchanged": summary.unchanged,
+                    "schedules_failed": summary.failed,
+                    "schedule_call_retries": summary.retries,
+                    "placement_window_seconds": scheduler.placement.window_seconds,
+                    "batching": scheduler.batching,
+                    "payload_mode": scheduler.payload_mode,
+                    "plan_template": template_status,
+                    "payload_bytes": summary.payload_bytes,
+                    "payload_bytes_saved": summary.payload_bytes_saved,
+                    "schedules_recorded": summary.recorded
                 },
-                "survey_summary": [
-                    {
-                        "survey_id": survey.survey_id,
-                        "asset_symbol": survey.asset.asset_symbol if survey.asset else None,
-                        "schedule_name": survey.schedule.schedule_name if survey.schedule else None,
-                        "query_count": len(survey.schedule.query_schedules) if survey.schedule else 0
-                    }
-                    for survey in planning_data.surveys
-                ],
-                "created_schedules": created_schedules
+                "survey_summary": stats["survey_summary"],
+                "created_schedules": summary.created_sample,
+                "deleted_schedules": summary.deleted_sample,
+                "failed_schedules": summary.failed_sample
             }
             
             logger.info("Forecast planning completed successfully")
@@ -589,11 +1660,52 @@ async def forecast_planning(base_date: datetime = None) -> Dict[str, Any]:
 # Example usage for local development
 async def main():
     """Example usage for local development and testing"""
-    result = await forecast_planning()
+    parser = argparse.ArgumentParser(description="Plan EventBridge schedules for active surveys")
+    parser.add_argument("--base-date", type=date.fromisoformat, help="Date to plan (YYYY-MM-DD, default tomorrow UTC)")
+    parser.add_argument("--dry-run", action="store_true", help="Plan without writing to the database or EventBridge")
+    parser.add_argument("--plan-file", help="Plan artifact for --dry-run (default plan-<base date>.jsonl); needs --shard when --shards > 1")
+    parser.add_argument("--days-ahead", type=int, default=PLANNING_DAYS_AHEAD,
+                        help="Consecutive base dates to plan, starting at the base date")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="Split surveys into this many shards by survey_id; without --shard, "
+                             "plan every shard in its own process")
+    parser.add_argument("--shard", type=int, help="Plan only this shard (0 .. shards - 1)")
+    args = parser.parse_args()
+    base_date = datetime.combine(args.base_date, time(0), tzinfo=timezone.utc) if args.base_date else None
+    
+    if args.shards > 1 and args.shard is None:
+        if args.plan_file:
+            # Every shard process writes its own plan-<base date>-shard<i>of<n>.jsonl
+            parser.error("--plan-file needs --shard when --shards is more than 1")
+        from .shard_coordinator import run_sharded_planning
+        result = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: run_sharded_planning(
+                args.shards, base_date, days_ahead=args.days_ahead, dry_run=args.dry_run
+            )
+        )
+    else:
+        result = await forecast_planning(base_date, dry_run=args.dry_run, plan_file=args.plan_file,
+                                         days_ahead=args.days_ahead, shard=args.shard or 0, shards=args.shards)
     print("Forecast Planning Results:")
     print(f"Status: {result['status']}")
     print(f"Active Surveys: {result.get('statistics', {}).get('active_surveys', 0)}")
-    print(f"Schedules Created: {result.get('statistics', {}).get('schedules_created', 0)}")
+    stats = result.get('statistics', {})
+    if result.get("dry_run"):
+        print(f"Plan File: {result.get('plan_file') or ', '.join(result.get('plan_files', []))}")
+        print(f"Schedules Desired: {stats['schedules_desired']}")
+        print(f"To Create: {stats['schedules_to_create']}, To Update: {stats['schedules_to_update']}, "
+              f"To Delete: {stats['schedules_to_delete']}, Unchanged: {stats['schedules_unchanged']}")
+        print(f"{'phase':<20} {'seconds':>9} {'calls':>7} {'peak MiB':>9}")
+        for name, phase in result["phases"].items():
+            print(f"{name:<20} {phase['seconds']:>9.3f} {phase['calls']:>7} {phase['peak_mib']:>9.2f}")
+        return
+    print(f"Schedules Created: {stats.get('schedules_created', 0)}")
+    print(f"Schedules Updated: {stats.get('schedules_updated', 0)}")
+    print(f"Schedules Deleted: {stats.get('schedules_deleted', 0)}")
+    print(f"Schedules Unchanged: {stats.get('schedules_unchanged', 0)}")
+    print(f"Schedules Failed: {stats.get('schedules_failed', 0)}")
+    print(f"Payload Bytes ({stats.get('payload_mode', 'full')}): {stats.get('payload_bytes', 0)} "
+          f"({stats.get('payload_bytes_saved', 0)} saved)")
 
 
 if __name__ == "__main__":
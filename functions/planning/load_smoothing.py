@@ -0,0 +1,182 @@
+"""
+Load smoothing for planned schedules.
+
+Every survey on a schedule starts at the same initial_query_time, so without
+placement all of their queries fire in the same second and hit the LLM
+providers at once. `LoadSmoother` moves each survey's fire times by one
+deterministic offset inside a window after their nominal times.
+
+Offsets are assigned up front for all surveys being planned. Each provider's
+capacity (requests per minute for the payload's llm_name) is enforced as
+buckets of max(1, 60 / rpm) seconds, each holding at most the requests the
+provider accepts in that time. A survey's preferred offset comes from a stable
+hash of its survey_id; it takes the first offset from there (wrapping round
+the window) at which every one of its queries lands in a bucket with room, so
+no bucket holds more than its capacity. Surveys are placed in survey_id order,
+and a survey only moves when another one takes the slot it probes into, so
+adding or removing a survey leaves the others' fire times (and schedules)
+alone. All queries of a survey, whatever their provider, move by the same
+offset, so the delays between a survey's Baseline Forecast and Follow-up
+queries are kept. When the window is too short for a provider's load,
+capacity is exceeded evenly: surveys that no longer fit go round the window
+again, one extra request per bucket per round.
+
+Only the EventBridge schedule expression moves. The payload keeps the nominal
+scheduled_for_utc, which the queries row, follow-up pairing and reports use,
+and gains placement_offset_seconds.
+"""
+
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+# Queries repeat daily, so capacity is tracked per second of the day
+_DAY_SECONDS = 86400
+
+# A survey's queries as (nominal second of the day, llm_name)
+QuerySlots = Sequence[Tuple[int, Optional[str]]]
+
+
+def parse_provider_rpm(text: str) -> Dict[str, float]:
+    """"OpenAI=60,Grok=30" -> {"OpenAI": 60.0, "Grok": 30.0}"""
+    rpm = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, _, value = item.rpartition("=")
+        if not name or float(value) <= 0:
+            raise ValueError(f"Invalid provider capacity '{item}', expected <llm_name>=<requests per minute>")
+        rpm[name.strip()] = float(value)
+    return rpm
+
+
+def _follow(links: Dict[int, int], offset: int) -> int:
+    """End of the chain of full offsets starting at `offset` (with path compression)"""
+    end = offset
+    while end in links:
+        end = links[end]
+    while offset != end:
+        links[offset], offset = end, links[offset]
+    return end
+
+
+class LoadSmoother:
+    """
+    Deterministic placement of schedule fire times within a window.
+
+    Args:
+        window_seconds: Latest offset from the nominal time; 0 disables placement
+        provider_rpm: Requests per minute each provider (llm_name) accepts
+        default_rpm: Capacity of providers missing from provider_rpm
+        shard, shards: A sharded run places its surveys in its own 1/shards of the
+            window, so shards planned independently never fire queries with the
+            same nominal time in the same second
+    """
+
+    def __init__(self, window_seconds: int = 0, provider_rpm: Optional[Dict[str, float]] = None,
+                 default_rpm: float = 60.0, shard: int = 0, shards: int = 1):
+        if window_seconds < 0:
+            raise ValueError("window_seconds must not be negative")
+        self.window_seconds = int(window_seconds)
+        self.provider_rpm = dict(provider_rpm or {})
+        self.default_rpm = default_rpm
+        self.use_shard(shard, shards)
+        self._offsets: Dict[int, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_seconds > 0
+
+    def use_shard(self, shard: int, shards: int) -> None:
+        """Place only within the shard's part of the window (see the class docstring)"""
+        if not 0 <= shard < shards:
+            raise ValueError(f"shard must be in [0, {shards}), got {shard}")
+        self.shard, self.shards = shard, shards
+
+    def spacing(self, llm_name: Optional[str]) -> float:
+        """Seconds between two consecutive requests a provider accepts"""
+        return 60.0 / self.provider_rpm.get(llm_name, self.default_rpm)
+
+    def bucket(self, llm_name: Optional[str]) -> Tuple[float, int]:
+        """(seconds, requests) of a provider's capacity bucket"""
+        spacing = self.spacing(llm_name)
+        width = max(1.0, spacing)
+        return width, max(1, int(width / spacing + 1e-9))
+
+    def _range(self) -> Tuple[int, int]:
+        """[first, last] offset this shard places at"""
+        share = self.window_seconds / self.shards
+        first = int(self.shard * share)
+        return first, max(first, int((self.shard + 1) * share) - 1)
+
+    def preferred(self, survey_id: int) -> int:
+        """A survey's first-choice offset, from a stable hash of its id"""
+        first, last = self._range()
+        return first + zlib.crc32(str(survey_id).encode()) % (last - first + 1)
+
+    def assign(self, surveys: Iterable[Tuple[int, QuerySlots]]) -> None:
+        """
+        Choose each survey's offset, replacing earlier assignments.
+
+        Args:
+            surveys: (survey_id, its queries' (nominal second of the day, llm_name)),
+                in any order; placement always goes by survey_id
+        """
+        first, last = self._range()
+        buckets = {}
+        used: Counter = Counter()
+        # Per (query slots, round): offsets known to be full link to the next one to
+        # try (buckets only fill up, so a full offset stays full)
+        skips: Dict[Tuple[QuerySlots, int], Dict[int, int]] = {}
+        # First round with room per query slots
+        rounds: Dict[QuerySlots, int] = {}
+        self._offsets = {}
+
+        def keys(slots, offset):
+            return [(name, int((second + offset) % _DAY_SECONDS // buckets[name][0])) for second, name in slots]
+
+        def probe(slots, round_, start, end):
+            """First offset in [start, end) with room for `slots`, or None"""
+            nxt = skips.setdefault((slots, round_), {})
+            offset = _follow(nxt, start)
+            while offset < end:
+                if all(used[key] < buckets[key[0]][1] * round_ for key in keys(slots, offset)):
+                    return offset
+                nxt[offset] = offset + 1
+                offset = _follow(nxt, offset + 1)
+            return None
+
+        for survey_id, slots in sorted(surveys, key=lambda s: s[0]):
+            slots = tuple(slots)
+            for name in {llm_name for _, llm_name in slots}:
+                if name not in buckets:
+                    buckets[name] = self.bucket(name)
+            start = self.preferred(survey_id)
+            round_ = rounds.get(slots, 1)
+            while True:
+                offset = probe(slots, round_, start, last + 1)
+                if offset is None:
+                    offset = probe(slots, round_, first, start)
+                if offset is not None:
+                    break
+                round_ += 1
+            rounds[slots] = round_
+            for key in keys(slots, offset):
+                used[key] += 1
+            self._offsets[survey_id] = offset
+
+    def offset(self, survey_id: int) -> int:
+        """Whole seconds a survey's queries fire after their nominal time (assign first)"""
+        try:
+            return self._offsets[survey_id]
+        except KeyError:
+            raise LookupError(f"No placement assigned for survey {survey_id}") from None
+
+    def place(self, request) -> None:
+        """Move an EventBridgeScheduleRequest's fire time by its survey's offset"""
+        if not self.enabled:
+            return
+        payload = request.input_payload
+        offset = self.offset(payload["survey_id"])
+        nominal = datetime.fromisoformat(payload["scheduled_for_utc"])
+        request.schedule_expression = f"at({(nominal + timedelta(seconds=offset)).strftime('%Y-%m-%dT%H:%M:%S')})"
+        payload["placement_offset_seconds"] = offset
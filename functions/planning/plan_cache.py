@@ -0,0 +1,175 @@
+"""
+Plan templates: the last generated plan, reused while the planning inputs are unchanged.
+
+Planning reads eight tables (surveys and what they reference) and regenerates
+every schedule request, although on most days none of those rows has changed.
+`planning_fingerprint` summarises the inputs in one aggregate query per table.
+Like load_survey_data, it reads only the active surveys of the shard being
+planned and the catalog rows they reference (assets, schedules, prompts and,
+through those, asset types, query schedules, query types and LLMs), through
+semi-joins on the indexed reference columns. MySQL hashes each of those rows
+and returns the row count and the XOR of the hashes. Edits to catalog rows no
+planned survey uses therefore leave the fingerprint, and the cached plan,
+alone. The fingerprint is the SHA-256 of those digests, the planning settings
+that shape a request, and PLAN_TEMPLATE_VERSION.
+
+A plan template is one day's schedule requests as zlib-compressed JSON lines,
+one line per survey. It is stored in plan_templates with the fingerprint it was
+built from, one row per scope (schedule group and shard). While the fingerprint
+matches, planning shifts the template to the new base date instead of loading
+the inputs again. Reading it back is streamed, so memory stays bounded by the
+compressed size plus one batch.
+"""
+
+import hashlib
+import json
+import logging
+import zlib
+from datetime import date
+from typing import Any, Dict, Iterator, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import LLM, Asset, AssetType, PlanTemplate, Prompt, QuerySchedule, QueryType, Schedule, Survey
+from app.utils.schedule_registry import shard_clause
+
+logger = logging.getLogger(__name__)
+
+# Bump when the template line format or request generation changes, so stored
+# templates are rebuilt instead of shifted
+PLAN_TEMPLATE_VERSION = 3
+
+# Input tables in fingerprint order (see _referenced_rows)
+_FINGERPRINT_TABLES = (Survey, Asset, AssetType, Schedule, QuerySchedule, QueryType, Prompt, LLM)
+
+# Template bytes decompressed per read
+_READ_CHUNK = 1 << 16
+
+
+def _table_digest(model, *where) -> sa.Select:
+    """SELECT COUNT(*), BIT_XOR(64-bit MD5 of each row) over `model`"""
+    row = sa.func.concat_ws(
+        "\x1f", *(sa.func.coalesce(sa.cast(c, sa.String), "\x00") for c in model.__table__.columns)
+    )
+    row_hash = sa.cast(sa.func.conv(sa.func.left(sa.func.md5(row), 16), 16, 10), mysql.BIGINT(unsigned=True))
+    return sa.select(sa.func.count(), sa.func.coalesce(sa.func.bit_xor(row_hash), 0)).select_from(model).where(*where)
+
+
+def _referenced_rows(shard: int, shards: int) -> Dict[Any, sa.ColumnElement]:
+    """Per input table, the condition selecting the rows the shard's active surveys plan from"""
+    planned = Survey.is_active == True  # noqa: E712
+    in_shard = shard_clause(Survey.survey_id, shard, shards)
+    if in_shard is not None:
+        planned = sa.and_(planned, in_shard)
+
+    def survey_column(column):
+        return sa.select(column).where(planned)
+
+    schedule_ids = survey_column(Survey.schedule_id)
+    prompt_ids = sa.union(survey_column(Survey.live_prompt_id), survey_column(Survey.forecast_prompt_id))
+    asset_ids = survey_column(Survey.asset_id)
+    prompts = Prompt.prompt_id.in_(prompt_ids)
+    rows = {
+        Survey: planned,
+        Asset: Asset.asset_id.in_(asset_ids),
+        AssetType: AssetType.asset_type_id.in_(sa.select(Asset.asset_type_id).where(Asset.asset_id.in_(asset_ids))),
+        Schedule: Schedule.schedule_id.in_(schedule_ids),
+        QuerySchedule: QuerySchedule.schedule_id.in_(schedule_ids),
+        QueryType: QueryType.query_type_id.in_(
+            sa.select(QuerySchedule.query_type_id).where(QuerySchedule.schedule_id.in_(schedule_ids))
+        ),
+        Prompt: prompts,
+        LLM: LLM.llm_id.in_(sa.union(
+            sa.select(Prompt.llm_id).where(prompts), sa.select(Prompt.target_llm_id).where(prompts)
+        )),
+    }
+    return {model: rows[model] for model in _FINGERPRINT_TABLES}
+
+
+async def planning_fingerprint(
+    session: AsyncSession, settings: Dict[str, Any], shard: int = 0, shards: int = 1
+) -> str:
+    """
+    Fingerprint of everything a plan is generated from: the shard's active surveys
+    and the rows they reference
+
+    Args:
+        settings: Planning settings that change the generated requests (JSON-serialisable)
+        shard, shards: Only the planning shard's surveys
+    """
+    digests = {}
+    for model, where in _referenced_rows(shard, shards).items():
+        count, digest = (await session.execute(_table_digest(model, where))).one()
+        digests[model.__tablename__] = [int(count), int(digest)]
+    material = {"version": PLAN_TEMPLATE_VERSION, "settings": settings, "tables": digests}
+    return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def template_scope(group_name: str, shard: int = 0, shards: int = 1) -> str:
+    """plan_templates.scope of a schedule group's plan (per shard when sharded)"""
+    return group_name if shards == 1 else f"{group_name}:{shard}/{shards}"
+
+
+class TemplateWriter:
+    """Compresses template lines as they are added"""
+
+    def __init__(self):
+        self._compressor = zlib.compressobj(6)
+        self._chunks = []
+        self.lines = 0
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self._chunks.append(self._compressor.compress((json.dumps(record) + "\n").encode()))
+        self.lines += 1
+
+    def finish(self) -> bytes:
+        self._chunks.append(self._compressor.flush())
+        return b"".join(self._chunks)
+
+
+def iter_template_records(template: bytes) -> Iterator[Dict[str, Any]]:
+    """Template lines in order, decompressed and parsed incrementally"""
+    decompressor = zlib.decompressobj()
+    pending = b""
+    for i in range(0, len(template), _READ_CHUNK):
+        pending += decompressor.decompress(template[i:i + _READ_CHUNK])
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield json.loads(line)
+    pending += decompressor.flush()
+    if pending.strip():
+        yield json.loads(pending)
+
+
+async def load_plan_template(session: AsyncSession, scope: str) -> Optional[PlanTemplate]:
+    """Stored template of a scope, if any"""
+    res = await session.execute(sa.select(PlanTemplate).where(PlanTemplate.scope == scope))
+    return res.scalars().first()
+
+
+async def save_plan_template(
+    session: AsyncSession,
+    scope: str,
+    fingerprint: str,
+    base_date: date,
+    template: bytes,
+    survey_count: int,
+    request_count: int,
+    stats: Dict[str, Any],
+) -> None:
+    """Replace a scope's template (INSERT ... ON DUPLICATE KEY UPDATE). The caller commits."""
+    values = {
+        "scope": scope,
+        "fingerprint": fingerprint,
+        "base_date": base_date,
+        "survey_count": survey_count,
+        "request_count": request_count,
+        "stats": stats,
+        "template": template,
+    }
+    stmt = mysql_insert(PlanTemplate).values(values)
+    stmt = stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in values if c != "scope"})
+    await session.execute(stmt)
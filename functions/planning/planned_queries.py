@@ -0,0 +1,147 @@
+"""
+PLANNED rows in the queries table for the schedules forecast planning creates.
+
+Every schedule request gets a `queries` row with status PLANNED before its
+EventBridge schedule is written, so the database knows what is due and the worker
+has a row to claim. Rows are upserted in bulk on ux_cq_plan4 (survey, time, query
+type, query schedule), so re-planning the same day finds the same rows and never
+touches rows a worker has already moved past PLANNED. A second, set-based pass
+links each Baseline Forecast row to its Follow-up (paired_query_id), the same
+join init.sql uses for the mock data.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import CryptoQuery
+
+logger = logging.getLogger(__name__)
+
+# Rows per multi-row INSERT / ids per IN list
+_WRITE_CHUNK = 1000
+
+QueryKey = Tuple[int, datetime, int, int]
+
+_PAIR_FOLLOWUPS = sa.text("""
+    UPDATE queries q
+    JOIN query_type qt_base ON qt_base.query_type_id = q.query_type_id
+        AND qt_base.query_type_name = 'Baseline Forecast'
+    JOIN query_schedules qs ON q.query_schedule_id = qs.query_schedule_id
+    JOIN query_type qt_followup ON qt_followup.query_type_name = 'Follow-up'
+    JOIN queries q_followup ON q_followup.survey_id = q.survey_id
+        AND q_followup.query_type_id = qt_followup.query_type_id
+        AND q_followup.scheduled_for_utc = DATE_ADD(q.scheduled_for_utc, INTERVAL qs.paired_followup_delay_hours HOUR)
+    SET q.paired_query_id = q_followup.query_id
+    WHERE qs.paired_followup_delay_hours IS NOT NULL
+    AND q.scheduled_for_utc BETWEEN :start AND :end
+    AND q.survey_id IN :survey_ids
+""").bindparams(sa.bindparam("survey_ids", expanding=True, type_=sa.Integer))
+
+
+def query_key(payload: Dict[str, Any]) -> QueryKey:
+    """ux_cq_plan4 key of the query a schedule payload runs"""
+    return (
+        payload["survey_id"],
+        datetime.fromisoformat(payload["scheduled_for_utc"]).replace(tzinfo=None),
+        payload["query_type_id"],
+        payload["query_schedule_id"],
+    )
+
+
+def planned_query_rows(payloads: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """queries rows (status PLANNED) for schedule payloads, one per ux_cq_plan4 key"""
+    rows = {}
+    for payload in payloads:
+        key = query_key(payload)
+        rows[key] = {
+            "survey_id": key[0],
+            "schedule_id": payload["schedule_id"],
+            "query_schedule_id": key[3],
+            "query_type_id": key[2],
+            "scheduled_for_utc": key[1],
+            "status": "PLANNED",
+        }
+    return list(rows.values())
+
+
+async def _read_query_ids(session: AsyncSession, rows: List[Dict[str, Any]]) -> Dict[QueryKey, int]:
+    """query_id by ux_cq_plan4 key for existing rows: same surveys, same time window"""
+    start = min(r["scheduled_for_utc"] for r in rows)
+    end = max(r["scheduled_for_utc"] for r in rows)
+    survey_ids = sorted({r["survey_id"] for r in rows})
+    ids: Dict[QueryKey, int] = {}
+    for i in range(0, len(survey_ids), _WRITE_CHUNK):
+        res = await session.execute(
+            sa.select(
+                CryptoQuery.survey_id, CryptoQuery.scheduled_for_utc,
+                CryptoQuery.query_type_id, CryptoQuery.query_schedule_id, CryptoQuery.query_id,
+            ).where(
+                CryptoQuery.survey_id.in_(survey_ids[i:i + _WRITE_CHUNK]),
+                CryptoQuery.scheduled_for_utc.between(start, end),
+            )
+        )
+        for survey_id, scheduled_for, query_type_id, query_schedule_id, query_id in res.all():
+            ids[(survey_id, scheduled_for, query_type_id, query_schedule_id)] = query_id
+    return ids
+
+
+async def lookup_planned_queries(session: AsyncSession, payloads: List[Dict[str, Any]]) -> int:
+    """
+    Read-only counterpart of persist_planned_queries for dry runs: set `query_id`
+    in payloads whose queries row already exists, write nothing.
+
+    Returns:
+        Number of payloads whose row was found
+    """
+    rows = planned_query_rows(payloads)
+    if not rows:
+        return 0
+    ids = await _read_query_ids(session, rows)
+    found = 0
+    for payload in payloads:
+        payload["query_id"] = ids.get(query_key(payload))
+        found += payload["query_id"] is not None
+    return found
+
+
+async def persist_planned_queries(
+    session: AsyncSession,
+    payloads: List[Dict[str, Any]],
+) -> Dict[str, int]:
+    """
+    Upsert PLANNED queries rows for schedule payloads, link Baseline Forecast rows
+    to their Follow-ups, and set `query_id` in every payload. The caller commits,
+    so the whole batch is one transaction.
+
+    Returns:
+        Counts: rows (planned rows written), paired (Baseline Forecast rows linked)
+    """
+    rows = planned_query_rows(payloads)
+    if not rows:
+        return {"rows": 0, "paired": 0}
+
+    for i in range(0, len(rows), _WRITE_CHUNK):
+        stmt = mysql_insert(CryptoQuery).values(rows[i:i + _WRITE_CHUNK])
+        # Existing rows keep their status and results; only the schedule link is refreshed
+        stmt = stmt.on_duplicate_key_update(schedule_id=stmt.inserted.schedule_id)
+        await session.execute(stmt)
+
+    ids = await _read_query_ids(session, rows)
+    start = min(r["scheduled_for_utc"] for r in rows)
+    end = max(r["scheduled_for_utc"] for r in rows)
+    # Only this batch's surveys: concurrent planning shards never update the same rows
+    survey_ids = sorted({r["survey_id"] for r in rows})
+    paired = await session.execute(_PAIR_FOLLOWUPS, {"start": start, "end": end, "survey_ids": survey_ids})
+
+    for payload in payloads:
+        payload["query_id"] = ids.get(query_key(payload))
+    missing = sum(1 for payload in payloads if payload["query_id"] is None)
+    if missing:
+        logger.warning(f"{missing} planned queries rows could not be read back")
+
+    return {"rows": len(rows), "paired": paired.rowcount}
@@ -0,0 +1,63 @@
+"""
+Schedule Reconciliation Module
+
+Syncs the planned_schedules registry with the schedules EventBridge actually holds.
+Run it after planning, on a timer, or whenever schedules were changed outside of
+forecast_planning (manual deletes, LocalStack restarts).
+
+Like forecast_planning, it runs locally during development and is meant to move
+to a Lambda on an EventBridge Rule.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+from app.db.session import SessionLocal
+from app.utils.aws import get_client
+from app.utils.schedule_registry import DEFAULT_GROUP, reconcile_planned_schedules
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_schedules(
+    group_name: str = DEFAULT_GROUP,
+    endpoint_url: str = "http://localhost:4566",
+) -> Dict[str, Any]:
+    """
+    Reconcile planned_schedules for one schedule group.
+
+    Returns:
+        Dict with status, timestamp and the listed/inserted/updated/missing counts
+    """
+    try:
+        scheduler = get_client("scheduler", endpoint_url)
+        async with SessionLocal() as session:
+            counts = await reconcile_planned_schedules(session, scheduler, group_name)
+        return {
+            "status": "success",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "group_name": group_name,
+            **counts,
+        }
+    except Exception as e:
+        logger.error(f"Error reconciling schedules: {str(e)}")
+        return {
+            "status": "error",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "error": str(e),
+        }
+
+
+async def main():
+    """Example usage for local development and testing"""
+    result = await reconcile_schedules()
+    print("Schedule Reconciliation Results:")
+    for key, value in result.items():
+        print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
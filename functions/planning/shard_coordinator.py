@@ -0,0 +1,154 @@
+"""
+Sharded forecast planning on one machine.
+
+`run_sharded_planning` starts one process per shard. Each process runs
+forecast_planning(shard=i, shards=n) with its own event loop, database engine
+and boto3 clients, and plans the surveys with survey_id % n == i. Their
+results are merged into a single summary shaped like an unsharded run's, and
+each shard's result is kept under "shard_results".
+
+Shards work on separate surveys, so they never write the same schedules or
+queries rows. A shard whose run fails is retried. The retry finds the
+schedules it already created by their deterministic names and updates them
+in place, so retrying a shard is safe even when its first attempt got part of
+the way.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from .forecast_planning import PLANNING_DAYS_AHEAD, SUMMARY_SAMPLE_SIZE, default_base_date, forecast_planning
+
+logger = logging.getLogger(__name__)
+
+# Statistics that count per shard and add up across shards; other numbers
+# (totals of shared catalog tables, settings) are the same for every shard
+_ADDITIVE_STATISTICS = {
+    "active_surveys", "schedules_desired", "queries_planned", "queries_paired", "queries_existing",
+    "schedules_created", "schedules_updated", "schedules_deleted", "schedules_unchanged", "schedules_failed",
+    "schedules_to_create", "schedules_to_update", "schedules_to_delete", "schedule_call_retries",
+    "payload_bytes", "payload_bytes_saved", "schedules_recorded",
+}
+_SAMPLES = ("survey_summary", "created_schedules", "deleted_schedules", "failed_schedules")
+# Worst status first
+_STATUS_ORDER = ("error", "partial_success", "success")
+
+
+def _run_shard(shard: int, shards: int, base_date: datetime, days_ahead: int, dry_run: bool) -> Dict[str, Any]:
+    """Process entry point: plan one shard"""
+    logging.basicConfig(level=logging.INFO)
+    return asyncio.run(
+        forecast_planning(base_date, dry_run=dry_run, days_ahead=days_ahead, shard=shard, shards=shards)
+    )
+
+
+def merge_shard_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine the forecast_planning results of every shard, in shard order.
+
+    Additive statistics are summed; the shard and shards fields are dropped;
+    other statistics take the largest value (numbers) or the first shard's
+    value. The status is the worst shard status. Samples are concatenated up to
+    SUMMARY_SAMPLE_SIZE entries, and dry-run phases add up their seconds and
+    calls and keep the highest peak.
+    """
+    status = min((r["status"] for r in results), key=_STATUS_ORDER.index)
+    merged: Dict[str, Any] = {
+        "status": status,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "shards": len(results),
+    }
+    errors = {i: r["error"] for i, r in enumerate(results) if r["status"] == "error"}
+    if errors:
+        merged["errors"] = errors
+
+    statistics: Dict[str, Any] = {}
+    for result in results:
+        for key, value in result.get("statistics", {}).items():
+            if key in ("shard", "shards"):
+                continue
+            if key not in statistics:
+                statistics[key] = value
+            elif key in _ADDITIVE_STATISTICS:
+                statistics[key] += value
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                statistics[key] = max(statistics[key], value)
+    merged["statistics"] = statistics
+
+    if any(r.get("dry_run") for r in results):
+        merged["dry_run"] = True
+        merged["plan_files"] = [r["plan_file"] for r in results if "plan_file" in r]
+        phases: Dict[str, Dict[str, Any]] = {}
+        for result in results:
+            for name, phase in result.get("phases", {}).items():
+                total = phases.setdefault(name, {"seconds": 0.0, "calls": 0, "peak_mib": 0.0})
+                total["seconds"] = round(total["seconds"] + phase["seconds"], 6)
+                total["calls"] += phase["calls"]
+                total["peak_mib"] = max(total["peak_mib"], phase["peak_mib"])
+        merged["phases"] = phases
+    else:
+        for key in _SAMPLES:
+            merged[key] = [item for r in results for item in r.get(key, [])][:SUMMARY_SAMPLE_SIZE]
+
+    merged["shard_results"] = [
+        {"shard": i, "status": r["status"], "statistics": r.get("statistics", {}), "error": r.get("error")}
+        for i, r in enumerate(results)
+    ]
+    return merged
+
+
+def run_sharded_planning(
+    shards: int,
+    base_date: Optional[datetime] = None,
+    days_ahead: int = PLANNING_DAYS_AHEAD,
+    dry_run: bool = False,
+    max_shard_attempts: int = 2
+) -> Dict[str, Any]:
+    """
+    Plan every survey in `shards` parallel worker processes and merge their summaries.
+
+    Args:
+        shards: Number of shards, one process each
+        base_date: Base date for scheduling (defaults to tomorrow), the same for every shard
+        days_ahead: Number of consecutive base dates to plan
+        dry_run: Dry-run every shard (one plan file per shard)
+        max_shard_attempts: Runs of a shard whose result has status "error" before giving up
+
+    Returns:
+        Merged result (see merge_shard_results)
+    """
+    if shards < 1:
+        raise ValueError(f"shards must be at least 1, got {shards}")
+    # Resolved once so every shard plans the same dates
+    base_date = base_date or default_base_date()
+    results: List[Optional[Dict[str, Any]]] = [None] * shards
+    pending = list(range(shards))
+
+    # spawn: every worker starts with its own event loop, engine and boto3 clients
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=shards, mp_context=context) as pool:
+        for attempt in range(1, max_shard_attempts + 1):
+            futures = {
+                shard: pool.submit(_run_shard, shard, shards, base_date, days_ahead, dry_run)
+                for shard in pending
+            }
+            for shard, future in futures.items():
+                try:
+                    results[shard] = future.result()
+                except Exception as e:
+                    results[shard] = {
+                        "status": "error", "timestamp": datetime.now(timezone.utc).isoformat(), "error": str(e)
+                    }
+            pending = [shard for shard in pending if results[shard]["status"] == "error"]
+            if not pending:
+                break
+            if attempt < max_shard_attempts:
+                logger.warning(f"Retrying planning shards {pending} (attempt {attempt + 1} of {max_shard_attempts})")
+
+    merged = merge_shard_results(results)
+    logger.info(f"Sharded planning finished with status {merged['status']} across {shards} shards")
+    return merged
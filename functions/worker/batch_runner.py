@@ -0,0 +1,63 @@
+"""
+Batched schedule payloads for the forecast worker.
+
+In batching mode, planning puts every query due in the same minute into one
+EventBridge schedule whose payload is {"payload_mode": "batch", "queries":
+[...]} (each entry is an ordinary full or compact query payload). One Lambda
+invocation then runs the whole batch: queries go to a thread pool, because
+each one spends its time waiting on an LLM API. A failing query is reported
+in the result and does not fail the batch. Otherwise Lambda's retry would
+run the queries that already succeeded again.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+# Queries of one batch in flight at once
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+
+def is_batch(event: Dict[str, Any]) -> bool:
+    return event.get("payload_mode") == "batch"
+
+
+def run_batch(
+    event: Dict[str, Any],
+    handler: Callable[[Dict[str, Any], Any], Dict[str, Any]],
+    context: Any = None,
+    max_workers: int = BATCH_CONCURRENCY,
+) -> Dict[str, Any]:
+    """
+    Run `handler` (the single-query worker) for every query of a batch payload.
+
+    Returns:
+        {"batch_size", "succeeded", "failed", "seconds", "results"} with one
+        result per query in payload order: the handler's response, or
+        {"query_id", "survey_id", "error"} for a query that raised
+    """
+    queries = event.get("queries") or []
+
+    def run(query: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return handler(query, context)
+        except Exception as e:
+            return {"query_id": query.get("query_id"), "survey_id": query.get("survey_id"), "error": str(e)}
+
+    start = time.perf_counter()
+    if queries:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries)))) as pool:
+            results = list(pool.map(run, queries))
+    else:
+        results = []
+    failed = sum(1 for result in results if "error" in result)
+    summary = {
+        "batch_size": len(queries),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "seconds": round(time.perf_counter() - start, 3),
+        "results": results,
+    }
+    print(f"[forecast_worker] Batch of {len(queries)} queries: {failed} failed in {summary['seconds']}s")
+    return summary
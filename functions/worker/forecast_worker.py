@@ -10,6 +10,8 @@ from get_asset_recommendation_Anthropic import get_asset_recommendation_Anthropi
 from get_asset_recommendation_Gemini import get_asset_recommendation_Gemini
 from get_asset_recommendation_Grok import get_asset_recommendation_Grok
 from get_asset_recommendation_OpenAI import get_asset_recommendation_OpenAI
+from batch_runner import is_batch, run_batch
+from prompt_cache import resolve_payload
 
 
 def forecast_worker(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
@@ -27,12 +29,22 @@ def forecast_worker(event: Dict[str, Any], context: Any = None) -> Dict[str, Any
                 "llm_model": "claude-opus-4-1-20250805",
                 "prompt": "Provide a recommendation for the asset {asset_name}..."
             }
+            Compact payloads ("payload_mode": "compact", ids plus prompt_id and
+            prompt_version) are expanded from the local prompt cache first.
+            Batch payloads ("payload_mode": "batch", a "queries" list of such
+            payloads) run every query concurrently (see batch_runner).
         context: (optional) AWS Lambda context (ignored in LocalStack tests)
 
     Returns:
         Dict containing recommendation, confidence, explanation, and references
+        (for a batch, run_batch's summary with one such dict per query)
     """
 
+    if is_batch(event):
+        return run_batch(event, forecast_worker, context)
+
+    event = resolve_payload(event)
+
     survey_id = event.get("survey_id")
     asset_name = event.get("asset_name", "Unknown")
     llm_name = event.get("llm_name")
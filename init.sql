@@ -31,6 +31,25 @@ CREATE TABLE IF NOT EXISTS assets (
     INDEX idx_asset_type_id (asset_type_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- =====================================================================
+-- 2b) asset_prices
+-- PRIMARY KEY (asset_id, ts) is the clustered index, so a price range for
+-- one asset is a single contiguous range scan.
+-- =====================================================================
+CREATE TABLE IF NOT EXISTS asset_prices (
+    asset_id        INT NOT NULL,
+    ts              DATETIME NOT NULL,
+    open            DOUBLE NULL,
+    high            DOUBLE NULL,
+    low             DOUBLE NULL,
+    close           DOUBLE NOT NULL,
+    volume          DOUBLE NULL,
+    PRIMARY KEY (asset_id, ts),
+    CONSTRAINT fk_asset_prices_assets
+        FOREIGN KEY (asset_id) REFERENCES assets(asset_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
 -- =====================================================================
 -- 3) llms
 -- =====================================================================
@@ -202,6 +221,9 @@ CREATE TABLE IF NOT EXISTS queries (
     UNIQUE INDEX ux_cq_plan4 (survey_id, scheduled_for_utc, query_type_id, query_schedule_id),
 
     INDEX idx_cq_scheduled (scheduled_for_utc),
+    -- Covering index for time-bucketed reporting (/reports/timeseries): the range scan on
+    -- scheduled_for_utc reads recommendation, confidence and the join keys from the index
+    INDEX idx_cq_time_report (scheduled_for_utc, recommendation, confidence, survey_id, query_type_id),
     INDEX idx_cq_status (status),
     INDEX idx_survey_id (survey_id),
     INDEX idx_schedule_id (schedule_id),
@@ -209,6 +231,101 @@ CREATE TABLE IF NOT EXISTS queries (
     INDEX idx_cq_query_schedule (query_schedule_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- =====================================================================
+-- 10) forecast_scores
+-- One row per scored query: realized return over the horizon and hit/miss
+-- =====================================================================
+CREATE TABLE IF NOT EXISTS forecast_scores (
+    score_id            INT AUTO_INCREMENT PRIMARY KEY,
+    query_id            INT NOT NULL,
+    llm_id              INT NULL,
+    prompt_id           INT NULL,
+    prompt_version      INT NULL,
+    asset_symbol        VARCHAR(64) NOT NULL,
+    recommendation      ENUM('BUY','SELL','HOLD') NOT NULL,
+    confidence          DECIMAL(3,2) NULL,
+    horizon_hours       INT NOT NULL,
+    entry_ts            DATETIME NOT NULL,
+    entry_price         DOUBLE NOT NULL,
+    exit_ts             DATETIME NOT NULL,
+    exit_price          DOUBLE NOT NULL,
+    realized_return     DOUBLE NOT NULL,
+    hit                 BOOLEAN NOT NULL,
+    scored_at           TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT fk_fs_query
+        FOREIGN KEY (query_id) REFERENCES queries(query_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    CONSTRAINT fk_fs_llm
+        FOREIGN KEY (llm_id) REFERENCES llms(llm_id)
+        ON DELETE SET NULL ON UPDATE CASCADE,
+    CONSTRAINT fk_fs_prompt
+        FOREIGN KEY (prompt_id) REFERENCES prompts(prompt_id)
+        ON DELETE SET NULL ON UPDATE CASCADE,
+
+    UNIQUE INDEX ux_fs_query (query_id),
+    INDEX idx_fs_llm_prompt_version (llm_id, prompt_version)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- =====================================================================
+-- 11) planned_schedules
+-- One row per EventBridge schedule created by forecast planning. Written on
+-- successful creation and kept in sync with EventBridge by reconciliation,
+-- so listings are served from here instead of N get_schedule calls.
+-- Display columns are denormalized from the schedule payload.
+-- =====================================================================
+CREATE TABLE IF NOT EXISTS planned_schedules (
+    planned_schedule_id INT AUTO_INCREMENT PRIMARY KEY,
+    schedule_name       VARCHAR(64) NOT NULL,
+    group_name          VARCHAR(64) NOT NULL DEFAULT 'crypto-forecast-schedules',
+    schedule_arn        VARCHAR(512) NULL,
+    schedule_expression VARCHAR(64) NOT NULL,
+    payload_hash        CHAR(64) NULL,     -- sha256 of the canonical target payload
+    state               VARCHAR(16) NOT NULL DEFAULT 'ENABLED',  -- ENABLED | DISABLED | MISSING
+    plan_date           DATE NULL,         -- planning base date that owns the schedule (NULL = not planner-owned)
+    survey_id           INT NULL,
+    asset_id            INT NULL,
+    query_schedule_id   INT NULL,
+    scheduled_for_utc   DATETIME NULL,
+    schedule_name_label VARCHAR(255) NULL, -- schedules.schedule_name from the payload
+    query_type_name     VARCHAR(255) NULL,
+    delay_hours         INT NULL,
+    asset_name          VARCHAR(255) NULL,
+    llm_name            VARCHAR(255) NULL,
+    target_llm_name     VARCHAR(255) NULL,
+    prompt_type         VARCHAR(32) NULL,
+    description         TEXT NULL,
+    created_at          TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_synced_at      DATETIME NULL,
+
+    UNIQUE INDEX ux_ps_name (schedule_name),
+    INDEX idx_ps_survey_time (survey_id, scheduled_for_utc),
+    INDEX idx_ps_asset_time (asset_id, scheduled_for_utc),
+    INDEX idx_ps_time (scheduled_for_utc),
+    INDEX idx_ps_group_plan_date (group_name, plan_date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- =====================================================================
+-- 12) plan_templates
+-- Last plan generated per planning scope (schedule group and shard), as
+-- zlib-compressed JSON lines of one day's schedule requests. fingerprint
+-- covers the planning input tables and settings; while it is unchanged,
+-- planning shifts this plan to the new base date instead of reloading them.
+-- =====================================================================
+CREATE TABLE IF NOT EXISTS plan_templates (
+    plan_template_id    INT AUTO_INCREMENT PRIMARY KEY,
+    scope               VARCHAR(128) NOT NULL,
+    fingerprint         CHAR(64) NOT NULL,
+    base_date           DATE NOT NULL,          -- base date the stored requests were generated for
+    survey_count        INT NOT NULL DEFAULT 0,
+    request_count       INT NOT NULL DEFAULT 0,
+    stats               JSON NULL,              -- planning data counts and survey summary sample
+    template            LONGBLOB NOT NULL,
+    created_at          TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    UNIQUE INDEX ux_pt_scope (scope)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
 
 
 
@@ -3,11 +3,12 @@
 Utility script to list and summarize LocalStack EventBridge schedules
 """
 
-import boto3
 import json
 from datetime import datetime
 from typing import List, Dict, Any
 
+from app.utils.aws import get_client, iter_schedule_groups, iter_schedules
+
 def list_localstack_schedules(endpoint_url: str = 'http://localhost:4566', group_name: str = 'crypto-forecast-schedules') -> Dict[str, Any]:
     """
     List all EventBridge schedules in LocalStack
@@ -21,12 +22,11 @@ def list_localstack_schedules(endpoint_url: str = 'http://localhost:4566', group
     """
     try:
         # Initialize LocalStack EventBridge Scheduler client
-        scheduler = boto3.client('scheduler', endpoint_url=endpoint_url)
+        scheduler = get_client('scheduler', endpoint_url)
         
         # List all schedule groups
         print("📋 Listing Schedule Groups...")
-        groups_response = scheduler.list_schedule_groups()
-        groups = groups_response.get('ScheduleGroups', [])
+        groups = list(iter_schedule_groups(scheduler))
         
         print(f"Found {len(groups)} schedule groups:")
         for group in groups:
@@ -35,8 +35,7 @@ def list_localstack_schedules(endpoint_url: str = 'http://localhost:4566', group
         # List schedules in the specified group
         print(f"\n📅 Listing Schedules in Group: {group_name}")
         try:
-            schedules_response = scheduler.list_schedules(GroupName=group_name)
-            schedules = schedules_response.get('Schedules', [])
+            schedules = list(iter_schedules(scheduler, group_name))
         except scheduler.exceptions.ResourceNotFoundException:
             print(f"❌ Schedule group '{group_name}' not found")
             return {
@@ -148,11 +147,10 @@ def delete_all_schedules(endpoint_url: str = 'http://localhost:4566', group_name
         Dictionary containing deletion results
     """
     try:
-        scheduler = boto3.client('scheduler', endpoint_url=endpoint_url)
+        scheduler = get_client('scheduler', endpoint_url)
         
         # List schedules in the group
-        schedules_response = scheduler.list_schedules(GroupName=group_name)
-        schedules = schedules_response.get('Schedules', [])
+        schedules = list(iter_schedules(scheduler, group_name))
         
         print(f"🗑️  Deleting {len(schedules)} schedules from group '{group_name}'...")
         
@@ -199,7 +197,7 @@ def get_schedule_details(schedule_name: str, endpoint_url: str = 'http://localho
         Dictionary containing schedule details
     """
     try:
-        scheduler = boto3.client('scheduler', endpoint_url=endpoint_url)
+        scheduler = get_client('scheduler', endpoint_url)
         
         response = scheduler.get_schedule(
             Name=schedule_name,
@@ -7,8 +7,11 @@ allowing testing without requiring database connectivity or aiomysql.
 """
 
 import asyncio
+import json
 import sys
 import os
+import tempfile
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, time, timezone
 
@@ -185,6 +188,98 @@ async def mock_session_execute(query):
     
     return mock_result
 
+class MockSchedulerClient:
+    """In-memory EventBridge Scheduler client that counts write calls"""
+    class exceptions:
+        class ConflictException(Exception):
+            pass
+        class ResourceNotFoundException(Exception):
+            pass
+
+    def __init__(self):
+        self.schedules = {}
+        self.write_calls = 0
+
+    def create_schedule_group(self, **kwargs):
+        self.write_calls += 1
+        raise self.exceptions.ConflictException()
+
+    def create_schedule(self, **kwargs):
+        self.write_calls += 1
+        self.schedules[kwargs['Name']] = kwargs
+        return {"ScheduleArn": f"arn:aws:scheduler:us-east-1:000000000000:schedule/{kwargs['GroupName']}/{kwargs['Name']}"}
+
+    def update_schedule(self, **kwargs):
+        self.write_calls += 1
+        self.schedules[kwargs['Name']] = kwargs
+        return {"ScheduleArn": f"arn:aws:scheduler:us-east-1:000000000000:schedule/{kwargs['GroupName']}/{kwargs['Name']}"}
+
+    def delete_schedule(self, **kwargs):
+        self.write_calls += 1
+        self.schedules.pop(kwargs['Name'], None)
+
+class MockRegistry:
+    """In-memory planned_schedules registry (name -> row)"""
+    def __init__(self):
+        self.rows = {}
+
+    async def load_planned_hashes(self, session, group_name, plan_date, survey_ids=None, until=None):
+        return {
+            name: row['payload_hash'] for name, row in self.rows.items()
+            if plan_date <= row['plan_date'] <= (until or plan_date) and (survey_ids is None or row['survey_id'] in survey_ids)
+        }
+
+    async def load_orphaned_schedules(self, session, group_name, plan_date, until=None, shard=0, shards=1):
+        active = {s.survey_id for s in create_mock_data()['surveys'] if s.is_active}
+        return [name for name, row in self.rows.items() if plan_date <= row['plan_date'] <= (until or plan_date) and row['survey_id'] not in active]
+
+    async def record_planned_schedules(self, session, rows):
+        rows = list(rows)
+        for row in rows:
+            self.rows[row['schedule_name']] = row
+        return len(rows)
+
+    async def delete_planned_schedules(self, session, names):
+        for name in names:
+            self.rows.pop(name, None)
+        return len(names)
+
+class MockPlannedQueries:
+    """In-memory queries table keyed like ux_cq_plan4"""
+    def __init__(self):
+        self.ids = {}
+
+    async def persist_planned_queries(self, session, payloads):
+        for payload in payloads:
+            key = (payload['survey_id'], payload['scheduled_for_utc'], payload['query_type_id'], payload['query_schedule_id'])
+            payload['query_id'] = self.ids.setdefault(key, len(self.ids) + 1)
+        return {"rows": len(payloads), "paired": 0}
+
+    async def lookup_planned_queries(self, session, payloads):
+        for payload in payloads:
+            key = (payload['survey_id'], payload['scheduled_for_utc'], payload['query_type_id'], payload['query_schedule_id'])
+            payload['query_id'] = self.ids.get(key)
+        return sum(1 for payload in payloads if payload['query_id'])
+
+class MockPlanCache:
+    """In-memory plan_templates table; the planning inputs never change between runs"""
+    def __init__(self):
+        self.rows = {}
+        self.saves = 0
+
+    async def planning_fingerprint(self, session, settings, shard=0, shards=1):
+        return json.dumps(settings, sort_keys=True)
+
+    async def load_plan_template(self, session, scope):
+        return self.rows.get(scope)
+
+    async def save_plan_template(self, session, scope, fingerprint, base_date, template, survey_count, request_count, stats):
+        self.saves += 1
+        self.rows[scope] = SimpleNamespace(
+            fingerprint=fingerprint, base_date=base_date, template=template,
+            survey_count=survey_count, request_count=request_count, stats=json.loads(json.dumps(stats))
+        )
+
 async def test_forecast_planning_with_mocks():
     """Test the forecast_planning function with mocked data"""
     print("Testing forecast_planning function with mock data...")
@@ -204,13 +299,42 @@ async def test_forecast_planning_with_mocks():
     
     try:
         # Patch the SessionLocal import and test the function
-        with patch('functions.planning.forecast_planning.SessionLocal', mock_session_local):
+        scheduler_client = MockSchedulerClient()
+        registry = MockRegistry()
+        planned_queries = MockPlannedQueries()
+        plan_cache = MockPlanCache()
+        with patch('functions.planning.forecast_planning.SessionLocal', mock_session_local), \
+             patch('functions.planning.create_one_time_schedule.get_client', lambda *args, **kwargs: scheduler_client), \
+             patch('functions.planning.forecast_planning.load_planned_hashes', registry.load_planned_hashes), \
+             patch('functions.planning.forecast_planning.load_orphaned_schedules', registry.load_orphaned_schedules), \
+             patch('functions.planning.forecast_planning.record_planned_schedules', registry.record_planned_schedules), \
+             patch('functions.planning.forecast_planning.delete_planned_schedules', registry.delete_planned_schedules), \
+             patch('functions.planning.forecast_planning.persist_planned_queries', planned_queries.persist_planned_queries), \
+             patch('functions.planning.forecast_planning.lookup_planned_queries', planned_queries.lookup_planned_queries), \
+             patch('functions.planning.forecast_planning.planning_fingerprint', plan_cache.planning_fingerprint), \
+             patch('functions.planning.forecast_planning.load_plan_template', plan_cache.load_plan_template), \
+             patch('functions.planning.forecast_planning.save_plan_template', plan_cache.save_plan_template):
             # Import the function after patching
             from functions.planning.forecast_planning import forecast_planning
             
             # Test the function
             result = await forecast_planning()
             
+            # A second run with the same configuration must not write anything
+            writes_after_first_run = scheduler_client.write_calls
+            second = await forecast_planning()
+            second_run_writes = scheduler_client.write_calls - writes_after_first_run
+            
+            # A dry run reads only and should see the plan as unchanged
+            with tempfile.TemporaryDirectory() as tmp:
+                dry = await forecast_planning(dry_run=True, plan_file=os.path.join(tmp, "plan.jsonl"))
+                with open(dry.get('plan_file') or os.devnull) as f:
+                    plan_lines = [json.loads(line) for line in f]
+            dry_run_writes = scheduler_client.write_calls - writes_after_first_run
+            
+            # A three-day run keeps the day already planned and adds the next two
+            week = await forecast_planning(days_ahead=3)
+            
             print("Forecast Planning Test Results:")
             print(f"Status: {result['status']}")
             
@@ -223,6 +347,7 @@ async def test_forecast_planning_with_mocks():
                 print(f"Total Prompts: {stats.get('total_prompts', 0)}")
                 print(f"Total LLMs: {stats.get('total_llms', 0)}")
                 print(f"Schedules Created: {stats.get('schedules_created', 0)}")
+                print(f"Schedules Unchanged: {stats.get('schedules_unchanged', 0)}")
                 
                 print("\nSurvey Summary:")
                 for survey in result.get('survey_summary', []):
@@ -238,6 +363,45 @@ async def test_forecast_planning_with_mocks():
                     print(f"  State: {sample.get('State', 'N/A')}")
                     print(f"  Creation Date: {sample.get('CreationDate', 'N/A')}")
                 
+                sent = [json.loads(s['Target']['Input']) for s in scheduler_client.schedules.values()]
+                # Batch schedules (SCHEDULE_BATCHING=minute) list their queries
+                sent = [query for payload in sent for query in payload.get('queries', [payload])]
+                if any(not payload.get('query_id') for payload in sent):
+                    print("❌ Test FAILED: schedule payload without query_id")
+                    return False
+                
+                second_stats = second.get('statistics', {})
+                print(f"\nSecond run: {second_stats.get('schedules_unchanged', 0)} unchanged, "
+                      f"{second_run_writes} AWS write calls")
+                if second_run_writes or second_stats.get('schedules_created'):
+                    print("❌ Test FAILED: second run with no changes made write calls")
+                    return False
+                print(f"Plan template: first run {stats.get('plan_template')}, second run "
+                      f"{second_stats.get('plan_template')}, {plan_cache.saves} saved")
+                if stats.get('plan_template') != "off" and (
+                        (stats.get('plan_template'), second_stats.get('plan_template'), plan_cache.saves) != ("miss", "hit", 1)
+                        or second.get('survey_summary') != result.get('survey_summary') \
+                        or second_stats.get('active_surveys') != stats.get('active_surveys')):
+                    print("❌ Test FAILED: second run did not reuse the cached plan")
+                    return False
+                
+                dry_stats = dry.get('statistics', {})
+                print(f"Dry run: {len(plan_lines)} plan lines, {dry_stats.get('schedules_unchanged', 0)} unchanged")
+                for name, phase in dry.get('phases', {}).items():
+                    print(f"  {name:<20} {phase['seconds']:.4f}s {phase['peak_mib']} MiB")
+                if dry_run_writes or len(plan_lines) != dry_stats.get('schedules_desired') \
+                        or any(line['action'] != 'unchanged' for line in plan_lines):
+                    print("❌ Test FAILED: dry run wrote to AWS or did not match the planned schedules")
+                    return False
+                
+                week_stats = week.get('statistics', {})
+                print(f"Three-day run: {week_stats.get('schedules_created', 0)} created, "
+                      f"{week_stats.get('schedules_unchanged', 0)} unchanged")
+                if week_stats.get('schedules_unchanged') != stats.get('schedules_created') \
+                        or week_stats.get('schedules_created') != 2 * stats.get('schedules_created', 0):
+                    print("❌ Test FAILED: multi-day run did not dedupe against the planned day")
+                    return False
+                
                 print("\n✅ Test PASSED: Function executed successfully with mock data")
                 return True
             else:
@@ -0,0 +1,40 @@
+# tests/test_asset_prices.py
+import pytest
+from . import data
+
+@pytest.mark.asyncio
+async def test_asset_prices_bulk_ingest_and_downsample(client):
+    at = (await client.post("/asset-types", json=data.asset_type_payload())).json()
+    asset = (await client.post("/assets", json=data.asset_payload(at["asset_type_id"]))).json()
+    asset_id = asset["asset_id"]
+
+    # 48 hourly bars over two days
+    bars = [
+        {"ts": f"2025-01-0{1 + h // 24}T{h % 24:02d}:00:00", "open": h, "high": h + 1, "low": h - 1, "close": h + 0.5, "volume": 10}
+        for h in range(48)
+    ]
+    r = await client.post(f"/assets/{asset_id}/prices", json=bars)
+    assert r.status_code == 201, r.text
+    # Re-ingesting the same range is an upsert, not a duplicate
+    r = await client.post(f"/assets/{asset_id}/prices", json=bars)
+    assert r.status_code == 201, r.text
+
+    r = await client.get(f"/assets/{asset_id}/prices", params={"from": "2025-01-01T00:00:00", "to": "2025-01-03T00:00:00"})
+    assert r.status_code == 200
+    assert len(r.json()) == 48
+
+    # Offsets are converted to UTC: 02:00+02:00 is midnight UTC
+    r = await client.get(f"/assets/{asset_id}/prices", params={"from": "2025-01-01T00:00:00", "to": "2025-01-02T02:00:00+02:00"})
+    assert r.status_code == 200
+    assert len(r.json()) == 24
+
+    r = await client.get(f"/assets/{asset_id}/prices", params={"from": "2025-01-01T00:00:00", "to": "2025-01-03T00:00:00", "interval": "1d"})
+    assert r.status_code == 200
+    days = r.json()
+    assert len(days) == 2
+    assert days[0]["open"] == 0 and days[0]["close"] == 23.5
+    assert days[0]["high"] == 24 and days[0]["low"] == -1
+    assert days[0]["volume"] == 240
+
+    r = await client.get("/assets/999999999/prices")
+    assert r.status_code == 404
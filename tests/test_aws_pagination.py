@@ -0,0 +1,63 @@
+# tests/test_aws_pagination.py
+import boto3
+from botocore.stub import Stubber
+
+from app.utils.aws import fetch_page, get_client, iter_schedules
+
+
+def _scheduler():
+    return boto3.client(
+        "scheduler", region_name="us-east-1",
+        aws_access_key_id="test", aws_secret_access_key="test",
+    )
+
+
+def _schedule(name):
+    return {"Name": name, "GroupName": "g", "State": "ENABLED"}
+
+
+def test_iter_schedules_follows_next_token():
+    scheduler = _scheduler()
+    with Stubber(scheduler) as stub:
+        stub.add_response(
+            "list_schedules",
+            {"Schedules": [_schedule("a"), _schedule("b")], "NextToken": "t1"},
+            {"GroupName": "g", "MaxResults": 100},
+        )
+        stub.add_response(
+            "list_schedules",
+            {"Schedules": [_schedule("c")]},
+            {"GroupName": "g", "MaxResults": 100, "NextToken": "t1"},
+        )
+        names = [s["Name"] for s in iter_schedules(scheduler, "g")]
+    assert names == ["a", "b", "c"]
+
+
+def test_fetch_page_returns_cursor_until_last_page():
+    scheduler = _scheduler()
+    with Stubber(scheduler) as stub:
+        stub.add_response(
+            "list_schedules",
+            {"Schedules": [_schedule("a"), _schedule("b")], "NextToken": "t1"},
+            {"GroupName": "g", "MaxResults": 2},
+        )
+        items, cursor = fetch_page(scheduler, "list_schedules", "Schedules", 2, GroupName="g")
+        assert [s["Name"] for s in items] == ["a", "b"]
+        assert cursor
+
+        stub.add_response(
+            "list_schedules",
+            {"Schedules": [_schedule("c")]},
+            {"GroupName": "g", "MaxResults": 2, "NextToken": "t1"},
+        )
+        items, cursor = fetch_page(scheduler, "list_schedules", "Schedules", 2, cursor, GroupName="g")
+        assert [s["Name"] for s in items] == ["c"]
+        assert cursor is None
+
+
+def test_get_client_is_shared_per_service_endpoint_region():
+    a = get_client("scheduler", "http://localhost:4566")
+    assert get_client("scheduler", "http://localhost:4566") is a
+    assert get_client("scheduler", "http://localstack:4566") is not a
+    assert get_client("events", "http://localhost:4566") is not a
+    assert a.meta.config.retries["mode"] == "adaptive"
@@ -0,0 +1,83 @@
+# tests/test_inventory_cache.py
+import asyncio
+
+import pytest
+
+from app.utils.inventory_cache import InventoryCache
+
+
+class CountingLoader:
+    """Returns {"count": n} on the n-th call; fails while `fail` is set."""
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    async def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("LocalStack down")
+        return {"count": self.calls}
+
+
+@pytest.mark.asyncio
+async def test_first_read_loads_then_serves_from_memory():
+    cache, loader = InventoryCache(interval=60), CountingLoader()
+    first = await cache.get("rules", loader)
+    second = await cache.get("rules", loader)
+    assert first["count"] == second["count"] == 1
+    assert loader.calls == 1 and not second["stale"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_true_reloads():
+    cache, loader = InventoryCache(interval=60), CountingLoader()
+    await cache.get("rules", loader)
+    assert (await cache.get("rules", loader, refresh=True))["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_served_while_revalidating():
+    cache, loader = InventoryCache(interval=0.01), CountingLoader()
+    await cache.get("rules", loader)
+    await asyncio.sleep(0.03)
+    stale = await cache.get("rules", loader)
+    assert stale["count"] == 1 and stale["stale"]
+    await asyncio.sleep(0)  # let the background refresh run
+    assert (await cache.get("rules", loader))["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_previous_snapshot():
+    cache, loader = InventoryCache(interval=60), CountingLoader()
+    await cache.get("rules", loader)
+    loader.fail = True
+    assert (await cache.get("rules", loader, refresh=True))["count"] == 1
+    with pytest.raises(RuntimeError):
+        await cache.get("functions", loader)
+
+
+@pytest.mark.asyncio
+async def test_background_refresher_warms_registered_snapshots():
+    cache, loader = InventoryCache(interval=60), CountingLoader()
+    cache.register("rules", loader)
+    cache.start()
+    await asyncio.sleep(0.01)
+    await cache.stop()
+    assert loader.calls == 1
+    assert (await cache.get("rules"))["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unregistered_keys_are_bounded_and_not_background_refreshed():
+    cache, registered, ad_hoc = InventoryCache(interval=60, ad_hoc_max=2), CountingLoader(), CountingLoader()
+    cache.register("rules", registered)
+    for group in ("a", "b", "a", "c"):
+        await cache.get(("schedules", group), ad_hoc)
+    assert ad_hoc.calls == 3
+    # ("schedules", "b") was least recently read when "c" came in
+    assert list(cache._ad_hoc) == [("schedules", "a"), ("schedules", "c")]
+
+    await cache.refresh_all()
+    assert registered.calls == 1 and ad_hoc.calls == 3
+    with pytest.raises(KeyError):
+        await cache.get(("schedules", "b"))
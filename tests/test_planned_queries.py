@@ -0,0 +1,73 @@
+# tests/test_planned_queries.py
+import datetime as dt
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from functions.planning.planned_queries import persist_planned_queries, planned_query_rows
+
+
+def _payload(query_schedule_id, query_type_id, hour, survey_id=1):
+    return {
+        "query_id": None, "survey_id": survey_id, "schedule_id": 4,
+        "query_schedule_id": query_schedule_id, "query_type_id": query_type_id,
+        "scheduled_for_utc": dt.datetime(2025, 10, 3, hour).isoformat(),
+    }
+
+
+class _Result:
+    def __init__(self, rows=(), rowcount=0):
+        self._rows = list(rows)
+        self.rowcount = rowcount
+
+    def all(self):
+        return self._rows
+
+
+class _FakeSession:
+    """Records statements and answers the id read-back from a fixed table"""
+    def __init__(self, table):
+        self.table = table
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+        sql = str(stmt.compile(dialect=mysql.dialect())) if not hasattr(stmt, "text") else stmt.text
+        if sql.lstrip().startswith("SELECT"):
+            return _Result(self.table)
+        if sql.lstrip().startswith("UPDATE"):
+            return _Result(rowcount=1)
+        return _Result()
+
+
+def test_planned_query_rows_dedupe_on_plan_key():
+    rows = planned_query_rows([_payload(1, 2, 7), _payload(1, 2, 7), _payload(2, 3, 8)])
+    assert len(rows) == 2
+    assert rows[0]["status"] == "PLANNED"
+    assert rows[0]["scheduled_for_utc"] == dt.datetime(2025, 10, 3, 7)
+
+
+@pytest.mark.asyncio
+async def test_persist_upserts_pairs_and_sets_query_ids():
+    payloads = [_payload(1, 2, 7), _payload(2, 3, 8)]
+    session = _FakeSession([
+        (1, dt.datetime(2025, 10, 3, 7), 2, 1, 101),
+        (1, dt.datetime(2025, 10, 3, 8), 3, 2, 102),
+    ])
+
+    counts = await persist_planned_queries(session, payloads)
+
+    insert, select, pair = session.statements
+    insert_sql = str(insert.compile(dialect=mysql.dialect()))
+    assert insert_sql.startswith("INSERT INTO queries") and "ON DUPLICATE KEY UPDATE" in insert_sql
+    assert "status" not in insert_sql.split("ON DUPLICATE KEY UPDATE")[1]
+    assert "paired_query_id" in pair.text
+    assert [p["query_id"] for p in payloads] == [101, 102]
+    assert counts == {"rows": 2, "paired": 1}
+
+
+@pytest.mark.asyncio
+async def test_persist_without_payloads_writes_nothing():
+    session = _FakeSession([])
+    assert await persist_planned_queries(session, []) == {"rows": 0, "paired": 0}
+    assert session.statements == []
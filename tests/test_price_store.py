@@ -0,0 +1,70 @@
+# tests/test_price_store.py
+import datetime as dt
+import pandas as pd
+
+from app.utils.price_store import PriceStore, missing_ranges
+
+
+class FakeFetcher:
+    """Records every range requested and returns one bar per calendar day."""
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, symbol, start, end):
+        self.calls.append((symbol, start, end))
+        days = pd.date_range(start, end, freq="D")
+        return pd.DataFrame(
+            {"Open": 1.0, "High": 2.0, "Low": 0.5, "Close": [float(d.day) for d in days], "Volume": 10.0},
+            index=days,
+        )
+
+
+def test_missing_ranges_splits_around_covered():
+    d = dt.date
+    covered = [(d(2025, 1, 5), d(2025, 1, 10))]
+    assert missing_ranges(d(2025, 1, 1), d(2025, 1, 15), covered) == [
+        (d(2025, 1, 1), d(2025, 1, 4)),
+        (d(2025, 1, 11), d(2025, 1, 15)),
+    ]
+    assert missing_ranges(d(2025, 1, 6), d(2025, 1, 9), covered) == []
+
+
+def test_price_store_fetches_only_gaps(tmp_path):
+    fetcher = FakeFetcher()
+    store = PriceStore(root=str(tmp_path), fetcher=fetcher)
+
+    first = store.get_prices("BTC-USD", "2025-01-05", "2025-01-10")
+    assert list(first["Close"]) == [5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+    assert len(fetcher.calls) == 1
+
+    # Fully covered: served from disk
+    store.get_prices("BTC-USD", "2025-01-06", "2025-01-08")
+    assert len(fetcher.calls) == 1
+
+    # Overlapping: only the uncovered tails are fetched
+    wider = store.get_prices("BTC-USD", "2025-01-01", "2025-01-12")
+    assert len(wider) == 12
+    assert fetcher.calls[1:] == [
+        ("BTC-USD", dt.date(2025, 1, 1), dt.date(2025, 1, 4)),
+        ("BTC-USD", dt.date(2025, 1, 11), dt.date(2025, 1, 12)),
+    ]
+    assert store.covered_ranges("BTC-USD") == [(dt.date(2025, 1, 1), dt.date(2025, 1, 12))]
+
+    # A fresh store over the same directory needs no network either
+    PriceStore(root=str(tmp_path), fetcher=fetcher).get_prices("BTC-USD", "2025-01-01", "2025-01-12")
+    assert len(fetcher.calls) == 3
+
+
+def test_get_close_prices_is_tidy_and_aligned(tmp_path):
+    from app.utils.price_store import get_close_prices
+
+    fetcher = FakeFetcher()
+    store = PriceStore(root=str(tmp_path), fetcher=fetcher)
+    out = get_close_prices(["BTC-USD", "ETH-USD"], ["2025-01-03", dt.date(2025, 1, 1)], store=store)
+
+    assert list(out.columns) == ["symbol", "date", "close"]
+    assert len(out) == 4
+    btc = out[out["symbol"] == "BTC-USD"]
+    assert list(btc["close"]) == [1.0, 3.0]
+    # One fetch per symbol covering the min..max date span
+    assert sorted(c[0] for c in fetcher.calls) == ["BTC-USD", "ETH-USD"]
@@ -0,0 +1,28 @@
+# tests/test_schedule_registry.py
+import datetime as dt
+
+from app.utils.schedule_registry import payload_hash, registry_row
+
+
+def test_payload_hash_ignores_key_order():
+    assert payload_hash({"a": 1, "b": [1, 2]}) == payload_hash({"b": [1, 2], "a": 1})
+    assert payload_hash({"a": 1}) != payload_hash({"a": 2})
+
+
+def test_registry_row_denormalizes_payload():
+    payload = {
+        "survey_id": 7, "asset_id": 3, "asset_name": "Bitcoin", "query_schedule_id": 11,
+        "query_type_name": "Follow-up", "delay_hours": 6, "llm_name": "Grok",
+        "scheduled_for_utc": "2025-10-03T07:00:00",
+    }
+    row = registry_row("crypto-forecast-7-11-1759474800", "at(2025-10-03T07:00:00)", payload)
+    assert row["survey_id"] == 7 and row["asset_id"] == 3
+    assert row["scheduled_for_utc"] == dt.datetime(2025, 10, 3, 7)
+    assert row["payload_hash"] == payload_hash(payload)
+    assert row["state"] == "ENABLED"
+
+
+def test_registry_row_falls_back_to_expression_time():
+    row = registry_row("x", "at(2025-10-03T09:30:00)", {})
+    assert row["scheduled_for_utc"] == dt.datetime(2025, 10, 3, 9, 30)
+    assert registry_row("y", "rate(1 hour)", {})["scheduled_for_utc"] is None